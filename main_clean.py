@@ -32,16 +32,12 @@ except:
 # Step 3: Now import everything
 print("[STARTUP] 🚀 Starting clean dashboard...")
 
-import threading
-import queue
 import logging
-import time
 import tkinter as tk
 import subprocess
 import platform
 
-import BMKDATEN
-import Wechselrichter
+from core.collector import CollectorEngine, default_sources
 from ui.app import MainApp
 
 os.environ["SPOTIPY_REDIRECT_URI"] = "http://127.0.0.1:8889/callback"
@@ -52,48 +48,22 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
-shutdown_event = threading.Event()
-data_queue = queue.Queue()
-
-def run_wechselrichter():
-    try:
-        while not shutdown_event.is_set():
-            try:
-                Wechselrichter.abrufen_und_speichern()
-            except Exception as e:
-                logging.error(f"Wechselrichter-Thread: {e}")
-            time.sleep(10)
-    except Exception as e:
-        logging.error(f"Wechselrichter-Thread Fatal: {e}")
-
-def run_bmkdaten():
-    try:
-        while not shutdown_event.is_set():
-            try:
-                BMKDATEN.abrufen_und_speichern()
-            except Exception as e:
-                logging.error(f"BMKDATEN-Thread: {e}")
-            time.sleep(10)
-    except Exception as e:
-        logging.error(f"BMKDATEN-Thread Fatal: {e}")
+collector = CollectorEngine(default_sources())
 
 if __name__ == "__main__":
     root = tk.Tk()
     
-    # Start data threads
-    w_thread = threading.Thread(target=run_wechselrichter, daemon=True)
-    b_thread = threading.Thread(target=run_bmkdaten, daemon=True)
-    w_thread.start()
-    b_thread.start()
+    # Start data collectors (one event loop thread)
+    collector.start()
     
-    print("[STARTUP] ✓ Data threads started")
+    print("[STARTUP] ✓ Data collectors started")
     
     # Start UI
     app = MainApp(root)
     
     def on_closing():
         print("[SHUTDOWN] Closing app...")
-        shutdown_event.set()
+        collector.stop()
         app.stop()
         root.destroy()
     
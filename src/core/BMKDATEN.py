@@ -2,9 +2,54 @@ import requests
 import csv
 import os
 from datetime import datetime
-import json
 import logging
 
+from core.daqparse import DaqPlan
+
+# SQLite DataStore (heating-Tabelle) - optional, CSV bleibt Primärspeicher
+try:
+    from core.datastore import get_datastore
+except ImportError:
+    get_datastore = None
+
+# Zeitindex + Monatsrotation für Heizungstemperaturen.csv - optional
+try:
+    from core.csvlog import rotate_if_due, update_index
+except ImportError:
+    update_index = rotate_if_due = None
+
+# Keep-Alive-Sitzung zum Gerät (eine TCP-Verbindung statt einer je Abruf) - optional
+try:
+    from core.httpsession import DeviceSession
+    _http = DeviceSession("bmk")
+except ImportError:
+    _http = requests
+
+# Deadband-Aufzeichnung (nur Änderungen + Heartbeat)
+try:
+    from core.deadband import Deadband
+except ImportError:
+    Deadband = None
+
+# Begrenzter Verlauf der Pufferdaten (JSON Lines) - optional
+try:
+    from core.jsonlhistory import JsonlHistory
+except ImportError:
+    JsonlHistory = None
+
+# Spaltenspeicher für alle PP-Kanäle (data/bmk_kanaele) - optional
+try:
+    from core.channelstore import get_channelstore
+except ImportError:
+    get_channelstore = None
+
+# Datenbus zur UI (Messwert ohne Umweg über die CSV) - optional
+try:
+    from core.databus import publish
+    from core.datastore import HEATING_COLUMNS
+except ImportError:
+    publish = None
+
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
@@ -85,105 +130,107 @@ PP_INDEX_MAPPING = {
     72: "Relais_18_Status",         # "AUS"
 }
 
-# Diese Funktion wird von main.py gesucht!
-def abrufen_und_speichern():
+# Kanalnamen in Index-Reihenfolge (Spaltenspeicher)
+PP_KANAELE = [PP_INDEX_MAPPING[i] for i in range(len(PP_INDEX_MAPPING))]
+# Statuskanäle (Text wie "EIN"/"AUS"/"HEIZEN"), alle anderen sind Zahlen
+PP_STATUS = {0, 18, 22, 25, 26, 30, 33, 34, 38, 41, 42, 43, 44, 45, 46, 47, 48, 49, 50, 51, 58, 59, 60, 70, 71, 72}
+
+# Parse-Plan der Antwort, einmal beim Import gebaut (core.daqparse)
+_PLAN = DaqPlan(PP_KANAELE, PP_STATUS)
+
+# Verlauf der Pufferanlage: data/Pufferspeicher.jsonl, letzte 1000 Einträge
+PUFFER_HISTORY_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "Pufferspeicher.jsonl"
+)
+PUFFER_HISTORY_ENTRIES = 1000
+_puffer_history = JsonlHistory(PUFFER_HISTORY_PATH, PUFFER_HISTORY_ENTRIES) if JsonlHistory else None
+
+# Spalten von Heizungstemperaturen.csv
+HEIZUNG_SPALTEN = [
+    "Zeitstempel",
+    "Kesseltemperatur",
+    "Außentemperatur",
+    "Pufferspeicher Oben",
+    "Pufferspeicher Mitte",
+    "Pufferspeicher Unten",
+    "Warmwasser",
+]
+# Deadband je Kanal (°C): Zeile nur speichern, wenn sich ein Kanal um mehr
+# bewegt hat oder HEIZUNG_HEARTBEAT Sekunden vergangen sind (core.deadband).
+# Leeres Dict = jede Änderung speichern; HEIZUNG_HEARTBEAT = 0 = jeden Abruf.
+HEIZUNG_DEADBAND = {
+    "Kesseltemperatur": 1.0,
+    "Außentemperatur": 0.5,
+    "Pufferspeicher Oben": 0.5,
+    "Pufferspeicher Mitte": 0.5,
+    "Pufferspeicher Unten": 0.5,
+    "Warmwasser": 0.5,
+}
+# Slots der Werte von HEIZUNG_SPALTEN[1:] in der Antwort
+HEIZUNG_SLOTS = [
+    _PLAN.slot(name)
+    for name in (
+        "Kesseltemperatur",
+        "Außentemperatur",
+        "Puffer_Oben",
+        "Pufferspeicher_Mitte",
+        "Puffer_Unten",
+        "Warmwassertemperatur",
+    )
+]
+HEIZUNG_HEARTBEAT = 300  # = core.deadband.HEARTBEAT_SECONDS (Leser halten so lange)
+_heizung_deadband = Deadband(HEIZUNG_DEADBAND, HEIZUNG_HEARTBEAT) if Deadband else None
+
+BMK_URL = "http://192.168.1.201/daqdata.cgi"
+# Timeout verhindert Hänger, wenn Heizung nicht antwortet
+BMK_TIMEOUT = 5
+
+
+def abrufen(timeout=BMK_TIMEOUT):
     """
     Ruft alle Daten von der Heizungs-API ab und speichert sie.
     Unterstützt:
     - Heizungstemperaturen.csv (komplett mit allen Werten)
-    - Pufferspeicher.json (strukturierte Pufferanlage-Daten)
-    """
-    try:
-        url = "http://192.168.1.201/daqdata.cgi"
-        # Timeout verhindert Hänger, wenn Heizung nicht antwortet
-        response = requests.get(url, timeout=5)
-
-        if response.status_code == 200:
-            lines = response.text.split("\n")
-            values = [line.strip() for line in lines if line.strip()]
-
-            zeitstempel = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            logger.debug(f"BMK Response hat {len(values)} Werte")
-            
-            # Extrahiere ALLE verfügbaren Daten
-            daten_heizung = _extrahiere_alle_daten(values, zeitstempel)
-
-            def _get_field(name: str, *alts: str):
-                if not daten_heizung:
-                    return ""
-                if name in daten_heizung:
-                    return daten_heizung.get(name)
-                for alt in alts:
-                    if alt in daten_heizung:
-                        return daten_heizung.get(alt)
-                return ""
-
-            # Kurz-Zuordnung basierend auf PP_INDEX_MAPPING
-            daten_kurz = {
-                "Zeitstempel": zeitstempel,
-                "Kesseltemperatur": _get_field("Kesseltemperatur"),
-                "Außentemperatur": _get_field("Außentemperatur"),
-                "Pufferspeicher Oben": _get_field("Puffer_Oben", "Pufferspeicher Oben"),
-                "Pufferspeicher Mitte": _get_field("Pufferspeicher_Mitte", "Pufferspeicher Mitte"),
-                "Pufferspeicher Unten": _get_field("Puffer_Unten", "Pufferspeicher Unten"),
-                "Warmwasser": _get_field("Warmwassertemperatur", "Warmwasser"),
-            }
-            
-            # Speichere in Heizungstemperaturen.csv
-            if daten_heizung:
-                daten_heizung.update(daten_kurz)
-                _speichere_heizungsdaten(daten_heizung)
-            else:
-                _speichere_heizungsdaten(daten_kurz)
-            
-            # Speichere Pufferanlage-Daten separat (strukturiert)
-            daten_puffer = _extrahiere_pufferdaten(values, zeitstempel)
-            if daten_puffer:
-                _speichere_pufferdaten(daten_puffer)
-                
-    except Exception as e:
-        logger.error(f"Fehler bei BMK: {e}")
+    - Pufferspeicher.jsonl (strukturierte Pufferanlage-Daten)
 
-
-def _extrahiere_alle_daten(values, zeitstempel):
-    """
-    Extrahiert ALLE verfügbaren Daten aus der PP-Antwort mit korrekter Zuordnung
-    Nutzt PP_INDEX_MAPPING für korrekte Spaltennamen
+    Fehler beim Abruf (Timeout, HTTP-Status) werden geworfen.
     """
-    if len(values) < 1:
-        return None
+    response = _http.get(BMK_URL, timeout=timeout)
+    response.raise_for_status()
+    values = _PLAN.parse(response.text)
+
+    jetzt = datetime.now().replace(microsecond=0)
+    zeitstempel = jetzt.strftime("%Y-%m-%d %H:%M:%S")
+    
+    logger.debug(f"BMK Response hat {_PLAN.count} Werte")
+    
+    # Sechs Temperaturen für Heizungstemperaturen.csv, UI und DataStore
+    werte = [values[i] for i in HEIZUNG_SLOTS]
+    _speichere_heizungsdaten(jetzt, zeitstempel, werte)
     
+    # Kompletter Kanalvektor (Pumpen, Brenner, Mischer, ...) spaltenweise
+    _speichere_kanaele(jetzt, values)
+
+    # Speichere Pufferanlage-Daten separat (strukturiert)
+    daten_puffer = _extrahiere_pufferdaten(werte[2], werte[3], werte[4], zeitstempel)
+    if daten_puffer:
+        _speichere_pufferdaten(daten_puffer)
+
+
+# Diese Funktion wird von main.py gesucht!
+def abrufen_und_speichern():
     try:
-        daten = {
-            "Zeitstempel": zeitstempel,
-        }
-        
-        # Durchlaufe ALLE verfügbaren Indizes mit korrektem Mapping
-        for idx in range(min(len(values), len(PP_INDEX_MAPPING))):
-            spalten_name = PP_INDEX_MAPPING.get(idx, f"Wert_{idx}")
-            wert = values[idx].strip() if idx < len(values) else ""
-            float_wert = _safe_float(wert)
-            daten[spalten_name] = float_wert if float_wert is not None else wert
-        return daten
+        abrufen()
     except Exception as e:
-        logger.error(f"Fehler beim Extrahieren: {e}")
-        return None
+        logger.error(f"Fehler bei BMK: {e}")
 
 
-def _extrahiere_pufferdaten(values, zeitstempel):
+def _extrahiere_pufferdaten(temp_oben, temp_mitte, temp_unten, zeitstempel):
     """
     Extrahiert strukturierte Pufferanlage-Daten
     """
-    if len(values) < 7:
-        return None
-    
     try:
         # Berechne Durchschnittstemp und Stratifikation
-        temp_oben = _safe_float(values[4]) if len(values) > 4 else None
-        temp_mitte = _safe_float(values[5]) if len(values) > 5 else None
-        temp_unten = _safe_float(values[6]) if len(values) > 6 else None
-        
         temps = [temp_oben, temp_mitte, temp_unten]
         temps_valid = [t for t in temps if t is not None]
         
@@ -225,89 +272,94 @@ def _bestimme_puffer_status(oben, mitte, unten):
         return "KALT"
 
 
-def _safe_float(value):
-    """
-    Sicher zu float konvertieren
-    """
-    if not value or value == "":
-        return None
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return None
-
-
-def _speichere_heizungsdaten(daten):
+def _speichere_heizungsdaten(jetzt, zeitstempel, werte):
     """
     Speichert Heizungsdaten in CSV (data/ Verzeichnis nach Reorganisierung)
+
+    Args:
+        werte: Temperaturen in der Reihenfolge von HEIZUNG_SPALTEN[1:] (float/None)
     """
     # Nach Reorganisierung: data/ Verzeichnis im Root
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     csv_datei = os.path.join(base_dir, "data", "Heizungstemperaturen.csv")
     datei_existiert = os.path.exists(csv_datei)
 
-    def _get(*keys):
-        for key in keys:
-            if key in daten:
-                return daten.get(key)
-        return ""
+    # UI bekommt jeden Abruf, gespeichert wird nur bei Änderung/Heartbeat
+    _veroeffentliche_heizungsdaten(jetzt, werte)
+    if not _aufzeichnen(jetzt, werte):
+        return
 
+    zeile = [zeitstempel, *("" if v is None else v for v in werte)]
     try:
         with open(csv_datei, "a", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
             if not datei_existiert:
-                writer.writerow([
-                    "Zeitstempel",
-                    "Kesseltemperatur",
-                    "Außentemperatur",
-                    "Pufferspeicher Oben",
-                    "Pufferspeicher Mitte",
-                    "Pufferspeicher Unten",
-                    "Warmwasser",
-                ])
-            aussen = _get("Außentemperatur", "Aussentemperatur")
-            puffer_oben = _get("Puffer_Oben", "Pufferspeicher Oben", "Puffer Oben")
-            writer.writerow([
-                _get("Zeitstempel"),
-                _get("Kesseltemperatur"),
-                aussen,
-                puffer_oben,
-                _get("Pufferspeicher_Mitte", "Puffer_Mitte", "Pufferspeicher Mitte", "Puffer Mitte"),
-                _get("Puffer_Unten", "Pufferspeicher Unten", "Puffer Unten"),
-                _get("Warmwassertemperatur", "Warmwasser"),
-            ])
-        logger.debug(f"Heizungsdaten gespeichert: {daten.get('Zeitstempel')}")
+                writer.writerow(HEIZUNG_SPALTEN)
+            writer.writerow(zeile)
+        if update_index is not None:
+            update_index(csv_datei)
+            rotate_if_due(csv_datei)  # Monatswechsel: Vormonat ins Archiv
+        _speichere_heizungsdaten_db(zeitstempel, werte)
+        logger.debug(f"Heizungsdaten gespeichert: {zeitstempel}")
     except Exception as e:
+        if _heizung_deadband is not None:
+            _heizung_deadband.reset()
         logger.error(f"Fehler beim Speichern von Heizungsdaten: {e}")
 
 
+def _aufzeichnen(jetzt, werte):
+    """Deadband-Prüfung (siehe core.deadband)."""
+    if _heizung_deadband is None:
+        return True
+    return _heizung_deadband.check(jetzt, dict(zip(HEIZUNG_SPALTEN[1:], werte)))
+
+
+def _speichere_heizungsdaten_db(zeitstempel, werte):
+    """
+    Schreibt denselben Messwert in die SQLite heating-Tabelle, damit die
+    Heizungs-Views per Zeitbereichsabfrage statt CSV-Parsing lesen können.
+    """
+    if get_datastore is None:
+        return
+    try:
+        get_datastore().insert_heating_record(zeitstempel, *werte)
+    except Exception as e:
+        logger.error(f"Fehler beim Speichern in DataStore: {e}")
+
+
+def _veroeffentliche_heizungsdaten(jetzt, werte):
+    """Messwert als Sample auf den Datenbus (Topic 'heating', Spalten wie DataStore)."""
+    if publish is None:
+        return
+    publish("heating", jetzt, dict(zip(HEATING_COLUMNS, werte)))
+
+
+_kanal_schema_ok = False
+
+
+def _speichere_kanaele(zeitpunkt, values):
+    """Alle PP_INDEX_MAPPING-Kanäle in den Spaltenspeicher (core.channelstore)."""
+    global _kanal_schema_ok
+    if get_channelstore is None:
+        return
+    try:
+        store = get_channelstore()
+        if not _kanal_schema_ok:
+            store.ensure_schema(PP_KANAELE, _PLAN.kinds)
+            _kanal_schema_ok = True
+        store.append(zeitpunkt, values)
+    except Exception as e:
+        logger.error(f"Fehler beim Speichern der Kanäle: {e}")
+
+
 def _speichere_pufferdaten(daten):
     """
-    Speichert Pufferanlage-Daten in JSON (für strukturierte Abfragen)
+    Hängt Pufferanlage-Daten an den Verlauf (JSON Lines, für strukturierte Abfragen)
     """
-    json_datei = "Pufferspeicher.json"
-    
+    if _puffer_history is None:
+        return
     try:
-        # Lade bestehende Daten
-        puffer_history = []
-        if os.path.exists(json_datei):
-            try:
-                with open(json_datei, "r", encoding="utf-8") as f:
-                    puffer_history = json.load(f)
-            except:
-                puffer_history = []
-        
-        # Füge neue Daten hinzu
-        puffer_history.append(daten)
-        
-        # Halte nur die letzten 1000 Einträge (für Performance)
-        if len(puffer_history) > 1000:
-            puffer_history = puffer_history[-1000:]
-        
-        # Speichere
-        with open(json_datei, "w", encoding="utf-8") as f:
-            json.dump(puffer_history, f, ensure_ascii=False, indent=2)
-        
+        _puffer_history.append(daten)
         logger.debug(f"Pufferdaten gespeichert: {daten.get('Zeitstempel')}")
     except Exception as e:
         logger.error(f"Fehler beim Speichern von Pufferdaten: {e}")
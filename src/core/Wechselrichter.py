@@ -4,43 +4,86 @@ from datetime import datetime
 import time
 import os
 
+# Zeitindex + Monatsrotation für FroniusDaten.csv - optional
+try:
+    from core.csvlog import rotate_if_due, update_index
+except ImportError:
+    update_index = rotate_if_due = None
+
+# Keep-Alive-Sitzung zum Gerät (eine TCP-Verbindung statt einer je Abruf) - optional
+try:
+    from core.httpsession import DeviceSession
+    _http = DeviceSession("fronius")
+except ImportError:
+    _http = requests
+
+# Datenbus zur UI (Messwert ohne Umweg über die CSV) - optional
+try:
+    from core.databus import publish
+except ImportError:
+    publish = None
+
+# URL der Fronius API (ersetze die IP-Adresse durch die deines Wechselrichters)
+FRONIUS_URL = "http://192.168.1.202/solar_api/v1/GetPowerFlowRealtimeData.fcgi"
+# Timeout je Verbindungsaufbau/Antwort in Sekunden (ohne hängt ein toter Wechselrichter ewig)
+FRONIUS_TIMEOUT = 5
+
+
+def abrufen(timeout=FRONIUS_TIMEOUT):
+    """
+    Einmal abrufen und speichern (CSV, Zeitindex, Datenbus).
+    Fehler (Timeout, HTTP-Status, ungültige Antwort) werden geworfen.
+    """
+    response = _http.get(FRONIUS_URL, timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+
+    # Relevante Werte extrahieren
+    jetzt = datetime.now().replace(microsecond=0)
+    zeitstempel = jetzt.strftime("%Y-%m-%d %H:%M:%S")
+    pv_leistung = abs(data["Body"]["Data"]["Site"]["P_PV"] / 1000)  # Umrechnung in kW
+    netz_leistung = abs(data["Body"]["Data"]["Site"]["P_Grid"] / 1000)  # Umrechnung in kW
+    batterie_leistung = abs(data["Body"]["Data"]["Site"]["P_Akku"] / 1000)  # Umrechnung in kW
+    hausverbrauch = abs(data["Body"]["Data"]["Site"]["P_Load"] / 1000)  # Umrechnung in kW
+    batterieladestand = data["Body"]["Data"]["Inverters"]["1"]["SOC"]  # Batterieladestand in %
+
+    daten = {
+        "Zeitstempel": zeitstempel,
+        "PV-Leistung (kW)": pv_leistung,
+        "Netz-Leistung (kW)": netz_leistung,
+        "Batterie-Leistung (kW)": batterie_leistung,
+        "Hausverbrauch (kW)": hausverbrauch,
+        "Batterieladestand (%)": batterieladestand
+    }
+
+    # Daten in CSV speichern (data/ Verzeichnis nach Reorganisierung)
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    csv_datei = os.path.join(base_dir, "data", "FroniusDaten.csv")
+    datei_existiert = os.path.exists(csv_datei)
+
+    with open(csv_datei, "a", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        # Schreibe die Spaltenüberschriften, wenn die Datei nicht existiert oder leer ist
+        if not datei_existiert or os.stat(csv_datei).st_size == 0:
+            writer.writerow(daten.keys())  # Schreibe die Spaltenüberschriften
+        writer.writerow(daten.values())  # Schreibe die Werte
+    if update_index is not None:
+        update_index(csv_datei)
+        rotate_if_due(csv_datei)  # Monatswechsel: Vormonat ins Archiv
+    if publish is not None:
+        publish("fronius", jetzt, {
+            "pv_power": pv_leistung,
+            "grid_power": netz_leistung,
+            "batt_power": batterie_leistung,
+            "load_power": hausverbrauch,
+            "soc": batterieladestand,
+        })
+    return daten
+
+
 def abrufen_und_speichern():
     try:
-        # URL der Fronius API (ersetze die IP-Adresse durch die deines Wechselrichters)
-        url = "http://192.168.1.202/solar_api/v1/GetPowerFlowRealtimeData.fcgi"
-        response = requests.get(url)
-
-        if response.status_code == 200:
-            data = response.json()
-
-            # Relevante Werte extrahieren
-            zeitstempel = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            pv_leistung = abs(data["Body"]["Data"]["Site"]["P_PV"] / 1000)  # Umrechnung in kW
-            netz_leistung = abs(data["Body"]["Data"]["Site"]["P_Grid"] / 1000)  # Umrechnung in kW
-            batterie_leistung = abs(data["Body"]["Data"]["Site"]["P_Akku"] / 1000)  # Umrechnung in kW
-            hausverbrauch = abs(data["Body"]["Data"]["Site"]["P_Load"] / 1000)  # Umrechnung in kW
-            batterieladestand = data["Body"]["Data"]["Inverters"]["1"]["SOC"]  # Batterieladestand in %
-
-            daten = {
-                "Zeitstempel": zeitstempel,
-                "PV-Leistung (kW)": pv_leistung,
-                "Netz-Leistung (kW)": netz_leistung,
-                "Batterie-Leistung (kW)": batterie_leistung,
-                "Hausverbrauch (kW)": hausverbrauch,
-                "Batterieladestand (%)": batterieladestand
-            }
-
-            # Daten in CSV speichern (data/ Verzeichnis nach Reorganisierung)
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            csv_datei = os.path.join(base_dir, "data", "FroniusDaten.csv")
-            datei_existiert = os.path.exists(csv_datei)
-
-            with open(csv_datei, "a", newline="", encoding="utf-8") as file:
-                writer = csv.writer(file)
-                # Schreibe die Spaltenüberschriften, wenn die Datei nicht existiert oder leer ist
-                if not datei_existiert or os.stat(csv_datei).st_size == 0:
-                    writer.writerow(daten.keys())  # Schreibe die Spaltenüberschriften
-                writer.writerow(daten.values())  # Schreibe die Werte
+        abrufen()
     except Exception:
         pass  # Fehler beim Abrufen und Speichern werden ignoriert
 
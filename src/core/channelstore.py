@@ -0,0 +1,408 @@
+"""
+Spaltenspeicher für alle BMK-Kanäle (PP_INDEX_MAPPING)
+======================================================
+Heizungstemperaturen.csv behält nur sechs Temperaturen; hier landet der
+komplette Vektor jedes Abrufs (Pumpen, Mischer, Rauchgas, Brenner,
+Betriebsstunden, ...), kompakt und spaltenweise abfragbar:
+
+- Zahlen als float32 (Parser: core.daqparse, "32h" -> 32.0), fehlend = NaN
+- Statustexte ("EIN"/"AUS"/"HEIZEN"/...) wörterbuchkodiert als uint8,
+  MISSING_CODE = fehlend; das Wörterbuch wächst bei neuen Texten
+- Typ je Kanal legt der Parse-Plan fest (ensure_schema, schema.json)
+
+Ablage in data/bmk_kanaele/:
+- schema.json: Kanäle, Typ, Wörterbuch
+- aktuell.rows: laufender Tag als Datensätze fester Breite (Anhängen O(1))
+- YYYY-MM-DD.<n>.rows: abgeschlossener Tag, wartet aufs Komprimieren; beim
+  Tageswechsel wird aktuell.rows nur umbenannt, komprimiert wird in einem
+  Hintergrund-Thread (nicht im Sammler-Thread, nicht unter dem Lock)
+- YYYY-MM-DD.npz: abgeschlossene Tage spaltenweise (komprimiert); eine
+  Abfrage lädt nur die angefragten Spalten. Segmente mit anderen Kanälen
+  (Schema neu angelegt) werden zusammengeführt, fehlende Kanäle als
+  NaN bzw. MISSING_CODE aufgefüllt
+
+Beispiel: Brennerlaufzeit der letzten Woche
+
+    store = get_channelstore()
+    woche = datetime.now() - timedelta(days=7)
+    times, cols = store.query(["Brenner_Status", "Rauchgastemperatur"], start=woche)
+    store.duty("Brenner_Status", ("HEIZEN",), start=woche)
+"""
+
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from core.datastore import from_epoch, to_epoch
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+STORE_DIR = os.path.join(DATA_DIR, "bmk_kanaele")
+
+# Kennung "fehlend" in Statuskanälen; höchstens MISSING_CODE Texte je Kanal
+MISSING_CODE = 255
+NAN = math.nan
+ROWS_FILE = "aktuell.rows"
+SEALED_SUFFIX = ".rows"
+SCHEMA_FILE = "schema.json"
+
+
+def _missing(dtype, n):
+    """n fehlende Werte: NaN (Zahlen) bzw. MISSING_CODE (Status)."""
+    return np.full(n, NAN if dtype.kind == "f" else MISSING_CODE, dtype=dtype)
+
+
+def _merge_columns(old, new):
+    """
+    Spalten zweier Teile eines Tages aneinanderhängen (Vereinigung der
+    Kanäle, fehlende aufgefüllt). Zeilen, die schon im alten Teil stehen
+    (abgebrochenes Komprimieren), werden nicht doppelt übernommen.
+    """
+    fresh = ~np.isin(new["ts"], old["ts"])
+    n_old, n_new = len(old["ts"]), int(np.count_nonzero(fresh))
+    merged = {}
+    for field in dict.fromkeys([*old, *new]):
+        head = old[field] if field in old else _missing(new[field].dtype, n_old)
+        tail = new[field][fresh] if field in new else _missing(old[field].dtype, n_new)
+        merged[field] = np.concatenate((head, tail))
+    return merged
+
+
+class ChannelStore:
+    """Spaltenspeicher: Kanäle fester Reihenfolge, Zeitstempel als Epoch-Sekunden (lokal)."""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._schema = None  # {"channels": [{"name", "kind", "labels"}]}
+        self._dtype = None
+        self._codes = {}  # Kanal -> {Text: Code}
+        self._rows_day = None  # Datum der ersten Zeile in aktuell.rows
+        self._compactor = None  # Hintergrund-Thread für abgeschlossene Tage
+        self._load_schema()
+        if self._schema is not None and self._sealed():
+            with self._lock:
+                self._start_compaction()  # liegengebliebene Tage (Neustart)
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_schema(self):
+        try:
+            with open(self._path(SCHEMA_FILE), encoding="utf-8") as f:
+                self._set_schema(json.load(f))
+        except (OSError, ValueError):
+            self._schema = None
+
+    def _set_schema(self, schema):
+        self._schema = schema
+        fields = [("ts", "<i8")]
+        for channel in schema["channels"]:
+            fields.append((channel["name"], "<f4" if channel["kind"] == "f" else "u1"))
+        self._dtype = np.dtype(fields)
+        self._codes = {
+            c["name"]: {label: i for i, label in enumerate(c["labels"])}
+            for c in schema["channels"]
+            if c["kind"] == "s"
+        }
+        # Slots für append: Zahlen direkt, Status über das Wörterbuch
+        channels = schema["channels"]
+        self._float_slots = [i for i, c in enumerate(channels) if c["kind"] == "f"]
+        self._status_slots = [(i, self._codes[c["name"]]) for i, c in enumerate(channels) if c["kind"] == "s"]
+        self._row = [0] * (len(channels) + 1)
+        self._record = np.zeros(1, dtype=self._dtype)
+
+    def _save_schema(self):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = self._path(SCHEMA_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._schema, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self._path(SCHEMA_FILE))
+
+    def ensure_schema(self, names, kinds):
+        """
+        Schema anlegen bzw. prüfen, ob das vorhandene zu den Kanälen passt.
+
+        Args:
+            names: Kanalnamen in Slot-Reihenfolge
+            kinds: je Kanal 'f' (Zahl) oder 's' (Status)
+
+        Raises:
+            ValueError: vorhandenes Schema hat andere Kanäle/Typen
+        """
+        with self._lock:
+            if self._schema is None:
+                channels = [{"name": n, "kind": k, "labels": []} for n, k in zip(names, kinds)]
+                self._set_schema({"channels": channels})
+                self._save_schema()
+            elif self.channels() != list(zip(names, kinds)):
+                raise ValueError(f"Schema in {self.directory} passt nicht zu den Kanälen")
+
+    def channels(self):
+        """[(Name, Typ)] mit Typ 'f' (float32) oder 's' (Status, kodiert)."""
+        if self._schema is None:
+            return []
+        return [(c["name"], c["kind"]) for c in self._schema["channels"]]
+
+    def labels(self, channel):
+        """Wörterbuch eines Statuskanals (Code = Listenindex)."""
+        for c in self._schema["channels"] if self._schema else ():
+            if c["name"] == channel:
+                return list(c["labels"])
+        raise KeyError(channel)
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+    def append(self, timestamp, values):
+        """
+        Einen Abruf speichern (Schema vorher per ensure_schema).
+
+        Args:
+            timestamp: datetime des Abrufs
+            values: Werte je Slot (core.daqparse): float/None bzw. str/None
+        """
+        with self._lock:
+            row = self._row
+            row[0] = to_epoch(timestamp)
+            for i in self._float_slots:
+                value = values[i]
+                row[i + 1] = NAN if value is None else value
+            for i, codes in self._status_slots:
+                value = values[i]
+                if value is None:
+                    row[i + 1] = MISSING_CODE
+                    continue
+                code = codes.get(value)
+                if code is None:
+                    code = self._add_label(i, value)
+                row[i + 1] = code
+            # ein Zugriff statt einer Zuweisung je Feld
+            self._record[0] = tuple(row)
+
+            day = timestamp.date()
+            if self._rows_day is None:
+                self._drop_torn_record()
+                self._rows_day = self._first_row_day()
+            if self._rows_day is not None and self._rows_day != day:
+                self._seal()
+            with open(self._path(ROWS_FILE), "ab") as f:
+                f.write(self._record.tobytes())
+            if self._rows_day is None:
+                self._rows_day = day
+
+    def _add_label(self, slot, text):
+        """Neuen Statustext ins Wörterbuch (Schema sofort speichern, vor den Daten)."""
+        channel = self._schema["channels"][slot]
+        codes = self._codes[channel["name"]]
+        if len(codes) >= MISSING_CODE:
+            return MISSING_CODE  # Wörterbuch voll
+        codes[text] = len(channel["labels"])
+        channel["labels"].append(text)
+        self._save_schema()
+        return codes[text]
+
+    def _read_rows(self, name=ROWS_FILE):
+        try:
+            data = np.fromfile(self._path(name), dtype=np.uint8)
+        except (OSError, ValueError):
+            return np.zeros(0, dtype=self._dtype)
+        # halb geschriebener letzter Datensatz (Absturz) wird ignoriert
+        usable = len(data) - len(data) % self._dtype.itemsize
+        return data[:usable].view(self._dtype)
+
+    def _drop_torn_record(self):
+        """Halben Datensatz am Ende abschneiden, sonst wären alle folgenden verschoben."""
+        try:
+            size = os.path.getsize(self._path(ROWS_FILE))
+        except OSError:
+            return
+        if size % self._dtype.itemsize:
+            with open(self._path(ROWS_FILE), "r+b") as f:
+                f.truncate(size - size % self._dtype.itemsize)
+
+    def _first_row_day(self):
+        rows = self._read_rows()
+        if not len(rows):
+            return None
+        return from_epoch(int(rows["ts"][0])).date()
+
+    def _sealed(self):
+        """Abgeschlossene, noch nicht komprimierte Tagesdateien (aufsteigend)."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(n for n in os.listdir(self.directory) if n.endswith(SEALED_SUFFIX) and n != ROWS_FILE)
+
+    def _seal(self):
+        """aktuell.rows als abgeschlossen umbenennen (O(1)); komprimiert wird im Hintergrund."""
+        day = f"{self._rows_day:%Y-%m-%d}"
+        n = 0
+        while os.path.exists(self._path(f"{day}.{n}{SEALED_SUFFIX}")):
+            n += 1  # Tag wartet schon (Uhr zurückgestellt): eigene Datei
+        os.replace(self._path(ROWS_FILE), self._path(f"{day}.{n}{SEALED_SUFFIX}"))
+        self._rows_day = None
+        self._start_compaction()
+
+    def _start_compaction(self):
+        """Hintergrund-Thread starten, falls keiner läuft (unter self._lock)."""
+        if self._compactor is None:
+            self._compactor = threading.Thread(target=self._compact_sealed, daemon=True, name="ChannelCompact")
+            self._compactor.start()
+
+    def _compact_sealed(self):
+        """Hintergrund-Thread: abgeschlossene Tage komprimieren, bis keiner mehr wartet."""
+        while True:
+            with self._lock:
+                names = self._sealed()
+                if not names:
+                    self._compactor = None
+                    return
+            for name in names:
+                try:
+                    self._compact(name)
+                except Exception as e:
+                    # Datei bleibt liegen, nächster Versuch beim nächsten Tageswechsel/Start
+                    print(f"[KANAL] Komprimieren von {name} fehlgeschlagen: {e}")
+                    with self._lock:
+                        self._compactor = None
+                    return
+
+    def _compact(self, name):
+        """Eine abgeschlossene Datei in Tagessegmente (spaltenweise .npz) umschreiben."""
+        rows = self._read_rows(name)
+        written = []
+        if len(rows):
+            days = (rows["ts"] // 86400).astype(np.int64)
+            for day in np.unique(days):
+                part = rows[days == day]
+                stem = from_epoch(int(day) * 86400).strftime("%Y-%m-%d")
+                path = self._path(f"{stem}.npz")
+                columns = {field: part[field] for field in self._dtype.names}
+                if os.path.exists(path):  # Tag schon teilweise segmentiert
+                    with np.load(path) as old:
+                        columns = _merge_columns({f: old[f] for f in old.files}, columns)
+                tmp = self._path(f"{stem}.tmp.npz")
+                np.savez_compressed(tmp, **columns)
+                written.append((tmp, path))
+        # Segmente und Datei gemeinsam tauschen: Abfragen sehen jede Zeile genau einmal
+        with self._lock:
+            for tmp, path in written:
+                os.replace(tmp, path)
+            os.remove(self._path(name))
+
+    def flush(self, timeout=None):
+        """Auf das Komprimieren abgeschlossener Tage warten (Tests, Beenden)."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def _segments(self, start, end):
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(n for n in os.listdir(self.directory) if n.endswith(".npz") and ".tmp" not in n)
+        lo = f"{start:%Y-%m-%d}" if start is not None else ""
+        hi = f"{end:%Y-%m-%d}" if end is not None else "9999"
+        return [n for n in names if lo <= n[:10] <= hi]
+
+    def query(self, channels, start=None, end=None, decode=True):
+        """
+        Kanäle im Zeitfenster start <= t <= end (None = offen).
+
+        Args:
+            channels: Kanalnamen
+            decode: Statuskanäle als Text (object-Array, None = fehlend)
+                statt Code (uint8)
+
+        Returns:
+            (Zeitstempel datetime64[s], {Kanal: Array})
+        """
+        if self._schema is None:
+            return np.zeros(0, dtype="datetime64[s]"), {c: np.zeros(0) for c in channels}
+        kinds = dict(self.channels())
+        for channel in channels:
+            if channel not in kinds:
+                raise KeyError(channel)
+        fields = ["ts", *channels]
+        with self._lock:
+            parts = []
+            for name in self._segments(start, end):
+                with np.load(self._path(name)) as segment:
+                    n = len(segment["ts"])
+                    parts.append({
+                        f: segment[f] if f in segment.files else _missing(self._dtype[f], n)
+                        for f in fields
+                    })
+            for name in (*self._sealed(), ROWS_FILE):
+                rows = self._read_rows(name)
+                parts.append({f: rows[f] for f in fields})
+
+        ts = np.concatenate([p["ts"] for p in parts])
+        # wartende Tage können vor älteren Segmenten stehen (Uhr zurückgestellt)
+        order = np.argsort(ts, kind="stable") if np.any(ts[1:] < ts[:-1]) else slice(None)
+        ts = ts[order]
+        mask = np.ones(len(ts), dtype=bool)
+        if start is not None:
+            mask &= ts >= to_epoch(start)
+        if end is not None:
+            mask &= ts <= to_epoch(end)
+        result = {}
+        for channel in channels:
+            column = np.concatenate([p[channel] for p in parts])[order][mask]
+            if kinds[channel] == "s" and decode:
+                labels = self.labels(channel)
+                lookup = np.array(labels + [None] * (MISSING_CODE + 1 - len(labels)), dtype=object)
+                column = lookup[column]
+            result[channel] = column
+        return ts[mask].astype("datetime64[s]"), result
+
+    def duty(self, channel, on=("EIN",), start=None, end=None, max_gap=120):
+        """
+        Einschaltdauer eines Statuskanals (zeitgewichtet, Lücken > max_gap s ignoriert).
+
+        Returns:
+            {"on_seconds", "total_seconds", "ratio", "starts"} (starts = Wechsel aus -> ein)
+        """
+        times, cols = self.query([channel], start, end, decode=False)
+        labels = self.labels(channel)
+        on_codes = [labels.index(label) for label in on if label in labels]
+        state = np.isin(cols[channel], on_codes)
+        ts = times.astype(np.int64)
+        dt = np.diff(ts)
+        valid = dt <= max_gap
+        on_seconds = float(dt[valid & state[:-1]].sum())
+        total = float(dt[valid].sum())
+        starts = int(np.count_nonzero(state[1:] & ~state[:-1]))
+        return {
+            "on_seconds": on_seconds,
+            "total_seconds": total,
+            "ratio": on_seconds / total if total else None,
+            "starts": starts,
+        }
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_channelstore():
+    """Prozessweiter ChannelStore unter data/bmk_kanaele."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ChannelStore()
+        return _shared_store
+
+
+if __name__ == "__main__":
+    store = get_channelstore()
+    for name, kind in store.channels():
+        extra = f" {store.labels(name)}" if kind == "s" else ""
+        print(f"[KANAL] {name}: {kind}{extra}")
@@ -0,0 +1,321 @@
+"""
+Sammler-Engine (asyncio)
+========================
+Ersetzt die beiden Polling-Threads (Wechselrichter, BMK) durch eine
+Event-Loop in einem einzigen Hintergrund-Thread:
+
+- festes Raster ohne Drift: Abruf k startet bei t0 + k * interval
+  (monotone Loop-Uhr), die Dauer des Abrufs verschiebt den Takt nicht
+- Timeout pro Quelle (an `requests` durchgereicht und zusätzlich von
+  asyncio überwacht), ein hängendes Gerät blockiert nur seine Quelle
+- jede Quelle ruft in einem eigenen Thread ab; läuft der vorige Abruf noch
+  (Gerät hält die Verbindung offen), wird der Takt ausgelassen statt einen
+  zweiten Abruf zu starten - hängende Abrufe stauen sich nicht auf
+- nach Fehlern exponentielles Backoff mit Jitter, danach wieder im Raster
+- pro Quelle Abrufe, Fehler, Latenz (letzte/Mittel/Max) und verpasste
+  Takte; Zusammenfassung alle SUMMARY_INTERVAL Sekunden im Log
+
+Die Abruffunktionen selbst bleiben blockierend (`requests`) und laufen im
+Abruf-Thread ihrer Quelle (Daemon, kein gemeinsamer Thread-Pool); die Loop
+plant nur.
+"""
+
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Standard-Abtastintervall der Geräte (Sekunden)
+DEFAULT_INTERVAL = 10.0
+# Backoff nach Fehlern: BASE * 2^(n-1), begrenzt auf MAX, Jitter +-JITTER
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 120.0
+BACKOFF_JITTER = 0.2
+# Zusätzliche Frist über dem HTTP-Timeout, bevor asyncio abbricht
+TIMEOUT_MARGIN = 2.0
+# Abstand der Statistik-Ausgabe (Sekunden)
+SUMMARY_INTERVAL = 600.0
+
+
+class Source:
+    """Ein Gerät: collect(timeout=...) ruft ab und speichert (blockierend)."""
+
+    def __init__(self, name, collect, interval=DEFAULT_INTERVAL, timeout=5.0):
+        self.name = name
+        self.collect = collect
+        self.interval = interval
+        self.timeout = timeout
+
+
+class SourceStats:
+    """Laufzeitwerte einer Quelle."""
+
+    def __init__(self):
+        self.runs = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.consecutive_errors = 0
+        self.missed_ticks = 0
+        self.busy_skips = 0  # davon: voriger Abruf lief noch
+        self.last_latency = None
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.last_error = None
+        self.last_success = None  # time.time()
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "consecutive_errors": self.consecutive_errors,
+            "missed_ticks": self.missed_ticks,
+            "busy_skips": self.busy_skips,
+            "last_latency": self.last_latency,
+            "avg_latency": self.total_latency / self.runs if self.runs else None,
+            "max_latency": self.max_latency,
+            "last_error": self.last_error,
+            "last_success": self.last_success,
+        }
+
+
+def backoff_delay(failures, base=BACKOFF_BASE, maximum=BACKOFF_MAX, jitter=BACKOFF_JITTER):
+    """Wartezeit nach `failures` Fehlern in Folge (>= 1)."""
+    delay = min(maximum, base * 2 ** (failures - 1))
+    return delay * random.uniform(1 - jitter, 1 + jitter)
+
+
+class _FetchThread:
+    """Abruf-Thread einer Quelle (Daemon); höchstens ein Abruf gleichzeitig."""
+
+    def __init__(self, name):
+        self.busy = False
+        self._jobs = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f"Collect-{name}")
+        self._thread.start()
+
+    def submit(self, loop, fn, **kwargs):
+        """fn(**kwargs) im Abruf-Thread starten; liefert ein asyncio-Future der Loop."""
+        future = loop.create_future()
+        self.busy = True
+        self._jobs.put((loop, future, fn, kwargs))
+        return future
+
+    def close(self):
+        """Thread beendet sich nach dem laufenden Abruf."""
+        self._jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            loop, future, fn, kwargs = job
+            try:
+                result, error = fn(**kwargs), None
+            except Exception as e:
+                result, error = None, e
+            self.busy = False
+            try:
+                loop.call_soon_threadsafe(_settle, future, result, error)
+            except RuntimeError:
+                pass  # Loop bereits beendet
+
+
+def _settle(future, result, error):
+    # nach Timeout/Stopp ist das Future schon abgebrochen: Ergebnis verwerfen
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class CollectorEngine:
+    """Plant alle Quellen in einer asyncio-Loop (eigener Daemon-Thread)."""
+
+    def __init__(self, sources, summary_interval=SUMMARY_INTERVAL):
+        self.sources = list(sources)
+        self.summary_interval = summary_interval
+        self._stats = {source.name: SourceStats() for source in self.sources}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._stop = None
+        self._started = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Steuerung (aus beliebigem Thread)
+    # ------------------------------------------------------------------
+    def start(self):
+        """Loop-Thread starten (idempotent)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="Collector")
+        self._thread.start()
+        self._started.wait(timeout=5)
+        print(f"[COLLECT] Gestartet: {', '.join(s.name for s in self.sources)}")
+
+    def stop(self, timeout=5.0):
+        """Alle Quellen beenden; laufende Abrufe werden nicht abgewartet."""
+        loop, stop = self._loop, self._stop
+        if loop is not None and stop is not None:
+            try:
+                loop.call_soon_threadsafe(stop.set)
+            except RuntimeError:
+                pass  # Loop bereits beendet
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self):
+        """Quelle -> Kennzahlen (Kopie)."""
+        with self._lock:
+            return {name: s.as_dict() for name, s in self._stats.items()}
+
+    # ------------------------------------------------------------------
+    # Loop-Thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except Exception as e:
+            logger.error(f"Collector-Loop beendet: {e}")
+        finally:
+            self._loop = None
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._started.set()
+        tasks = [asyncio.create_task(self._poll(source), name=source.name) for source in self.sources]
+        if self.summary_interval:
+            tasks.append(asyncio.create_task(self._summary()))
+        await self._stop.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _sleep_until(self, deadline):
+        """Bis `deadline` (Loop-Uhr) warten; True wenn gestoppt wurde."""
+        delay = deadline - self._loop.time()
+        if delay <= 0:
+            return self._stop.is_set()
+        try:
+            await asyncio.wait_for(self._stop.wait(), delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _poll(self, source):
+        stats = self._stats[source.name]
+        fetcher = _FetchThread(source.name)
+        t0 = self._loop.time()
+        tick = 0
+        try:
+            while not self._stop.is_set():
+                started = self._loop.time()
+                error = None
+                if fetcher.busy:
+                    # voriger Abruf hängt noch im Abruf-Thread: Takt auslassen
+                    with self._lock:
+                        stats.missed_ticks += 1
+                        stats.busy_skips += 1
+                else:
+                    timed_out = False
+                    try:
+                        await asyncio.wait_for(
+                            fetcher.submit(self._loop, source.collect, timeout=source.timeout),
+                            source.timeout + TIMEOUT_MARGIN,
+                        )
+                    except asyncio.CancelledError:
+                        raise
+                    except asyncio.TimeoutError:
+                        # der Abruf-Thread läuft weiter, bis requests selbst abbricht
+                        error, timed_out = f"kein Ergebnis nach {source.timeout + TIMEOUT_MARGIN:.0f}s", True
+                    except Exception as e:
+                        error = str(e) or type(e).__name__
+                    self._record(source, stats, self._loop.time() - started, error, timed_out)
+                now = self._loop.time()
+
+                # nächster Takt im Raster; übersprungene Takte zählen
+                due = int((now - t0) // source.interval) + 1
+                with self._lock:
+                    stats.missed_ticks += max(0, due - tick - 1)
+                tick = due
+                deadline = t0 + tick * source.interval
+                if error is not None:
+                    # Backoff, danach auf den nächsten Rastertakt ausrichten
+                    resume = now + backoff_delay(stats.consecutive_errors)
+                    if resume > deadline:
+                        skipped = int((resume - t0) // source.interval) + 1 - tick
+                        tick += skipped
+                        deadline = t0 + tick * source.interval
+                if await self._sleep_until(deadline):
+                    break
+        finally:
+            fetcher.close()
+
+    def _record(self, source, stats, latency, error, timed_out=False):
+        with self._lock:
+            stats.runs += 1
+            stats.last_latency = latency
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+            if error is None:
+                stats.consecutive_errors = 0
+                stats.last_success = time.time()
+                return
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error = error
+            if timed_out:
+                stats.timeouts += 1
+            failures = stats.consecutive_errors
+        # nur erste Fehler einer Serie und danach jeden zehnten melden
+        if failures == 1 or failures % 10 == 0:
+            logger.error(f"{source.name}: Abruf fehlgeschlagen ({failures}x in Folge): {error}")
+
+    async def _summary(self):
+        while not await self._sleep_until(self._loop.time() + self.summary_interval):
+            for name, s in self.stats().items():
+                avg = s["avg_latency"]
+                print(
+                    f"[COLLECT] {name}: {s['runs']} Abrufe, {s['errors']} Fehler, "
+                    f"{s['missed_ticks']} Takte verpasst ({s['busy_skips']} wegen laufendem Abruf), Latenz "
+                    f"Ø {avg * 1000 if avg is not None else 0:.0f} ms / "
+                    f"max {s['max_latency'] * 1000:.0f} ms"
+                )
+
+
+def default_sources(interval=DEFAULT_INTERVAL):
+    """Wechselrichter (Fronius) und Heizung (BMK) im gleichen Takt."""
+    from core import BMKDATEN, Wechselrichter
+
+    return [
+        Source("Wechselrichter", Wechselrichter.abrufen, interval, Wechselrichter.FRONIUS_TIMEOUT),
+        Source("BMKDATEN", BMKDATEN.abrufen, interval, BMKDATEN.BMK_TIMEOUT),
+    ]
+
+
+if __name__ == "__main__":
+    import sys
+
+    engine = CollectorEngine(default_sources(), summary_interval=60)
+    engine.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        engine.stop()
+        for name, values in engine.stats().items():
+            print(f"[COLLECT] {name}: {values}", file=sys.stderr)
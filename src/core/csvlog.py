@@ -0,0 +1,738 @@
+"""
+Streaming-Zugriff auf die CSV-Logs (FroniusDaten.csv, Heizungstemperaturen.csv)
+================================================================================
+Liest nur das angefragte Zeitfenster: Binärsuche auf den ersten Messwert
+>= start, danach blockweise (`chunksize`) mit expliziten Spalten. Der
+Speicherbedarf richtet sich nach dem Fenster, nicht nach der Dateigröße.
+
+Voraussetzung: die Logs werden zeitlich aufsteigend angehängt und jede
+Zeile beginnt mit einem ISO-Zeitstempel ('YYYY-MM-DD HH:MM:SS').
+
+Zeitindex (<datei>.idx): pro 10-Minuten-Grenze eine Zeile
+'YYYY-MM-DD HH:MM,<byte-offset>' mit dem Offset der ersten Zeile ab dieser
+Grenze. Die Collectoren pflegen ihn nach jedem Anhängen (`update_index`),
+Leser finden darüber Anfang und Ende eines Fensters ohne die Datei zu
+durchsuchen (`read_range`). Fehlt der Index oder passt er nicht mehr zur
+Datei, wird auf die Binärsuche zurückgefallen.
+
+Monatsrotation (`rotate_if_due`, von den Collectoren nach dem Anhängen
+aufgerufen): abgeschlossene Monate wandern als gzip-Archiv nach
+archiv/<Name>_YYYY-MM.csv.gz, die aktive Datei behält nur den laufenden
+Monat. archiv/manifest.json führt je Log die Segmente mit erstem/letztem
+Zeitstempel und Zeilenzahl. `read_range` und `read_window` öffnen nur die
+Segmente, die das Fenster überlappen - Leser bleiben über Jahre gleich
+schnell, Archive werden für aktuelle Fenster gar nicht angefasst.
+
+Parquet-Stufe (optional, pyarrow): abgeschlossene Monate liegen zusätzlich
+als <Name>_YYYY-MM.parquet vor - zeitlich sortiert, typisiert, eine
+Row-Group je Tag mit Min/Max-Statistik (`export_parquet`, nach jeder
+Rotation). `read_window` liest diese Segmente über pyarrow mit
+Spaltenauswahl und Zeitfilter (nur passende Row-Groups werden
+dekodiert) statt CSV-Text zu parsen. Ohne pyarrow bleibt alles beim gzip.
+"""
+
+import bisect
+import gzip
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+# Parquet-Stufe der Archive - optional
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TIME_COLUMN = "Zeitstempel"
+
+# Zeilen pro pandas-Block beim Streamen
+CHUNK_ROWS = 50000
+# Unterhalb dieser Spanne (Bytes) linear statt binär suchen
+SEEK_BLOCK = 16384
+# Raster des Zeitindex in Minuten (muss 60 teilen)
+INDEX_STEP_MINUTES = 10
+INDEX_SUFFIX = ".idx"
+
+# Geladene Indizes: idx-Pfad -> (gelesene Bytes, [Schlüssel], [Offsets])
+_index_cache = {}
+
+# Archiv abgeschlossener Monate (neben dem Log)
+ARCHIVE_DIR = "archiv"
+MANIFEST_FILE = "manifest.json"
+ARCHIVE_SUFFIX = ".csv.gz"
+# Kompression der Archive (1 = schnell ... 9 = klein)
+ARCHIVE_LEVEL = 6
+# Parquet-Segmente: Zeilen je Row-Group (1 Tag bei 10 s), Kompression
+PARQUET_SUFFIX = ".parquet"
+PARQUET_ROW_GROUP = 8640
+PARQUET_COMPRESSION = "zstd"
+# So viele Zeilen am Dateianfang nach dem ersten gültigen Zeitstempel durchsuchen
+PROBE_LINES = 20
+
+# Manifest: Verzeichnis -> (mtime, Inhalt); aktive Monate: Log-Pfad -> 'YYYY-MM'
+_manifest_cache = {}
+_active_month = {}
+_manifest_lock = threading.Lock()
+
+
+def _line_time(line):
+    """Zeitstempel am Zeilenanfang oder None (Header, Kaputtzeile, EOF)."""
+    try:
+        return datetime.fromisoformat(line[:19].decode("ascii"))
+    except (UnicodeDecodeError, ValueError):
+        return None
+
+
+def read_header(f):
+    """Spaltennamen aus der ersten Zeile; Datei steht danach am Datenanfang."""
+    f.seek(0)
+    header = f.readline().decode("utf-8-sig", errors="replace")
+    return [name.strip() for name in header.split(",")]
+
+
+def seek_time(f, cutoff, lo, hi):
+    """
+    Byte-Offset der ersten Zeile in [lo, hi) mit Zeitstempel >= cutoff.
+
+    `lo` muss auf einem Zeilenanfang liegen. Nicht lesbare Zeilen zählen
+    als ">= cutoff" - die Suche endet dann eher zu früh als zu spät.
+    """
+    while hi - lo > SEEK_BLOCK:
+        mid = (lo + hi) // 2
+        f.seek(mid)
+        f.readline()  # angeschnittene Zeile überspringen
+        line_start = f.tell()
+        line = f.readline()
+        ts = _line_time(line)
+        if ts is not None and ts < cutoff:
+            lo = line_start + len(line)
+        else:
+            hi = mid
+
+    f.seek(lo)
+    while True:
+        pos = f.tell()
+        line = f.readline()
+        if not line or pos >= hi:
+            return pos
+        ts = _line_time(line)
+        if ts is not None and ts >= cutoff:
+            return pos
+
+
+def index_path(path):
+    """Pfad der Index-Datei zu einem CSV-Log."""
+    return path + INDEX_SUFFIX
+
+
+def _index_key(ts):
+    """Schlüssel der 10-Minuten-Grenze (<= ts), lexikografisch sortierbar."""
+    return f"{ts:%Y-%m-%d %H}:{ts.minute - ts.minute % INDEX_STEP_MINUTES:02d}"
+
+
+def _load_index(path):
+    """
+    (Schlüssel, Offsets) des Index, neu angehängte Einträge werden nachgelesen.
+    Leere Listen wenn kein Index existiert.
+    """
+    idx = index_path(path)
+    try:
+        size = os.path.getsize(idx)
+    except OSError:
+        _index_cache.pop(idx, None)
+        return [], []
+
+    read, keys, offsets = _index_cache.get(idx, (0, [], []))
+    if size < read:
+        read, keys, offsets = 0, [], []  # Index wurde neu aufgebaut
+    if size > read:
+        with open(idx, "rb") as f:
+            f.seek(read)
+            data = f.read()
+        # nur vollständige Zeilen übernehmen (Collector schreibt evtl. gerade)
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].decode("ascii", errors="replace").splitlines():
+            key, _, offset = line.partition(",")
+            try:
+                offsets.append(int(offset))
+            except ValueError:
+                continue
+            keys.append(key)
+        read += complete
+        _index_cache[idx] = (read, keys, offsets)
+    return keys, offsets
+
+
+def _check_entry(f, key, offset, size):
+    """Zeigt der Eintrag auf eine Zeile aus seinem 10-Minuten-Raster?"""
+    if offset > size:
+        return False
+    f.seek(offset)
+    ts = _line_time(f.readline())
+    return ts is not None and _index_key(ts) == key
+
+
+def update_index(path):
+    """
+    Index nach dem Anhängen nachführen (von den Collectoren aufgerufen).
+
+    Liest nur ab dem letzten Indexeintrag, also höchstens ein Raster plus
+    die neuen Zeilen. Passt der Index nicht zur Datei (ersetzt, gekürzt),
+    wird er komplett neu aufgebaut.
+
+    Returns:
+        Anzahl neuer Einträge
+    """
+    if not os.path.exists(path):
+        return 0
+    idx = index_path(path)
+    keys, offsets = _load_index(path)
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if keys and _check_entry(f, keys[-1], offsets[-1], size):
+            mode, last_key, pos = "a", keys[-1], offsets[-1]
+        else:
+            read_header(f)
+            mode, last_key, pos = "w", "", f.tell()
+            _index_cache.pop(idx, None)
+
+        entries = []
+        last_minute = None
+        f.seek(pos)
+        for line in f:
+            # nur bei Minutenwechsel parsen (Präfix 'YYYY-MM-DD HH:MM')
+            if line[:16] != last_minute:
+                ts = _line_time(line)
+                if ts is not None:
+                    last_minute = line[:16]
+                    key = _index_key(ts)
+                    if key > last_key:
+                        entries.append(f"{key},{pos}\n")
+                        last_key = key
+            pos += len(line)
+
+    if entries or mode == "w":
+        with open(idx, mode, encoding="ascii") as out:
+            out.writelines(entries)
+    return len(entries)
+
+
+def build_index(path):
+    """Index komplett neu aufbauen (z.B. für bestehende Logs)."""
+    try:
+        os.remove(index_path(path))
+    except OSError:
+        pass
+    _index_cache.pop(index_path(path), None)
+    return update_index(path)
+
+
+def _indexed_offset(f, path, ts, size, after=False):
+    """
+    Byte-Offset aus dem Index: Start des Rasters mit ts (after=False) bzw. des
+    ersten Rasters nach ts (after=True). None wenn kein passender Eintrag.
+    """
+    keys, offsets = _load_index(path)
+    if not keys:
+        return None
+    key = _index_key(ts)
+    if after:
+        i = bisect.bisect_right(keys, key)
+        if i == len(keys):
+            return size  # Fenster reicht bis ans Dateiende
+    else:
+        i = bisect.bisect_right(keys, key) - 1
+        if i < 0:
+            return None
+    if not _check_entry(f, keys[i], offsets[i], size):
+        return None
+    return offsets[i]
+
+
+def _start_offset(f, path, start, data_start, size):
+    """Erster Offset mit Zeitstempel >= start: Index, sonst Binärsuche."""
+    if start is None:
+        return data_start
+    lo = _indexed_offset(f, path, start, size)
+    if lo is None:
+        return seek_time(f, start, data_start, size)
+    return seek_time(f, start, lo, size)
+
+
+def find_offset(path, start):
+    """Byte-Offset der ersten Datenzeile mit Zeitstempel >= start (None = Datenanfang)."""
+    with open(path, "rb") as f:
+        read_header(f)
+        data_start = f.tell()
+        return _start_offset(f, path, start, data_start, os.fstat(f.fileno()).st_size)
+
+
+def archive_dir(path):
+    """Archivverzeichnis eines Logs (archiv/ neben der Datei)."""
+    return os.path.join(os.path.dirname(os.path.abspath(path)), ARCHIVE_DIR)
+
+
+def _read_manifest(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _load_manifest(directory):
+    """Manifest {Log-Name: [Segmente]} (gecacht bis zur nächsten Änderung); leer wenn keins existiert."""
+    try:
+        mtime = os.stat(os.path.join(directory, MANIFEST_FILE)).st_mtime_ns
+    except OSError:
+        return {}
+    cached = _manifest_cache.get(directory)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, _read_manifest(directory))
+        _manifest_cache[directory] = cached
+    return cached[1]
+
+
+def _save_manifest(directory, manifest):
+    tmp = os.path.join(directory, MANIFEST_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, os.path.join(directory, MANIFEST_FILE))
+    _manifest_cache.pop(directory, None)
+
+
+def archive_segments(path, start=None, end=None):
+    """
+    Archivsegmente eines Logs, die das Fenster start..end überlappen
+    (None = offen). Entschieden wird allein über das Manifest.
+
+    Returns:
+        Liste von (Archivpfad, Manifest-Eintrag), zeitlich aufsteigend
+    """
+    directory = archive_dir(path)
+    entries = _load_manifest(directory).get(os.path.basename(path), [])
+    lo = f"{start:%Y-%m-%d %H:%M:%S}" if start is not None else ""
+    hi = f"{end:%Y-%m-%d %H:%M:%S}" if end is not None else "9999"
+    return [
+        (os.path.join(directory, entry["file"]), entry)
+        for entry in entries
+        if entry["rows"] and entry["end"] >= lo and entry["start"] <= hi
+    ]
+
+
+def read_archive(archive, start=None, end=None):
+    """
+    Datenzeilen eines Archivsegments mit start <= Zeitstempel <= end.
+
+    Returns:
+        (Spaltennamen, Zeilen als str ohne Zeilenende)
+    """
+    with gzip.open(archive, "rb") as f:
+        names = read_header(f)
+        return names, _filter_lines(f, start, end)
+
+
+def _month_key(ts):
+    return f"{ts:%Y-%m}"
+
+
+def _first_month(path):
+    """Monat ('YYYY-MM') des ersten gültigen Zeitstempels oder None."""
+    with open(path, "rb") as f:
+        f.readline()
+        for _ in range(PROBE_LINES):
+            line = f.readline()
+            if not line:
+                break
+            ts = _line_time(line)
+            if ts is not None:
+                return _month_key(ts)
+    return None
+
+
+def rotate_if_due(path, now=None):
+    """
+    Nach dem Anhängen aufrufen (Collectoren): rotiert, sobald die aktive
+    Datei mit einem Vormonat beginnt. Sonst nur ein Dict-Zugriff.
+
+    Fehler werden gemeldet, nicht geworfen (der Messwert steht schon in
+    der Datei); der nächste Versuch folgt im nächsten Monat.
+
+    Returns:
+        Anzahl archivierter Zeilen
+    """
+    now = now or datetime.now()
+    month = _month_key(now)
+    if _active_month.get(path) == month or not os.path.exists(path):
+        return 0
+    first = _first_month(path)
+    if first is None or first > month:
+        return 0  # leer bzw. Uhr zurückgestellt: später erneut prüfen
+    if first == month:
+        _active_month[path] = month
+        return 0
+    try:
+        archived = rotate(path, now)
+    except OSError as e:
+        _active_month[path] = month
+        print(f"[CSVLOG] Rotation von {os.path.basename(path)} fehlgeschlagen: {e}")
+        return 0
+    try:
+        export_parquet(path)
+    except Exception as e:
+        print(f"[CSVLOG] Parquet-Export von {os.path.basename(path)} fehlgeschlagen: {e}")
+    return archived
+
+
+def rotate(path, now=None):
+    """
+    Alle Zeilen vor dem laufenden Monat archivieren, ein gzip-Segment je Monat.
+
+    Reihenfolge Archiv -> Manifest -> aktive Datei (per os.replace): bricht
+    die Rotation ab, bleiben Zeilen höchstens zusätzlich in der aktiven
+    Datei stehen; der nächste Lauf überspringt dann alles, was laut
+    Manifest schon archiviert ist (<= Segment-Ende), und hängt nur den Rest
+    als weiteres gzip-Member an.
+
+    Returns:
+        Anzahl archivierter Zeilen
+    """
+    now = now or datetime.now()
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    directory = archive_dir(path)
+    name = os.path.basename(path)
+    stem = os.path.splitext(name)[0]
+
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        segments = {entry["month"]: entry for entry in manifest.get(name, [])}
+        archived = 0
+        touched = set()
+        with open(path, "rb") as f:
+            header = f.readline()
+            data_start = f.tell()
+            size = os.fstat(f.fileno()).st_size
+            split = _start_offset(f, path, month_start, data_start, size)
+            if split > data_start:
+                os.makedirs(directory, exist_ok=True)
+                f.seek(data_start)
+                segment = None  # (Eintrag, gzip-Datei, tmp-Pfad, archiviert bis)
+                prefix = None
+                pos = data_start
+                for line in f:
+                    if pos >= split:
+                        break
+                    pos += len(line)
+                    if line[:7] != prefix:
+                        ts = _line_time(line)
+                        if ts is None:
+                            if segment is None:
+                                continue  # Kaputtzeile vor dem ersten Messwert
+                        else:
+                            prefix = line[:7]
+                            if segment is not None:
+                                _close_segment(directory, segments, segment)
+                            segment = _open_segment(directory, stem, segments, _month_key(ts), header)
+                    entry, out, _, done = segment
+                    stamp = line[:19]
+                    if done and stamp <= done:
+                        continue
+                    out.write(line)
+                    touched.add(entry["month"])
+                    if _line_time(stamp) is not None:
+                        text = stamp.decode("ascii")
+                        entry["start"] = entry["start"] or text
+                        entry["end"] = text
+                        entry["rows"] += 1
+                        archived += 1
+                if segment is not None:
+                    _close_segment(directory, segments, segment)
+                manifest[name] = [segments[month] for month in sorted(segments)]
+                _save_manifest(directory, manifest)
+
+                # aktive Datei: Header + laufender Monat
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as out:
+                    out.write(header)
+                    f.seek(split)
+                    shutil.copyfileobj(f, out)
+                os.replace(tmp, path)
+                build_index(path)
+                print(
+                    f"[CSVLOG] {name}: {archived} Zeilen archiviert ({', '.join(sorted(touched)) or '-'}), "
+                    f"aktiv {os.path.getsize(path)} Bytes"
+                )
+
+    _active_month[path] = _month_key(now)
+    return archived
+
+
+def _open_segment(directory, stem, segments, month, header):
+    """Segment eines Monats zum Schreiben öffnen: neu (tmp) oder als weiteres gzip-Member."""
+    entry = segments.get(month)
+    file = f"{stem}_{month}{ARCHIVE_SUFFIX}"
+    target = os.path.join(directory, file)
+    if entry is not None and os.path.exists(target):
+        done = entry["end"].encode("ascii") if entry["end"] else None
+        return entry, gzip.open(target, "ab", compresslevel=ARCHIVE_LEVEL), None, done
+    entry = {"month": month, "file": file, "start": None, "end": None, "rows": 0}
+    out = gzip.open(target + ".tmp", "wb", compresslevel=ARCHIVE_LEVEL)
+    out.write(header)
+    return entry, out, target + ".tmp", None
+
+
+def _close_segment(directory, segments, segment):
+    entry, out, tmp, _ = segment
+    out.close()
+    target = os.path.join(directory, entry["file"])
+    if tmp is not None:
+        os.replace(tmp, target)
+    entry["bytes"] = os.path.getsize(target)
+    entry.pop("parquet", None)  # Segment geändert: Parquet neu exportieren
+    segments[entry["month"]] = entry
+
+
+def export_parquet(path, force=False):
+    """
+    Archivsegmente eines Logs zusätzlich als Parquet ablegen (ohne pyarrow: nichts).
+
+    Zeilen zeitlich sortiert, Zeitstempel als timestamp, Werte als float64
+    (wie `read_window`), Row-Groups mit Min/Max-Statistik für Zeitfilter.
+
+    Args:
+        force: auch Segmente mit vorhandenem Parquet neu schreiben
+
+    Returns:
+        Anzahl exportierter Segmente
+    """
+    if pq is None:
+        return 0
+    directory = archive_dir(path)
+    name = os.path.basename(path)
+    exported = 0
+    with _manifest_lock:
+        manifest = _read_manifest(directory)
+        for entry in manifest.get(name, []):
+            file = entry["file"][: -len(ARCHIVE_SUFFIX)] + PARQUET_SUFFIX
+            target = os.path.join(directory, file)
+            if not entry["rows"] or (entry.get("parquet") and os.path.exists(target) and not force):
+                continue
+            with gzip.open(os.path.join(directory, entry["file"]), "rb") as f:
+                names = read_header(f)
+                if TIME_COLUMN not in names:
+                    continue
+                values = [n for n in names if n != TIME_COLUMN]
+                parts = _read_chunks(f, names, None, None, values, CHUNK_ROWS)
+            frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=[TIME_COLUMN, *values])
+            frame = frame.sort_values(TIME_COLUMN, kind="stable", ignore_index=True)
+            tmp = target + ".tmp"
+            pq.write_table(
+                pa.Table.from_pandas(frame, preserve_index=False),
+                tmp,
+                row_group_size=PARQUET_ROW_GROUP,
+                compression=PARQUET_COMPRESSION,
+                write_statistics=True,
+            )
+            os.replace(tmp, target)
+            entry["parquet"] = file
+            exported += 1
+        if exported:
+            _save_manifest(directory, manifest)
+    return exported
+
+
+def _read_parquet(archive, entry, start, end, columns):
+    """Segment aus der Parquet-Stufe (Spaltenauswahl + Zeitfilter in pyarrow), None = gzip lesen."""
+    if pq is None or not entry.get("parquet"):
+        return None
+    target = os.path.join(os.path.dirname(archive), entry["parquet"])
+    try:
+        names = pq.read_schema(target).names
+    except (OSError, pa.ArrowException):
+        return None
+    if columns is None:
+        wanted = [TIME_COLUMN, *(n for n in names if n != TIME_COLUMN)]
+    else:
+        wanted = [TIME_COLUMN, *(n for n in columns if n in names and n != TIME_COLUMN)]
+    filters = []
+    if start is not None:
+        filters.append((TIME_COLUMN, ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append((TIME_COLUMN, "<=", pd.Timestamp(end)))
+    return pq.read_table(target, columns=wanted, filters=filters or None).to_pandas()
+
+
+def read_new_lines(path, offset):
+    """
+    Vollständige Zeilen ab `offset` (für Leser, die dem Log folgen).
+
+    Eine noch nicht fertig geschriebene letzte Zeile bleibt liegen und wird
+    beim nächsten Aufruf gelesen.
+
+    Returns:
+        (Zeilen als str, neuer Offset)
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    complete = data.rfind(b"\n") + 1
+    lines = data[:complete].decode("utf-8", errors="replace").splitlines()
+    return lines, offset + complete
+
+
+def _filter_lines(raw_lines, start, end):
+    """Zeilen (bytes) mit start <= Zeitstempel <= end als str; aufsteigend, bricht nach end ab."""
+    lines = []
+    # Vorfilter per Textvergleich (ISO-Zeitstempel sortieren wie Text)
+    floor = f"{start:%Y-%m-%d %H:%M:%S}".encode("ascii") if start is not None else b""
+    for raw in raw_lines:
+        if raw[:19] < floor:
+            continue
+        ts = _line_time(raw)
+        if ts is None or (start is not None and ts < start):
+            continue
+        if end is not None and ts > end:
+            break
+        lines.append(raw.rstrip(b"\r\n").decode("utf-8", errors="replace"))
+    return lines
+
+
+def read_range(path, start, end=None):
+    """
+    Datenzeilen mit start <= Zeitstempel <= end (None = offen), über
+    Archivsegmente und aktive Datei hinweg.
+
+    Aus der aktiven Datei werden nur die Bytes des Fensters gelesen (plus
+    höchstens ein Raster am Anfang), unabhängig von Dateigröße und
+    Abtastrate; Archive nur, wenn sie das Fenster überlappen.
+
+    Returns:
+        Liste der Zeilen als str (ohne Zeilenende), Header und
+        Zeilen ohne gültigen Zeitstempel ausgelassen
+    """
+    lines = []
+    for archive, _ in archive_segments(path, start, end):
+        lines.extend(read_archive(archive, start, end)[1])
+    if not os.path.exists(path):
+        return lines
+    with open(path, "rb") as f:
+        read_header(f)
+        data_start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        lo = _start_offset(f, path, start, data_start, size)
+        hi = size
+        if end is not None:
+            hi = _indexed_offset(f, path, end, size, after=True) or size
+        f.seek(lo)
+        data = f.read(max(0, hi - lo))
+
+    lines.extend(_filter_lines(data.splitlines(), start, end))
+    return lines
+
+
+def _read_chunks(f, names, start, end, columns, chunksize):
+    """Blöcke ab der aktuellen Position von `f` (bis nach end) als DataFrames."""
+    # Zeitstempel als Text (Format wird unten geprüft), Zeilen mit anderer
+    # Spaltenzahl (z.B. Vollformat in Heizungstemperaturen.csv) überspringen.
+    # Kein usecols: der C-Parser bricht mit usecols bei zu langen Zeilen ab,
+    # die Spaltenauswahl passiert daher pro Block.
+    reader = pd.read_csv(
+        f,
+        header=None,
+        names=names,
+        dtype={TIME_COLUMN: str},
+        chunksize=chunksize,
+        on_bad_lines="skip",
+    )
+    parts = []
+    for chunk in reader:
+        chunk[TIME_COLUMN] = pd.to_datetime(chunk[TIME_COLUMN], format="ISO8601", errors="coerce")
+        if chunk[TIME_COLUMN].isna().any():
+            chunk = chunk.dropna(subset=[TIME_COLUMN])
+        if start is not None:
+            chunk = chunk[chunk[TIME_COLUMN] >= start]
+        done = False
+        if end is not None:
+            done = bool((chunk[TIME_COLUMN] > end).any())
+            chunk = chunk[chunk[TIME_COLUMN] <= end]
+        chunk = chunk[[TIME_COLUMN, *columns]]
+        for column in columns:
+            if chunk[column].dtype != "float64":
+                chunk[column] = pd.to_numeric(chunk[column], errors="coerce").astype("float64")
+        parts.append(chunk)
+        if done:
+            break
+    return parts
+
+
+def read_window(path, start=None, end=None, columns=None, chunksize=CHUNK_ROWS):
+    """
+    Lese die Zeilen mit start <= Zeitstempel <= end als DataFrame
+    (Archivsegmente nur, wenn sie das Fenster überlappen).
+
+    Args:
+        path: CSV-Datei mit Header und Zeitstempel in der ersten Spalte
+        start, end: datetime oder None (= offen)
+        columns: Wertspalten (fehlende werden ignoriert); None = alle
+        chunksize: Zeilen pro Block
+
+    Returns:
+        DataFrame mit `Zeitstempel` (datetime64) und den Wertspalten als
+        float64 (nicht numerische Einträge = NaN); leer wenn nichts passt
+    """
+    parts = []
+    selected = None
+
+    def _select(names):
+        if columns is None:
+            return [name for name in names if name != TIME_COLUMN]
+        return [name for name in columns if name in names]
+
+    for archive, entry in archive_segments(path, start, end):
+        frame = _read_parquet(archive, entry, start, end, columns)
+        if frame is not None:
+            selected = [name for name in frame.columns if name != TIME_COLUMN]
+            parts.append(frame)
+            continue
+        with gzip.open(archive, "rb") as f:
+            names = read_header(f)
+            if TIME_COLUMN in names:
+                selected = _select(names)
+                parts.extend(_read_chunks(f, names, start, end, selected, chunksize))
+
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            names = read_header(f)
+            if TIME_COLUMN in names:
+                data_start = f.tell()
+                size = os.fstat(f.fileno()).st_size
+                selected = _select(names)
+                f.seek(_start_offset(f, path, start, data_start, size))
+                parts.extend(_read_chunks(f, names, start, end, selected, chunksize))
+
+    if selected is None:
+        return pd.DataFrame()
+    if not parts:
+        return pd.DataFrame(columns=[TIME_COLUMN, *selected])
+    return pd.concat(parts, ignore_index=True)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python -m core.csvlog [--rotate] [--parquet] <log.csv> ...
+    options = {"--rotate", "--parquet"}
+    for csv_path in (arg for arg in sys.argv[1:] if arg not in options):
+        if "--rotate" in sys.argv:
+            rotate(csv_path)
+        if "--parquet" in sys.argv:
+            print(f"[CSVLOG] {csv_path}: {export_parquet(csv_path, force=True)} Parquet-Segmente")
+        print(f"[CSVLOG] {csv_path}: {build_index(csv_path)} Indexeinträge")
+        for archive, entry in archive_segments(csv_path):
+            print(f"[CSVLOG]   {entry['file']}: {entry['rows']} Zeilen {entry['start']} .. {entry['end']}, {entry['bytes']} Bytes")
@@ -0,0 +1,164 @@
+"""
+Kompilierter Parser für die BMK-Antwort (daqdata.cgi)
+=====================================================
+Die Antwort ist ein Wert pro Zeile in fester Reihenfolge (PP-Index). Der
+Parse-Plan wird einmal beim Import gebaut: Index -> (Slot, Konverter).
+`parse` schreibt direkt in eine vorab angelegte Slot-Liste, ohne
+Zwischen-Dicts oder Namenssuche; Aufrufer greifen über feste Slots zu
+(`slot(name)` einmalig beim Import).
+
+- Zahlenkanäle: float(), bei Einheit ("32h", "45 %") per Regex, sonst None
+- Statuskanäle: Text unverändert ("EIN", "AUS", "HEIZEN", ...)
+- fehlende Indizes (kurze Antwort): None
+
+Wie bisher zählen leere Zeilen nicht (Index = n-te nicht leere Zeile).
+
+Benchmark über aufgezeichnete Antworten:
+    cd src && python -m core.daqparse [../data/Heizungstemperaturen.csv]
+"""
+
+import re
+
+# Zahl mit optionaler Einheit ("32h", "45 %", "-9.00")
+_NUMBER = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*[A-Za-z%°]*\s*$")
+
+
+def parse_number(text):
+    """Zahl (ggf. mit Einheit) oder None."""
+    if text is None:
+        return None
+    match = _NUMBER.match(str(text))
+    return float(match.group(1)) if match else None
+
+
+def _to_float(text):
+    try:
+        return float(text)
+    except ValueError:
+        return parse_number(text)
+
+
+class DaqPlan:
+    """Parse-Plan für eine feste Kanalliste; nicht thread-sicher (ein Sammler)."""
+
+    def __init__(self, names, status):
+        """
+        Args:
+            names: Kanalnamen in Index-Reihenfolge
+            status: Indizes der Statuskanäle (Text), alle anderen sind Zahlen
+        """
+        self.names = list(names)
+        self.kinds = ["s" if i in status else "f" for i in range(len(self.names))]
+        self._steps = tuple(
+            (i, str if kind == "s" else _to_float) for i, kind in enumerate(self.kinds)
+        )
+        self._slots = {name: i for i, name in enumerate(self.names)}
+        self.values = [None] * len(self.names)
+        self.count = 0  # Anzahl Werte der letzten Antwort
+
+    def slot(self, name):
+        """Slot (= PP-Index) eines Kanals."""
+        return self._slots[name]
+
+    def parse(self, text):
+        """
+        Antwort parsen.
+
+        Returns:
+            Slot-Liste (wird beim nächsten Aufruf überschrieben): float/None
+            für Zahlenkanäle, str/None für Statuskanäle
+        """
+        fields = [line for line in map(str.strip, text.split("\n")) if line]
+        values = self.values
+        self.count = len(fields)
+        n = min(len(fields), len(values))
+        for i, convert in self._steps[:n]:
+            values[i] = convert(fields[i])
+        for i in range(n, len(values)):
+            values[i] = None
+        return values
+
+
+def _legacy_parse(text, mapping):
+    """Bisheriger Weg (nur für den Benchmark): Dict je Abruf, Alias-Suche, Doppel-Parse."""
+
+    def _safe_float(value):
+        if not value or value == "":
+            return None
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
+
+    lines = text.split("\n")
+    values = [line.strip() for line in lines if line.strip()]
+    daten = {"Zeitstempel": "2026-01-01 00:00:00"}
+    for idx in range(min(len(values), len(mapping))):
+        name = mapping.get(idx, f"Wert_{idx}")
+        wert = values[idx].strip() if idx < len(values) else ""
+        float_wert = _safe_float(wert)
+        daten[name] = float_wert if float_wert is not None else wert
+
+    def _get(*keys):
+        for key in keys:
+            if key in daten:
+                return daten.get(key)
+        return ""
+
+    kurz = {
+        "Kesseltemperatur": _get("Kesseltemperatur"),
+        "Außentemperatur": _get("Außentemperatur"),
+        "Pufferspeicher Oben": _get("Puffer_Oben", "Pufferspeicher Oben"),
+        "Pufferspeicher Mitte": _get("Pufferspeicher_Mitte", "Pufferspeicher Mitte"),
+        "Pufferspeicher Unten": _get("Puffer_Unten", "Pufferspeicher Unten"),
+        "Warmwasser": _get("Warmwassertemperatur", "Warmwasser"),
+    }
+    daten.update(kurz)
+    zeile = [
+        _get("Zeitstempel"),
+        _get("Kesseltemperatur"),
+        _get("Außentemperatur", "Aussentemperatur"),
+        _get("Puffer_Oben", "Pufferspeicher Oben", "Puffer Oben"),
+        _get("Pufferspeicher_Mitte", "Puffer_Mitte", "Pufferspeicher Mitte", "Puffer Mitte"),
+        _get("Puffer_Unten", "Pufferspeicher Unten", "Puffer Unten"),
+        _get("Warmwassertemperatur", "Warmwasser"),
+    ]
+    puffer = [_safe_float(values[i]) for i in (4, 5, 6)]
+    return zeile, puffer
+
+
+if __name__ == "__main__":
+    import csv
+    import os
+    import sys
+    import time
+
+    from core.BMKDATEN import HEIZUNG_SLOTS, PP_INDEX_MAPPING, _PLAN
+
+    # Aufgezeichnete Antworten: Vollformat-Zeilen (Zeitstempel + alle PP-Werte)
+    base = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    source = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base, "data", "Heizungstemperaturen.csv")
+    with open(source, newline="", encoding="utf-8") as f:
+        payloads = ["\r\n".join(row[1:]) + "\r\n" for row in csv.reader(f) if len(row) > 60]
+    if not payloads:
+        sys.exit(f"[DAQ] keine Vollformat-Zeilen in {source}")
+
+    rounds = max(1, 20000 // len(payloads))
+
+    def bench(label, parse):
+        t0 = time.perf_counter()
+        for _ in range(rounds):
+            for text in payloads:
+                parse(text)
+        per_poll = (time.perf_counter() - t0) / (rounds * len(payloads)) * 1e6
+        print(f"[DAQ] {label:<16} {per_poll:7.1f} us/Abruf")
+        return per_poll
+
+    def plan_parse(text):
+        values = _PLAN.parse(text)
+        return [values[i] for i in HEIZUNG_SLOTS]
+
+    print(f"[DAQ] {len(payloads)} aufgezeichnete Antworten, {rounds * len(payloads)} Abrufe je Variante")
+    before = bench("alt (Dicts)", lambda text: _legacy_parse(text, PP_INDEX_MAPPING))
+    after = bench("Parse-Plan", plan_parse)
+    print(f"[DAQ] Faktor {before / after:.1f}x")
@@ -0,0 +1,141 @@
+"""
+Datenbus: Sammler -> UI
+=======================
+Die Sammler-Threads veröffentlichen jeden Messwert als `Sample` auf einem
+Topic ("fronius", "heating"). Zwei Arten von Empfängern:
+
+- listen(topic, fn): synchron im Sammler-Thread, jedes Sample (für
+  thread-sichere Konsumenten wie den Zeitreihen-Cache)
+- subscribe(topic, fn): im Tk-Hauptthread per after_idle; pro Topic wird
+  nur das jeweils neueste Sample zugestellt (Coalescing), ältere, noch
+  nicht ausgelieferte Samples werden verworfen
+
+Ohne Thread-Unterstützung in Tcl wird statt after_idle alle FRAME_MS im
+Hauptthread nachgesehen (nur Speicherzugriff, kein Datei-I/O).
+"""
+
+import threading
+import time
+
+# Polling-Intervall (ms), falls Tcl ohne Threads gebaut ist
+FRAME_MS = 100
+
+
+class Sample:
+    """Ein Messwert einer Quelle: Zeitpunkt + Spalte -> Wert (Spalten wie DataStore)."""
+
+    __slots__ = ("topic", "time", "values")
+
+    def __init__(self, topic, timestamp, values):
+        self.topic = topic
+        self.time = timestamp
+        self.values = values
+
+    def __repr__(self):
+        return f"Sample({self.topic!r}, {self.time:%Y-%m-%d %H:%M:%S}, {self.values!r})"
+
+
+class DataBus:
+    """Publish/Subscribe zwischen Sammler-Threads und dem Tk-Hauptthread."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # Topic -> neuestes, noch nicht zugestelltes Sample
+        self._subscribers = {}  # Topic -> [Callback] (Tk-Thread)
+        self._listeners = {}  # Topic -> [Callback] (Sammler-Thread)
+        self._root = None
+        self._threaded = False
+        self._scheduled = False
+        self._last_publish = None
+        self.stats = {"published": 0, "delivered": 0, "coalesced": 0}
+
+    def attach(self, root):
+        """Tk-Root setzen; ab jetzt werden Subscriber im Hauptthread bedient."""
+        self._root = root
+        try:
+            self._threaded = root.tk.eval("info exists tcl_platform(threaded)") == "1"
+        except Exception:
+            self._threaded = False
+        if self._threaded:
+            # bereits vor dem Start eingetroffene Samples ausliefern
+            root.after_idle(self._flush)
+        else:
+            root.after(FRAME_MS, self._poll)
+
+    def subscribe(self, topic, callback):
+        self._subscribers.setdefault(topic, []).append(callback)
+
+    def listen(self, topic, callback):
+        self._listeners.setdefault(topic, []).append(callback)
+
+    def seconds_since_publish(self):
+        """Sekunden seit dem letzten Sample (None = noch keins)."""
+        if self._last_publish is None:
+            return None
+        return time.monotonic() - self._last_publish
+
+    def publish(self, sample):
+        """Sample veröffentlichen (aus beliebigem Thread)."""
+        for callback in self._listeners.get(sample.topic, ()):
+            try:
+                callback(sample)
+            except Exception as e:
+                print(f"[BUS] Listener-Fehler ({sample.topic}): {e}")
+
+        with self._lock:
+            self._last_publish = time.monotonic()
+            self.stats["published"] += 1
+            if sample.topic in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[sample.topic] = sample
+            schedule = self._threaded and not self._scheduled
+            if schedule:
+                self._scheduled = True
+
+        if schedule:
+            try:
+                # threaded Tcl reicht den Aufruf an den Hauptthread weiter
+                self._root.after_idle(self._flush)
+            except Exception:
+                # Mainloop (noch) nicht aktiv oder Fenster zerstört
+                with self._lock:
+                    self._scheduled = False
+
+    def _flush(self):
+        """Neueste Samples je Topic an die Subscriber ausliefern (Tk-Thread)."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        for topic, sample in pending.items():
+            for callback in self._subscribers.get(topic, ()):
+                try:
+                    callback(sample)
+                except Exception as e:
+                    print(f"[BUS] Subscriber-Fehler ({topic}): {e}")
+            self.stats["delivered"] += 1
+
+    def _poll(self):
+        if self._pending:
+            self._flush()
+        try:
+            self._root.after(FRAME_MS, self._poll)
+        except Exception:
+            pass
+
+
+_shared_bus = None
+_shared_lock = threading.Lock()
+
+
+def get_databus():
+    """Prozessweiter Datenbus (Sammler und UI laufen im selben Prozess)."""
+    global _shared_bus
+    with _shared_lock:
+        if _shared_bus is None:
+            _shared_bus = DataBus()
+        return _shared_bus
+
+
+def publish(topic, timestamp, values):
+    """Kurzform für die Sammler: Sample bauen und veröffentlichen."""
+    get_databus().publish(Sample(topic, timestamp, values))
@@ -7,10 +7,368 @@ Konvertiert große CSV Dateien zu SQLite für schnelleren Zugriff
 import sqlite3
 import csv
 import os
+import threading
+import time
+from datetime import datetime, timedelta
+from itertools import chain, islice
+from operator import itemgetter
 from pathlib import Path
 
+import numpy as np
+
+# Monatsarchive der rotierten CSV-Logs (core.csvlog) - optional
+try:
+    from core.csvlog import archive_segments, read_archive
+except ImportError:
+    archive_segments = read_archive = None
+
+try:
+    from core.deadband import MAX_HOLD_SECONDS
+except ImportError:
+    from deadband import MAX_HOLD_SECONDS  # Direktaufruf aus src/core
+
 DB_PATH = os.path.join(os.path.dirname(__file__), "data.db")
 
+# Bulk-Import: Zeilen pro executemany-Batch
+BULK_BATCH_SIZE = 50000
+
+# Heizungstemperaturen.csv: Position der Werte je Zeilenformat
+# Kurzformat (7 Spalten): Zeitstempel + 6 Werte
+HEATING_SHORT_LAYOUT = (1, 2, 3, 4, 5, 6)
+# Vollformat (alle PP-Werte, Betriebsmodus in Spalte 1)
+HEATING_FULL_LAYOUT = (3, 4, 6, 7, 8, 14)
+HEATING_COLUMNS = ("kesseltemp", "außentemp", "puffer_top", "puffer_mid", "puffer_bot", "warmwasser")
+
+# Schema-Version (PRAGMA user_version): 2 = INTEGER-Epoch-Zeitstempel, WITHOUT ROWID,
+# 3 = Rollup-Tabellen, 4 = Rollups mit Energieflüssen (Bezug/Einspeisung/Laden/Entladen),
+# 5 = Heizungs-Rollups zeitgewichtet (ROLLUP_HOLD)
+SCHEMA_VERSION = 5
+
+# Covering-Indizes für Stunden-/Tagesbuckets per Ganzzahl-Division (ts / 3600)
+FRONIUS_HOUR_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_fronius_hour
+    ON fronius(ts / 3600, pv_power, grid_power, batt_power, soc)
+"""
+HEATING_HOUR_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_heating_hour
+    ON heating(ts / 3600, kesseltemp, außentemp, puffer_top, puffer_mid, puffer_bot, warmwasser)
+"""
+
+# Re-Sync in eine gefüllte Tabelle: unveränderte Zeilen werden nicht
+# geschrieben (total_changes zeigt, ob ein Batch etwas geändert hat)
+FRONIUS_UPSERT = """
+    INSERT INTO fronius (ts, pv_power, grid_power, batt_power, load_power, soc)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ts) DO UPDATE SET
+        pv_power = excluded.pv_power, grid_power = excluded.grid_power,
+        batt_power = excluded.batt_power, load_power = excluded.load_power, soc = excluded.soc
+    WHERE (pv_power, grid_power, batt_power, load_power, soc)
+        IS NOT (excluded.pv_power, excluded.grid_power, excluded.batt_power, excluded.load_power, excluded.soc)
+"""
+
+# Energie: Trapezregel zwischen aufeinanderfolgenden Samples; Abstände
+# > ENERGY_MAX_GAP (Datenlücke, Sammler aus) zählen nicht
+ENERGY_MAX_GAP = 900
+# Energieflüsse (kWh, jeweils >= 0), abgeleitet aus den Betragswerten der CSV
+ENERGY_FLOWS = ("pv", "grid_import", "grid_export", "batt_charge", "batt_discharge")
+
+# Rohdaten werden für Energie/Rollups tageweise gelesen (begrenzt den Speicher)
+ENERGY_CHUNK_SECONDS = 86400
+
+# Rollups: Bucket-Größen in Sekunden (1 min, 15 min, 1 h, 1 Tag), fein -> grob
+ROLLUP_RESOLUTIONS = (60, 900, 3600, 86400)
+# get_rollup(): Standard-Obergrenze für die Anzahl Buckets
+ROLLUP_MAX_POINTS = 1000
+# Live-Inserts (Sammler): Rollups gesammelt nachziehen, sobald ein Sample
+# diese Bucket-Grenze überschreitet, sonst spätestens beim Lesen (get_rollup)
+ROLLUP_FLUSH_SECONDS = 900
+# Je Quelltabelle: Spalten mit min/max/Mittelwert und Energieflüsse mit kWh
+ROLLUP_COLUMNS = {
+    "fronius": ("pv_power", "grid_power", "batt_power", "load_power", "soc"),
+    "heating": HEATING_COLUMNS,
+}
+ROLLUP_ENERGY = {
+    "fronius": ENERGY_FLOWS,
+    "heating": (),
+}
+# Deadband-Logs (core.deadband): Halteglied statt Stichproben. Ein Sample gilt
+# bis zum nächsten, höchstens so viele Sekunden; <spalte>_sum ist dann
+# Σ Wert·Δt und <spalte>_cnt die gültige Dauer in s (zeitgewichtetes Mittel)
+ROLLUP_HOLD = {
+    "fronius": None,
+    "heating": MAX_HOLD_SECONDS,
+}
+
+# Zeitstempel: Sekunden seit 1970-01-01 der *lokalen* Wanduhrzeit (naiv, ohne
+# Zeitzonen-Umrechnung). So gilt ts // 86400 = lokaler Tag, ts // 3600 = Stunde,
+# und SQLite-Funktionen mit 'unixepoch' liefern direkt die lokale Uhrzeit.
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(dt):
+    """datetime (naiv, lokal) -> INTEGER-Zeitstempel der DB."""
+    return int((dt - EPOCH).total_seconds())
+
+
+def from_epoch(ts):
+    """INTEGER-Zeitstempel der DB -> naive lokale datetime."""
+    return EPOCH + timedelta(seconds=ts)
+
+
+def _parse_epoch(text):
+    """Textzeitstempel (ISO, z.B. '2025-04-09 13:18:39') -> INTEGER; ValueError bei Müll."""
+    return int((datetime.fromisoformat(text.strip()) - EPOCH).total_seconds())
+
+
+# CSV-Header -> DB-Spalte (erste passende Überschrift gewinnt)
+FRONIUS_CSV_COLUMNS = {
+    "timestamp": ("Zeitstempel", "timestamp"),
+    "pv_power": ("PV-Leistung (kW)", "PV"),
+    "grid_power": ("Netz-Leistung (kW)", "Netz"),
+    "batt_power": ("Batterie-Leistung (kW)", "Batterie"),
+    "load_power": ("Hausverbrauch (kW)", "Last"),
+    "soc": ("Batterieladestand (%)", "SOC"),
+}
+
+
+def signed_flows(pv, grid, batt, load):
+    """
+    Vorzeichenrichtige Energieflüsse (kW, jeweils >= 0) je Sample.
+    
+    Die CSV speichert Netz- und Batterieleistung als Betrag. Die Richtung
+    ergibt sich aus der Bilanz Last = PV ± Netz ± Batterie: gewählt wird die
+    Vorzeichen-Kombination, die den Bedarf x = Last - PV am besten trifft.
+    Ohne Hausverbrauch (NaN) gilt Bezug + Entladen.
+    
+    Args:
+        pv, grid, batt, load: NumPy-Arrays gleicher Länge
+    
+    Returns:
+        Dict Fluss -> Array, Schlüssel wie ENERGY_FLOWS
+    """
+    x = load - pv
+    m = np.fmax(grid, batt)
+    with np.errstate(invalid="ignore"):
+        positive = x >= 0
+        # |x| >= max(Netz, Batterie): beide liefern bzw. beide nehmen auf
+        both = np.abs(x) >= m
+        grid_dominant = grid >= batt
+    unknown = np.isnan(x)
+    importing = unknown | np.where(positive, both | grid_dominant, ~both & ~grid_dominant)
+    discharging = unknown | np.where(positive, both | ~grid_dominant, ~both & grid_dominant)
+    return {
+        "pv": pv,
+        "grid_import": np.where(importing, grid, 0.0),
+        "grid_export": np.where(importing, 0.0, grid),
+        "batt_charge": np.where(discharging, 0.0, batt),
+        "batt_discharge": np.where(discharging, batt, 0.0),
+    }
+
+
+def integrate_energy(ts, flows, max_gap=ENERGY_MAX_GAP):
+    """
+    Trapezregel zwischen aufeinanderfolgenden Samples.
+    
+    Args:
+        ts: aufsteigende Epoch-Sekunden (int64)
+        flows: Dict Name -> Leistung in kW (NaN = fehlt)
+        max_gap: längere Intervalle (Datenlücke) zählen nicht
+    
+    Returns:
+        Dict Name -> kWh des Intervalls Vorgänger -> Sample (Element 0 = 0)
+    """
+    dt = np.diff(ts)
+    hours = np.where(dt <= max_gap, dt, 0) / 3600.0
+    energy = {}
+    for name, power in flows.items():
+        e = np.zeros(len(ts))
+        e[1:] = np.nan_to_num((power[1:] + power[:-1]) * 0.5 * hours)
+        energy[name] = e
+    return energy
+
+
+def bucket_starts(ts, res):
+    """Bucket-Beginn und Startindex je Bucket (für np.*.reduceat) eines sortierten ts-Arrays."""
+    keys = ts // res
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    return keys[starts] * res, starts
+
+
+def hold_segments(ts, res, hold):
+    """
+    Halteglied eines Deadband-Logs, zerlegt an den Bucket-Grenzen.
+    
+    Jedes Sample gilt bis zum nächsten, höchstens `hold` Sekunden (danach
+    keine Daten); seine Gültigkeit wird an den Vielfachen von `res` geteilt.
+    
+    Args:
+        ts: streng aufsteigende Epoch-Sekunden (int64)
+    
+    Returns:
+        (Sample-Index, Segmentbeginn, Dauer in s) je Segment, aufsteigend
+    """
+    ends = np.minimum(np.r_[ts[1:], ts[-1] + hold], ts + hold)
+    first = ts // res
+    pieces = (ends - 1) // res - first + 1
+    idx = np.repeat(np.arange(len(ts)), pieces)
+    bucket = first[idx] + np.arange(len(idx)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    start = np.maximum(ts[idx], bucket * res)
+    return idx, start, np.minimum(ends[idx], (bucket + 1) * res) - start
+
+
+def _rollup_table_sql(source):
+    fields = []
+    for column in ROLLUP_COLUMNS[source]:
+        fields += [f"{column}_min REAL", f"{column}_max REAL", f"{column}_sum REAL", f"{column}_cnt INTEGER"]
+    fields += [f"{flow}_kwh REAL" for flow in ROLLUP_ENERGY[source]]
+    return f"""
+        CREATE TABLE IF NOT EXISTS {source}_rollup (
+            res INTEGER NOT NULL,
+            bucket INTEGER NOT NULL,
+            n INTEGER,
+            {', '.join(fields)},
+            PRIMARY KEY (res, bucket)
+        ) WITHOUT ROWID
+    """
+
+
+def _rollup_insert_coarse_sql(source):
+    """Grobe Buckets aus der nächstfeineren Stufe. Parameter: res, fine, lo, hi."""
+    aggregates = []
+    for column in ROLLUP_COLUMNS[source]:
+        aggregates += [f"MIN({column}_min)", f"MAX({column}_max)", f"SUM({column}_sum)", f"SUM({column}_cnt)"]
+    aggregates += [f"TOTAL({flow}_kwh)" for flow in ROLLUP_ENERGY[source]]
+    return f"""
+        INSERT INTO {source}_rollup
+        SELECT :res, bucket / :res * :res, SUM(n), {', '.join(aggregates)}
+        FROM {source}_rollup
+        WHERE res = :fine AND bucket >= :lo AND bucket < :hi
+        GROUP BY bucket / :res
+    """
+
+
+def pick_rollup_resolution(start, end, max_points=ROLLUP_MAX_POINTS):
+    """Feinste Rollup-Stufe, bei der [start, end] höchstens max_points Buckets ergibt."""
+    span = max(0.0, (end - start).total_seconds())
+    for res in ROLLUP_RESOLUTIONS:
+        if span / res <= max_points:
+            return res
+    return ROLLUP_RESOLUTIONS[-1]
+
+
+def _fronius_column_indices(header):
+    """Ermittle Spaltenindizes der Fronius-CSV anhand der Überschriften."""
+    names = [h.strip() for h in header]
+    indices = {}
+    for column, aliases in FRONIUS_CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in names:
+                indices[column] = names.index(alias)
+                break
+    return indices
+
+
+def _parse_fronius_rows(rows, indices):
+    """Konvertiere CSV-Zeilen in DB-Tupel; defekte Zeilen werden übersprungen."""
+    ts_idx = indices.get("timestamp", 0)
+    value_indices = [indices.get(c) for c in ("pv_power", "grid_power", "batt_power", "load_power", "soc")]
+    if None in value_indices:
+        fields = None
+    else:
+        fields = itemgetter(ts_idx, *value_indices)
+    
+    for row in rows:
+        # Schneller Pfad: alle Spalten vorhanden und numerisch
+        if fields is not None:
+            try:
+                ts, pv, grid, batt, load, soc = fields(row)
+                yield (_parse_epoch(ts), float(pv), float(grid), float(batt), float(load), float(soc))
+                continue
+            except (ValueError, IndexError):
+                pass
+        # Toleranter Pfad: leere Felder = 0, Header-/Kaputtzeilen überspringen
+        if not row or len(row) <= ts_idx:
+            continue
+        ts = row[ts_idx].strip()
+        if not ts or ts.lower().startswith("zeit"):
+            continue
+        try:
+            epoch = _parse_epoch(ts)
+            values = [float(row[i] or 0) if i is not None and i < len(row) else 0.0 for i in value_indices]
+        except ValueError:
+            continue
+        yield (epoch, *values)
+
+
+def _parse_heating_row(row):
+    """
+    Konvertiere eine Zeile aus Heizungstemperaturen.csv in ein DB-Tupel.
+    
+    Unterstützt das 7-Spalten-Kurzformat und das Vollformat mit allen
+    PP-Werten (erkennbar am nicht-numerischen Betriebsmodus in Spalte 1).
+    """
+    if not row or len(row) < 7:
+        return None
+    ts = row[0].strip()
+    if not ts or ts.lower().startswith("zeit"):
+        return None
+    layout = HEATING_SHORT_LAYOUT
+    try:
+        float(row[1])
+    except ValueError:
+        if len(row) < 10:
+            return None
+        layout = HEATING_FULL_LAYOUT
+    try:
+        return (_parse_epoch(ts), *(float(row[i]) if i < len(row) and row[i] else None for i in layout))
+    except ValueError:
+        return None
+
+
+def _last_line_end(f, start, size, probe=65536):
+    """Byte-Offset hinter dem letzten Zeilenumbruch im Bereich [start, size)."""
+    pos = size
+    while pos > start:
+        block_start = max(start, pos - probe)
+        f.seek(block_start)
+        idx = f.read(pos - block_start).rfind(b"\n")
+        if idx >= 0:
+            return block_start + idx + 1
+        pos = block_start
+    return start
+
+
+def _iter_lines(f, start, end, chunk_size=8 * 1024 * 1024):
+    """Lese Textzeilen aus [start, end) blockweise (end liegt auf Zeilenende)."""
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(chunk_size, remaining))
+        if not chunk:
+            return
+        remaining -= len(chunk)
+        if remaining > 0:
+            cut = chunk.rfind(b"\n") + 1
+            if cut == 0:
+                # Zeile länger als ein Block: weiter einlesen
+                chunk += f.readline()
+                remaining = end - f.tell()
+                cut = len(chunk)
+            f.seek(cut - len(chunk), os.SEEK_CUR)
+            remaining += len(chunk) - cut
+            chunk = chunk[:cut]
+        yield from chunk.decode('utf-8', errors='replace').splitlines()
+
+
+def _batched(iterable, size):
+    """Teile einen Iterator in Listen mit maximal `size` Elementen."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
 
 class DataStore:
     """SQLite-basierter Datenspeicher für schnelle Zugriffe."""
@@ -18,6 +376,10 @@ class DataStore:
     def __init__(self, db_path=DB_PATH):
         self.db_path = db_path
         self.conn = None
+        # Eine Connection wird von UI- und Import-Thread geteilt
+        self._lock = threading.RLock()
+        # Quelle -> (t_from, t_to) eingefügter Samples ohne Rollup-Refresh
+        self._pending_rollups = {}
         self._init_db()
     
     def _init_db(self):
@@ -30,20 +392,24 @@ class DataStore:
         self.conn.execute("PRAGMA mmap_size=67108864")  # 64MB Memory-Map (reduziert)
         self.conn.execute("PRAGMA temp_store=MEMORY")
         cursor = self.conn.cursor()
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        
+        # Alte Schemata (TEXT-Zeitstempel) in-place migrieren
+        if "timestamp" in self._table_columns("fronius") or "timestamp" in self._table_columns("heating"):
+            self._migrate_epoch_schema()
         
-        # Fronius PV Daten
+        # Fronius PV Daten - nach Zeit geclustert (ts = lokale Sekunden, siehe to_epoch)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS fronius (
-                id INTEGER PRIMARY KEY,
-                timestamp TEXT UNIQUE,
+                ts INTEGER PRIMARY KEY,
                 pv_power REAL,
                 grid_power REAL,
                 batt_power REAL,
-                soc REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
+                load_power REAL,
+                soc REAL
+            ) WITHOUT ROWID
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_fronius_ts ON fronius(timestamp)")
+        cursor.execute(FRONIUS_HOUR_INDEX)
         
         # Ertrag Historie
         cursor.execute("""
@@ -60,68 +426,643 @@ class DataStore:
         # Heizung/Pufferspeicher
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS heating (
-                id INTEGER PRIMARY KEY,
-                timestamp TEXT UNIQUE,
+                ts INTEGER PRIMARY KEY,
                 kesseltemp REAL,
                 außentemp REAL,
                 puffer_top REAL,
                 puffer_mid REAL,
                 puffer_bot REAL,
-                warmwasser REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                warmwasser REAL
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(HEATING_HOUR_INDEX)
+        
+        # Import-Checkpoints (Byte-Offset + Inode je Quelldatei)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS import_state (
+                source TEXT PRIMARY KEY,
+                inode INTEGER,
+                offset INTEGER,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_heating_ts ON heating(timestamp)")
         
+        # Rollups (min/max/Summe/Anzahl/Energie je Bucket), siehe ROLLUP_RESOLUTIONS
+        if version < 4:
+            for source in ROLLUP_COLUMNS:
+                cursor.execute(f"DROP TABLE IF EXISTS {source}_rollup")
+        for source in ROLLUP_COLUMNS:
+            cursor.execute(_rollup_table_sql(source))
         self.conn.commit()
+        if version < 4:
+            for source in ROLLUP_COLUMNS:
+                self.rebuild_rollups(source)
+        elif version < 5:
+            self.rebuild_rollups("heating")
+        
+        self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self.conn.commit()
+    
+    def _table_columns(self, table):
+        return [row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+    
+    def _migrate_epoch_schema(self):
+        """
+        Migriere fronius/heating von `timestamp TEXT UNIQUE` (+ rowid) auf
+        INTEGER-Epoch-Sekunden als geclusterten Primärschlüssel.
+        
+        Läuft in einer Transaktion; danach VACUUM, damit die Datei schrumpft.
+        """
+        start = time.perf_counter()
+        print("[DB] 🔧 Migriere Schema auf INTEGER-Zeitstempel...")
+        self.conn.commit()
+        try:
+            self.conn.execute("BEGIN")
+            if "timestamp" in self._table_columns("fronius"):
+                self.conn.execute("""
+                    CREATE TABLE fronius_new (
+                        ts INTEGER PRIMARY KEY,
+                        pv_power REAL,
+                        grid_power REAL,
+                        batt_power REAL,
+                        load_power REAL,
+                        soc REAL
+                    ) WITHOUT ROWID
+                """)
+                load_column = "load_power" if "load_power" in self._table_columns("fronius") else "NULL"
+                self.conn.execute(f"""
+                    INSERT OR REPLACE INTO fronius_new
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER), pv_power, grid_power, batt_power, {load_column}, soc
+                    FROM fronius WHERE strftime('%s', timestamp) IS NOT NULL
+                    ORDER BY rowid
+                """)
+                self.conn.execute("DROP TABLE fronius")
+                self.conn.execute("ALTER TABLE fronius_new RENAME TO fronius")
+            
+            if "timestamp" in self._table_columns("heating"):
+                self.conn.execute("""
+                    CREATE TABLE heating_new (
+                        ts INTEGER PRIMARY KEY,
+                        kesseltemp REAL,
+                        außentemp REAL,
+                        puffer_top REAL,
+                        puffer_mid REAL,
+                        puffer_bot REAL,
+                        warmwasser REAL
+                    ) WITHOUT ROWID
+                """)
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO heating_new
+                    SELECT CAST(strftime('%s', timestamp) AS INTEGER), kesseltemp, außentemp,
+                           puffer_top, puffer_mid, puffer_bot, warmwasser
+                    FROM heating WHERE strftime('%s', timestamp) IS NOT NULL
+                    ORDER BY rowid
+                """)
+                self.conn.execute("DROP TABLE heating")
+                self.conn.execute("ALTER TABLE heating_new RENAME TO heating")
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.execute("VACUUM")
+        print(f"[DB] ✅ Schema-Migration abgeschlossen in {time.perf_counter() - start:.1f}s")
     
     def import_fronius_csv(self, csv_path):
-        """Importiere FroniusDaten.csv in Datenbank."""
+        """
+        Importiere FroniusDaten.csv komplett in die Datenbank (Bulk-Modus).
+        
+        Zielwert: >= 200k Zeilen/s auf einem Desktop-CPU (Pi 5 etwa ein
+        Viertel davon) für das Laden selbst, siehe `_bulk_load_fronius`;
+        der Aufbau von idx_fronius_hour kostet danach ~1.5s je 1M Zeilen.
+        """
         if not os.path.exists(csv_path):
             return False
         
-        cursor = self.conn.cursor()
-        count = 0
-        
         try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        ts = row.get('Zeitstempel') or row.get('timestamp')
-                        pv = float(row.get('PV', 0) or 0)
-                        grid = float(row.get('Netz', 0) or 0)
-                        batt = float(row.get('Batterie', 0) or 0)
-                        soc = float(row.get('SOC', 0) or 0)
-                        
-                        cursor.execute("""
-                            INSERT OR REPLACE INTO fronius 
-                            (timestamp, pv_power, grid_power, batt_power, soc)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (ts, pv, grid, batt, soc))
-                        count += 1
-                        
-                        if count % 1000 == 0:
-                            self.conn.commit()
-                            print(f"[DB] Imported {count} Fronius records...")
-                    except Exception as e:
-                        continue
-            
-            self.conn.commit()
-            print(f"[DB] ✅ Imported {count} Fronius records")
+            with self._lock, open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                indices = _fronius_column_indices(next(reader, []))
+                self._bulk_load_fronius(_parse_fronius_rows(reader, indices))
             return True
         except Exception as e:
             print(f"[DB] ❌ Import error: {e}")
             return False
     
+    def _bulk_load_fronius(self, records, extra_statements=()):
+        """
+        Schneller Ladepfad für große Datenmengen.
+        
+        - Parsen und Einfügen in Batches (`BULK_BATCH_SIZE`) per executemany
+        - eine einzige Transaktion, `synchronous=OFF` nur während des Ladens
+        - nur bei leerer Tabelle (Erstimport) wird idx_fronius_hour vorher
+          entfernt und erst nach dem Laden gebaut (der Primärschlüssel `ts`
+          ist die Tabelle selbst, WITHOUT ROWID)
+        - sonst (Re-Sync nach Rotation) per FRONIUS_UPSERT: bereits
+          vorhandene, unveränderte Zeilen bleiben unangetastet
+        - Rollups werden am Ende einmal neu berechnet, nur für den Zeitraum
+          der Batches, die tatsächlich etwas geändert haben
+        
+        `extra_statements` ((sql, params)-Paare) laufen in derselben
+        Transaktion, z.B. das Fortschreiben des Import-Checkpoints.
+        
+        Returns:
+            Anzahl geladener Zeilen
+        """
+        start = time.perf_counter()
+        count = 0
+        self.conn.commit()
+        synchronous = self.conn.execute("PRAGMA synchronous").fetchone()[0]
+        self.conn.execute("PRAGMA synchronous=OFF")
+        try:
+            self.conn.execute("BEGIN")
+            known = self.conn.execute("SELECT MAX(ts) FROM fronius").fetchone()[0]
+            initial = known is None
+            if initial:
+                self.conn.execute("DROP INDEX IF EXISTS idx_fronius_hour")
+            t_from = t_to = None
+            for batch in _batched(records, BULK_BATCH_SIZE):
+                count += len(batch)
+                if initial:
+                    self.conn.executemany("""
+                        INSERT OR REPLACE INTO fronius 
+                        (ts, pv_power, grid_power, batt_power, load_power, soc)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """, batch)
+                    changed = [batch]
+                else:
+                    # bekannter Zeitraum zählt nur, wenn sich Zeilen geändert haben
+                    changed = []
+                    for part in ([r for r in batch if r[0] <= known], [r for r in batch if r[0] > known]):
+                        changes = self.conn.total_changes
+                        self.conn.executemany(FRONIUS_UPSERT, part)
+                        if self.conn.total_changes != changes:
+                            changed.append(part)
+                for part in changed:
+                    lo, hi = min(r[0] for r in part), max(r[0] for r in part)
+                    t_from = lo if t_from is None else min(t_from, lo)
+                    t_to = hi if t_to is None else max(t_to, hi)
+            if initial:
+                self.conn.execute(FRONIUS_HOUR_INDEX)
+            loaded = time.perf_counter()
+            if t_from is not None:
+                self._refresh_rollups("fronius", t_from, t_to)
+            for sql, params in extra_statements:
+                self.conn.execute(sql, params)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.execute(f"PRAGMA synchronous={int(synchronous)}")
+        
+        elapsed = max(loaded - start, 1e-9)
+        print(f"[DB] ✅ Imported {count} Fronius records in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s), "
+              f"Rollups {time.perf_counter() - loaded:.1f}s")
+        return count
+    
+    def _get_import_state(self, source):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT inode, offset FROM import_state WHERE source = ?", (source,))
+        return cursor.fetchone()
+    
+    def sync_fronius_csv(self, csv_path, source="fronius"):
+        """
+        Inkrementeller Tail-Import: übernimmt nur Zeilen, die seit dem letzten
+        Lauf an FroniusDaten.csv angehängt wurden.
+        
+        Der Checkpoint (Inode + Byte-Offset hinter der letzten vollständigen
+        Zeile) liegt in `import_state`. Wurde die Datei rotiert (neuer Inode)
+        oder gekürzt (kleiner als der Offset bzw. Offset nicht mehr am
+        Zeilenende), wird ab Dateianfang neu synchronisiert; INSERT OR REPLACE
+        macht das idempotent. Dabei kommen Zeilen aus den Monatsarchiven
+        (core.csvlog) dazu: bei leerer Datenbank alle, nach einer Rotation
+        die seit dem jüngsten Datensatz.
+        
+        Returns:
+            Anzahl importierter Zeilen (0 wenn nichts Neues vorliegt)
+        """
+        if not os.path.exists(csv_path):
+            return 0
+        
+        with self._lock, open(csv_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            state = self._get_import_state(source)
+            offset = 0
+            
+            header_line = f.readline()
+            if state:
+                inode, last_offset = state
+                if inode == stat.st_ino and 0 < last_offset <= stat.st_size:
+                    # Offset muss direkt hinter einem Zeilenumbruch liegen
+                    f.seek(last_offset - 1)
+                    if f.read(1) == b"\n":
+                        offset = last_offset
+                if offset == 0:
+                    print(f"[DB] ⚠️ {os.path.basename(csv_path)} rotiert/gekürzt - Re-Sync ab Dateianfang")
+            
+            full_sync = offset == 0
+            archived = iter(())
+            if full_sync:
+                offset = len(header_line)
+                archived = self._archived_fronius(csv_path, resync=state is not None)
+            
+            # Nur vollständige Zeilen übernehmen; Rest beim nächsten Lauf.
+            # Nach einer Rotation enthält die aktive Datei evtl. nur den
+            # Header: Archivzeilen und Checkpoint trotzdem übernehmen
+            end = _last_line_end(f, offset, stat.st_size)
+            if end <= offset and not full_sync:
+                return 0
+            
+            header = next(csv.reader([header_line.decode('utf-8-sig', errors='replace')]), [])
+            indices = _fronius_column_indices(header)
+            records = chain(archived, _parse_fronius_rows(csv.reader(_iter_lines(f, offset, end)), indices))
+            checkpoint = ("""
+                INSERT OR REPLACE INTO import_state (source, inode, offset, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (source, stat.st_ino, end))
+            
+            try:
+                if full_sync:
+                    return self._bulk_load_fronius(records, extra_statements=[checkpoint])
+                records = list(records)
+                self.conn.executemany("""
+                    INSERT OR REPLACE INTO fronius 
+                    (ts, pv_power, grid_power, batt_power, load_power, soc)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, records)
+                if records:
+                    self._refresh_rollups("fronius", min(r[0] for r in records), max(r[0] for r in records))
+                self.conn.execute(*checkpoint)
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"[DB] ❌ Sync error: {e}")
+                return 0
+            return len(records)
+    
+    def _archived_fronius(self, csv_path, resync):
+        """Fronius-Datensätze aus den Monatsarchiven (resync: nur ab dem jüngsten Datensatz)."""
+        if archive_segments is None:
+            return iter(())
+        since = None
+        if resync:
+            last = self.conn.execute("SELECT MAX(ts) FROM fronius").fetchone()[0]
+            since = from_epoch(last) if last is not None else None
+        return chain.from_iterable(
+            _parse_fronius_rows(csv.reader(lines), _fronius_column_indices(names))
+            for names, lines in (read_archive(archive, since) for archive, _ in archive_segments(csv_path, since))
+        )
+    
+    def insert_heating_record(self, timestamp, kesseltemp, aussentemp, puffer_top, puffer_mid, puffer_bot, warmwasser):
+        """
+        Speichere einen BMK-Messwert (wird vom Sammler-Thread aufgerufen).
+        
+        `timestamp` darf datetime oder ISO-Text ('YYYY-MM-DD HH:MM:SS') sein.
+        Die Rollups werden gesammelt nachgezogen (ROLLUP_FLUSH_SECONDS).
+        """
+        ts = to_epoch(timestamp) if isinstance(timestamp, datetime) else _parse_epoch(timestamp)
+        with self._lock:
+            self.conn.execute("""
+                INSERT OR REPLACE INTO heating 
+                (ts, kesseltemp, außentemp, puffer_top, puffer_mid, puffer_bot, warmwasser)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (ts, kesseltemp, aussentemp, puffer_top, puffer_mid, puffer_bot, warmwasser))
+            # Rollups nur an der Bucket-Grenze nachziehen (bzw. beim Lesen)
+            pending = self._pending_rollups.get("heating")
+            if pending and ts // ROLLUP_FLUSH_SECONDS != pending[0] // ROLLUP_FLUSH_SECONDS:
+                self._flush_rollups("heating")
+                pending = None
+            self._pending_rollups["heating"] = (min(pending[0], ts), max(pending[1], ts)) if pending else (ts, ts)
+            self.conn.commit()
+    
+    def _flush_rollups(self, source):
+        """Ausstehende Rollups einer Quelle nachziehen (ohne Commit)."""
+        pending = self._pending_rollups.pop(source, None)
+        if pending:
+            self._refresh_rollups(source, *pending)
+    
+    def backfill_heating_csv(self, csv_path, source="heating_backfill"):
+        """
+        Einmaliger Import der bisherigen Heizungstemperaturen.csv.
+        
+        Neue Messwerte schreibt BMKDATEN direkt in `heating`; der Backfill
+        läuft daher nur einmal (Marker in `import_state`). Monatsarchive
+        (core.csvlog) werden mit importiert.
+        
+        Returns:
+            Anzahl importierter Zeilen (0 wenn bereits erledigt)
+        """
+        if not os.path.exists(csv_path):
+            return 0
+        
+        with self._lock, open(csv_path, 'rb') as f:
+            if self._get_import_state(source):
+                return 0
+            stat = os.fstat(f.fileno())
+            end = _last_line_end(f, 0, stat.st_size)
+            archived = (
+                row
+                for archive, _ in (archive_segments(csv_path) if archive_segments else ())
+                for row in csv.reader(read_archive(archive)[1])
+            )
+            rows = chain(archived, csv.reader(_iter_lines(f, 0, end)))
+            records = (_parse_heating_row(row) for row in rows)
+            count = 0
+            try:
+                for batch in _batched(filter(None, records), BULK_BATCH_SIZE):
+                    self.conn.executemany("""
+                        INSERT OR IGNORE INTO heating 
+                        (ts, kesseltemp, außentemp, puffer_top, puffer_mid, puffer_bot, warmwasser)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """, batch)
+                    count += len(batch)
+                    self._refresh_rollups("heating", min(r[0] for r in batch), max(r[0] for r in batch))
+                self.conn.execute("""
+                    INSERT OR REPLACE INTO import_state (source, inode, offset, updated_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """, (source, stat.st_ino, end))
+                self.conn.commit()
+            except Exception as e:
+                self.conn.rollback()
+                print(f"[DB] ❌ Heating backfill error: {e}")
+                return 0
+        
+        print(f"[DB] ✅ Imported {count} heating records")
+        return count
+    
+    def get_heating_range(self, start, end=None):
+        """
+        Hole Heizungswerte im Zeitraum [start, end] (Range-Scan über den Primärschlüssel).
+        
+        Args:
+            start, end: datetime (end=None = bis jetzt)
+        
+        Returns:
+            Liste von (datetime, kesseltemp, außentemp, puffer_top, puffer_mid, puffer_bot, warmwasser)
+        """
+        params = [to_epoch(start)]
+        sql = f"SELECT ts, {', '.join(HEATING_COLUMNS)} FROM heating WHERE ts >= ?"
+        if end is not None:
+            sql += " AND ts <= ?"
+            params.append(to_epoch(end))
+        sql += " ORDER BY ts"
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [(from_epoch(row[0]), *row[1:]) for row in rows]
+    
+    def _iter_samples(self, source, lo, hi, max_gap=ENERGY_MAX_GAP):
+        """
+        Rohdaten aus [lo, hi) tageweise als NumPy-Arrays (Range-Scan über den
+        Primärschlüssel).
+        
+        Yields:
+            (ts, values, energy) - nur Samples des jeweiligen Blocks; values
+            ist ein Dict Spalte -> Array (NULL = NaN), energy bei fronius die
+            kWh je ENERGY_FLOWS (Intervall Vorgänger -> Sample), sonst {}
+        """
+        columns = ROLLUP_COLUMNS[source]
+        for block in range(lo // ENERGY_CHUNK_SECONDS * ENERGY_CHUNK_SECONDS, hi, ENERGY_CHUNK_SECONDS):
+            block_lo = max(lo, block)
+            block_hi = min(hi, block + ENERGY_CHUNK_SECONDS)
+            # Vorgänger-Samples bis max_gap vor dem Block für das erste Intervall
+            rows = self.conn.execute(
+                f"SELECT ts, {', '.join(columns)} FROM {source} WHERE ts >= ? AND ts < ? ORDER BY ts",
+                (block_lo - (max_gap if ROLLUP_ENERGY[source] else 0), block_hi),
+            ).fetchall()
+            if not rows:
+                continue
+            data = np.array(rows, dtype=np.float64)
+            ts = data[:, 0].astype(np.int64)
+            energy = {}
+            if ROLLUP_ENERGY[source]:
+                flows = signed_flows(*(data[:, columns.index(c) + 1] for c in ("pv_power", "grid_power", "batt_power", "load_power")))
+                energy = integrate_energy(ts, flows, max_gap)
+            inside = ts >= block_lo
+            if not inside.any():
+                continue
+            yield (
+                ts[inside],
+                {column: data[inside, i + 1] for i, column in enumerate(columns)},
+                {name: e[inside] for name, e in energy.items()},
+            )
+    
+    def _insert_raw_rollups(self, source, lo, hi):
+        """1-Minuten-Buckets für [lo, hi) aus den Rohdaten (min/max/Summe/Anzahl, Energie)."""
+        res = ROLLUP_RESOLUTIONS[0]
+        placeholders = ", ".join("?" * (3 + 4 * len(ROLLUP_COLUMNS[source]) + len(ROLLUP_ENERGY[source])))
+        if ROLLUP_HOLD[source]:
+            self._insert_held_rollups(source, lo, hi, placeholders)
+            return
+        for ts, values, energy in self._iter_samples(source, lo, hi):
+            buckets, starts = bucket_starts(ts, res)
+            fields = [np.full(len(buckets), res), buckets, np.diff(np.r_[starts, len(ts)])]
+            for column in ROLLUP_COLUMNS[source]:
+                v = values[column]
+                valid = ~np.isnan(v)
+                fields += [
+                    np.fmin.reduceat(v, starts),
+                    np.fmax.reduceat(v, starts),
+                    np.add.reduceat(np.where(valid, v, 0.0), starts),
+                    np.add.reduceat(valid.astype(np.int64), starts),
+                ]
+            fields += [np.add.reduceat(energy[flow], starts) for flow in ROLLUP_ENERGY[source]]
+            # NaN (Bucket ohne Wert) speichert SQLite als NULL
+            self.conn.executemany(
+                f"INSERT INTO {source}_rollup VALUES ({placeholders})",
+                np.column_stack(fields).tolist(),
+            )
+    
+    def _insert_held_rollups(self, source, lo, hi, placeholders):
+        """
+        1-Minuten-Buckets für [lo, hi) eines Deadband-Logs (ROLLUP_HOLD):
+        min/max über die gehaltenen Werte, Summe und Dauer zeitgewichtet,
+        n = Anzahl Samples im Bucket.
+        """
+        res = ROLLUP_RESOLUTIONS[0]
+        hold = ROLLUP_HOLD[source]
+        columns = ROLLUP_COLUMNS[source]
+        for block in range(lo // ENERGY_CHUNK_SECONDS * ENERGY_CHUNK_SECONDS, hi, ENERGY_CHUNK_SECONDS):
+            block_lo = max(lo, block)
+            block_hi = min(hi, block + ENERGY_CHUNK_SECONDS)
+            # Vorgänger (gilt bis in den Block) und Nachfolger (beendet das letzte Sample)
+            rows = self.conn.execute(
+                f"SELECT ts, {', '.join(columns)} FROM {source} WHERE ts >= ? AND ts < ? ORDER BY ts",
+                (block_lo - hold, block_hi + hold),
+            ).fetchall()
+            if not rows:
+                continue
+            data = np.array(rows, dtype=np.float64)
+            ts = data[:, 0].astype(np.int64)
+            idx, start, duration = hold_segments(ts, res, hold)
+            inside = (start >= block_lo) & (start < block_hi)
+            idx, start, duration = idx[inside], start[inside], duration[inside]
+            if not len(idx):
+                continue
+            buckets, starts = bucket_starts(start, res)
+            fields = [np.full(len(buckets), res), buckets, np.add.reduceat((start == ts[idx]).astype(np.int64), starts)]
+            for i in range(len(columns)):
+                v = data[idx, i + 1]
+                valid = ~np.isnan(v)
+                fields += [
+                    np.fmin.reduceat(v, starts),
+                    np.fmax.reduceat(v, starts),
+                    np.add.reduceat(np.where(valid, v * duration, 0.0), starts),
+                    np.add.reduceat(np.where(valid, duration, 0), starts),
+                ]
+            self.conn.executemany(
+                f"INSERT INTO {source}_rollup VALUES ({placeholders})",
+                np.column_stack(fields).tolist(),
+            )
+    
+    def _refresh_rollups(self, source, t_from, t_to):
+        """
+        Berechne alle Rollup-Buckets neu, die Samples aus [t_from, t_to]
+        betreffen (ohne Commit - läuft in der Transaktion des Aufrufers).
+        
+        Die 1-Minuten-Stufe kommt aus den Rohdaten, jede gröbere Stufe aus
+        der nächstfeineren; das nachfolgende Sample (Energie-Trapez) wird über
+        ENERGY_MAX_GAP mit abgedeckt, bei Deadband-Logs das gehaltene
+        Vorgänger-Sample und die Haltezeit des letzten (ROLLUP_HOLD).
+        """
+        hold = ROLLUP_HOLD[source]
+        if hold:
+            t_from -= hold
+            t_to += hold
+        else:
+            t_to += ENERGY_MAX_GAP
+        table = f"{source}_rollup"
+        fine = None
+        for res in ROLLUP_RESOLUTIONS:
+            lo = t_from // res * res
+            hi = (t_to // res + 1) * res
+            self.conn.execute(f"DELETE FROM {table} WHERE res = ? AND bucket >= ? AND bucket < ?", (res, lo, hi))
+            if fine is None:
+                self._insert_raw_rollups(source, lo, hi)
+            else:
+                self.conn.execute(_rollup_insert_coarse_sql(source), {"res": res, "fine": fine, "lo": lo, "hi": hi})
+            fine = res
+    
+    def rebuild_rollups(self, source="fronius"):
+        """Verwirf die Rollups einer Quelltabelle und baue sie aus den Rohdaten neu auf."""
+        start = time.perf_counter()
+        with self._lock:
+            self._pending_rollups.pop(source, None)
+            try:
+                self.conn.execute(f"DELETE FROM {source}_rollup")
+                t_from, t_to = self.conn.execute(f"SELECT MIN(ts), MAX(ts) FROM {source}").fetchone()
+                if t_from is not None:
+                    self._refresh_rollups(source, t_from, t_to)
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+        print(f"[DB] ✅ Rollups {source} neu aufgebaut in {time.perf_counter() - start:.1f}s")
+    
+    def get_rollup(self, source, start, end=None, resolution=None, max_points=ROLLUP_MAX_POINTS):
+        """
+        Aggregierte Werte für [start, end] aus der passenden Rollup-Stufe.
+        
+        Ohne `resolution` wird die feinste Stufe gewählt, die höchstens
+        `max_points` Buckets liefert (24 h -> 15 min, 30 d -> 1 h, 365 d -> Tag).
+        
+        Args:
+            source: "fronius" oder "heating"
+            start, end: datetime (end=None = bis jetzt)
+            resolution: Bucket-Größe in Sekunden aus ROLLUP_RESOLUTIONS
+        
+        Returns:
+            Liste von Dicts je Bucket: 'time' (Bucket-Beginn), 'count', je
+            Spalte <spalte> (Mittelwert, bei heating zeitgewichtet - siehe
+            ROLLUP_HOLD), <spalte>_min, <spalte>_max und bei fronius je
+            Energiefluss <fluss>_kwh (siehe ENERGY_FLOWS)
+        """
+        if end is None:
+            end = datetime.now()
+        if resolution not in ROLLUP_RESOLUTIONS:
+            resolution = pick_rollup_resolution(start, end, max_points)
+        columns = ROLLUP_COLUMNS[source]
+        flows = ROLLUP_ENERGY[source]
+        fields = []
+        for column in columns:
+            fields += [f"{column}_sum / {column}_cnt", f"{column}_min", f"{column}_max"]
+        fields += [f"{flow}_kwh" for flow in flows]
+        
+        with self._lock:
+            if source in self._pending_rollups:
+                self._flush_rollups(source)
+                self.conn.commit()
+            rows = self.conn.execute(f"""
+                SELECT bucket, n, {', '.join(fields)}
+                FROM {source}_rollup
+                WHERE res = ? AND bucket >= ? AND bucket <= ?
+                ORDER BY bucket
+            """, (resolution, to_epoch(start) // resolution * resolution, to_epoch(end))).fetchall()
+        
+        out = []
+        for row in rows:
+            entry = {'time': from_epoch(row[0]), 'count': row[1]}
+            values = iter(row[2:])
+            for column in columns:
+                entry[column] = next(values)
+                entry[f"{column}_min"] = next(values)
+                entry[f"{column}_max"] = next(values)
+            for flow in flows:
+                entry[f"{flow}_kwh"] = next(values)
+            out.append(entry)
+        return out
+    
+    def get_energy_totals(self, start=None, end=None, max_gap=ENERGY_MAX_GAP):
+        """
+        Energiebilanz je Tag und Monat in einem Durchlauf über die Rohdaten.
+        
+        Trapezregel über tageweise Range-Scans (NumPy, gleiche Definition wie
+        die Rollups und der Ertrag-Validator): ein Intervall zählt zum Tag des
+        späteren Samples, Intervalle > max_gap Sekunden werden verworfen.
+        
+        Args:
+            start, end: datetime oder None (= ganzer Bestand)
+            max_gap: maximaler Abstand zweier Samples in Sekunden
+        
+        Returns:
+            {'days': [...], 'months': [...]} - je Eintrag 'day' ('YYYY-MM-DD')
+            bzw. 'month' ('YYYY-MM'), 'samples' und <fluss>_kwh je ENERGY_FLOWS
+        """
+        rows = []
+        with self._lock:
+            first, last = self.conn.execute("SELECT MIN(ts), MAX(ts) FROM fronius").fetchone()
+            if first is None:
+                return {'days': [], 'months': []}
+            lo = to_epoch(start) if start is not None else first
+            hi = (to_epoch(end) if end is not None else last) + 1
+            for ts, _values, energy in self._iter_samples("fronius", lo, hi, max_gap):
+                days_start, starts = bucket_starts(ts, 86400)
+                counts = np.diff(np.r_[starts, len(ts)])
+                sums = [np.add.reduceat(energy[flow], starts) for flow in ENERGY_FLOWS]
+                rows += zip(days_start.tolist(), counts.tolist(), *(a.tolist() for a in sums))
+        
+        days = []
+        months = {}
+        for row in rows:
+            day = {'day': from_epoch(row[0]).strftime("%Y-%m-%d"), 'samples': row[1]}
+            day.update((f"{flow}_kwh", value) for flow, value in zip(ENERGY_FLOWS, row[2:]))
+            days.append(day)
+            month = months.setdefault(day['day'][:7], {'month': day['day'][:7], **dict.fromkeys(day, 0)})
+            for key, value in day.items():
+                if key != 'day':
+                    month[key] += value
+        for month in months.values():
+            del month['day']
+        return {'days': days, 'months': list(months.values())}
+    
     def get_last_fronius_record(self):
         """Hole letzten PV-Record."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT timestamp, pv_power, grid_power, batt_power, soc 
-            FROM fronius ORDER BY rowid DESC LIMIT 1
-        """)
-        row = cursor.fetchone()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT datetime(ts, 'unixepoch'), pv_power, grid_power, batt_power, soc 
+                FROM fronius ORDER BY ts DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
         if row:
             return {
                 'timestamp': row[0],
@@ -133,20 +1074,28 @@ class DataStore:
         return None
     
     def get_hourly_averages(self, hours=24):
-        """Hole stündliche Durchschnitte der letzten N Stunden."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                datetime(timestamp, 'start of hour') as hour,
-                AVG(pv_power) as avg_pv,
-                AVG(grid_power) as avg_grid,
-                AVG(batt_power) as avg_batt,
-                AVG(soc) as avg_soc
-            FROM fronius
-            WHERE timestamp > datetime('now', '-' || ? || ' hours')
-            GROUP BY hour
-            ORDER BY hour DESC
-        """, (hours,))
+        """
+        Hole stündliche Durchschnitte der letzten N Stunden.
+        
+        Gruppiert nach `ts / 3600` - dieselbe Expression wie idx_fronius_hour,
+        damit SQLite nur den Covering-Index liest (kein Temp-B-Tree).
+        """
+        since_hour = (to_epoch(datetime.now()) - hours * 3600) // 3600
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                SELECT 
+                    datetime((ts / 3600) * 3600, 'unixepoch') as hour,
+                    AVG(pv_power) as avg_pv,
+                    AVG(grid_power) as avg_grid,
+                    AVG(batt_power) as avg_batt,
+                    AVG(soc) as avg_soc
+                FROM fronius
+                WHERE ts / 3600 >= ?
+                GROUP BY ts / 3600
+                ORDER BY ts / 3600 DESC
+            """, (since_hour,))
+            rows = cursor.fetchall()
         
         return [
             {
@@ -156,41 +1105,50 @@ class DataStore:
                 'batt': row[3],
                 'soc': row[4]
             }
-            for row in cursor.fetchall()
+            for row in rows
         ]
     
     def get_daily_totals(self, days=30):
-        """Hole tägliche Totals der letzten N Tage."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT 
-                DATE(timestamp) as day,
-                SUM(pv_power) * 5 / 3600 as pv_kwh,
-                COUNT(*) as samples
-            FROM fronius
-            WHERE timestamp > datetime('now', '-' || ? || ' days')
-            GROUP BY day
-            ORDER BY day DESC
-        """, (days,))
+        """
+        Hole tägliche Totals der letzten N Tage (neuester Tag zuerst).
         
-        return [
-            {
-                'day': row[0],
-                'pv_kwh': row[1],
-                'samples': row[2]
-            }
-            for row in cursor.fetchall()
-        ]
+        Liest den Tages-Rollup; die Energie ist trapezintegriert wie in
+        get_energy_totals (<fluss>_kwh je ENERGY_FLOWS).
+        """
+        rows = self.get_rollup("fronius", datetime.now() - timedelta(days=days), resolution=86400)
+        out = []
+        for row in reversed(rows):
+            day = {'day': row['time'].strftime("%Y-%m-%d"), 'samples': row['count']}
+            day.update((f"{flow}_kwh", row[f"{flow}_kwh"]) for flow in ENERGY_FLOWS)
+            out.append(day)
+        return out
     
     def close(self):
         """Schließe Datenbank."""
         if self.conn:
-            self.conn.close()
+            with self._lock:
+                for source in list(self._pending_rollups):
+                    self._flush_rollups(source)
+                self.conn.commit()
+                self.conn.close()
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_datastore():
+    """Prozessweiter DataStore (eine Connection für Sammler, UI und Tabs)."""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = DataStore()
+        return _shared_store
 
 
 # Quick Startup Helper
 def quick_import_if_needed():
-    """Importiere CSVs wenn Datenbank leer ist."""
+    """Importiere neue CSV-Zeilen (vollständig wenn Datenbank leer ist)."""
     store = DataStore()
     
     # Prüfe ob bereits Daten vorhanden
@@ -198,17 +1156,19 @@ def quick_import_if_needed():
     cursor.execute("SELECT COUNT(*) FROM fronius")
     count = cursor.fetchone()[0]
     
+    fronius_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "FroniusDaten.csv")
     if count == 0:
         print("[DB] 📊 Datenbank leer - importiere CSVs...")
-        fronius_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "FroniusDaten.csv")
-        
-        if os.path.exists(fronius_path):
-            print(f"[DB] Importing from {fronius_path}...")
-            store.import_fronius_csv(fronius_path)
-        else:
-            print(f"[DB] ⚠️ {fronius_path} not found")
+    
+    if os.path.exists(fronius_path):
+        # Erster Lauf importiert alles, danach nur neue Zeilen
+        imported = store.sync_fronius_csv(fronius_path)
+        print(f"[DB] ✅ Database ready ({count + imported} Fronius records, {imported} neu)")
     else:
-        print(f"[DB] ✅ Database ready ({count} Fronius records)")
+        print(f"[DB] ⚠️ {fronius_path} not found")
+    
+    heating_path = os.path.join(os.path.dirname(__file__), "..", "..", "data", "Heizungstemperaturen.csv")
+    store.backfill_heating_csv(heating_path)
     
     store.close()
 
@@ -0,0 +1,128 @@
+"""
+Deadband-Aufzeichnung (nur Änderungen speichern)
+================================================
+Die BMK-Werte ändern sich langsam, trotzdem schrieb jeder Abruf eine volle
+Zeile. Mit Deadband wird ein Messwert nur gespeichert, wenn
+
+- ein Kanal sich gegenüber dem zuletzt *gespeicherten* Wert um mehr als
+  seine Schwelle bewegt hat (Kanäle ohne Schwelle: jede Änderung),
+- ein Kanal gültig/ungültig wird (None <-> Zahl), oder
+- seit der letzten gespeicherten Zeile `heartbeat` Sekunden vergangen sind.
+
+Interpretation für Leser (Halteglied, "letzter Wert gilt"):
+Eine gespeicherte Zeile gilt bis zur nächsten. Der wahre Wert lag in dieser
+Zeit innerhalb +-Schwelle um den gespeicherten Wert. Es wird *nicht*
+linear interpoliert - Diagramme zeichnen Stufen (drawstyle="steps-post"),
+Bins ohne Zeile übernehmen den letzten Wert (TimeSeriesStore.binned mit
+hold). Ein Abstand größer als heartbeat + Abtastintervall bedeutet keine
+Daten (Sammler/Gerät ausgefallen), dort wird nicht gehalten
+(MAX_HOLD_SECONDS).
+
+Mittelwerte müssen zeitgewichtet sein (Σ Wert·Δt / ΣΔt, Δt = Haltezeit):
+Zeilen liegen dicht, wo sich viel ändert, und dünn, wo der Wert steht - ein
+einfaches Stichprobenmittel überbewertet unruhige Phasen beliebig stark.
+TimeSeriesStore.binned (mit hold) und die heating-Rollups der DataStore
+(ROLLUP_HOLD) mitteln daher über die Haltezeit.
+"""
+
+import math
+
+# Spätestens nach dieser Zeit (s) wird auch ohne Änderung gespeichert
+HEARTBEAT_SECONDS = 300
+# So lange (s) gilt ein gespeicherter Wert für Leser: Heartbeat + Abrufintervall mit Reserve
+MAX_HOLD_SECONDS = HEARTBEAT_SECONDS + 60
+
+
+def _as_number(value):
+    """Zahl oder None (leere/ungültige Werte, NaN)."""
+    if value is None or value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+class Deadband:
+    """Entscheidet pro Sample, ob es gespeichert wird (Zustand: letzte gespeicherte Werte)."""
+
+    def __init__(self, thresholds, heartbeat=HEARTBEAT_SECONDS):
+        """
+        Args:
+            thresholds: Kanal -> Schwelle (gleiche Einheit wie der Kanal)
+            heartbeat: maximale Zeit (s) zwischen zwei gespeicherten Samples
+        """
+        self.thresholds = dict(thresholds)
+        self.heartbeat = heartbeat
+        self._last_time = None
+        self._last_values = {}
+        self.stats = {"recorded": 0, "suppressed": 0}
+
+    def reset(self):
+        """Nächstes Sample auf jeden Fall speichern (z.B. nach Schreibfehler)."""
+        self._last_time = None
+        self._last_values = {}
+
+    def changed(self, timestamp, values):
+        """Muss das Sample gespeichert werden? (ohne Zustand zu ändern)"""
+        if self._last_time is None:
+            return True
+        age = (timestamp - self._last_time).total_seconds()
+        if age >= self.heartbeat or age < 0:  # Heartbeat oder Uhr zurückgestellt
+            return True
+        for channel, value in values.items():
+            new = _as_number(value)
+            old = self._last_values.get(channel)
+            if (new is None) != (old is None):
+                return True
+            if new is not None and abs(new - old) > self.thresholds.get(channel, 0.0):
+                return True
+        return False
+
+    def check(self, timestamp, values):
+        """
+        Wie `changed`, merkt sich das Sample aber als gespeichert, wenn True.
+
+        Args:
+            timestamp: datetime des Samples
+            values: Kanal -> Wert (Zahl, Text oder None)
+        """
+        if not self.changed(timestamp, values):
+            self.stats["suppressed"] += 1
+            return False
+        self._last_time = timestamp
+        self._last_values = {channel: _as_number(value) for channel, value in values.items()}
+        self.stats["recorded"] += 1
+        return True
+
+
+if __name__ == "__main__":
+    # Trockenlauf auf einem bestehenden Log: wie viele Zeilen blieben übrig?
+    import csv
+    import os
+    import sys
+    from datetime import datetime
+
+    from core.BMKDATEN import HEIZUNG_DEADBAND
+
+    for csv_path in sys.argv[1:]:
+        band = Deadband(HEIZUNG_DEADBAND)
+        kept_bytes = 0
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            for row in reader:
+                if len(row) != len(header):
+                    continue
+                try:
+                    ts = datetime.fromisoformat(row[0])
+                except ValueError:
+                    continue
+                if band.check(ts, dict(zip(header[1:], row[1:]))):
+                    kept_bytes += len(",".join(row)) + 1
+        total = band.stats["recorded"] + band.stats["suppressed"]
+        print(
+            f"[DEADBAND] {csv_path}: {band.stats['recorded']}/{total} Zeilen, "
+            f"{kept_bytes / 1024:.0f} von {os.path.getsize(csv_path) / 1024:.0f} KiB"
+        )
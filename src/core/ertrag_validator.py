@@ -2,11 +2,24 @@
 Ertrag-Validator: Überprüft und rekonstruiert ErtragHistory.csv aus FroniusDaten.csv
 Rekonstruiert fehlende Einträge und validiert Konsistenz
 """
+import io
 import os
+import sys
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import json
 
+try:
+    from core.datastore import ENERGY_MAX_GAP, bucket_starts, integrate_energy
+except ImportError:
+    from datastore import ENERGY_MAX_GAP, bucket_starts, integrate_energy  # Direktaufruf aus src/core
+
+try:
+    from core.csvlog import archive_segments, read_window
+except ImportError:
+    from csvlog import archive_segments, read_window  # Direktaufruf aus src/core
+
 WORKING_DIR = os.path.dirname(os.path.abspath(__file__))
 # Nach Reorganisierung: data/ Verzeichnis im Root
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(WORKING_DIR)), "data")
@@ -14,24 +27,23 @@ FRONIUS_CSV = os.path.join(DATA_DIR, "FroniusDaten.csv")
 ERTRAG_CSV = os.path.join(DATA_DIR, "ErtragHistory.csv")
 ERTRAG_BACKUP = os.path.join(WORKING_DIR, "ErtragHistory_backup.csv")
 ERTRAG_VALIDATION_LOG = os.path.join(WORKING_DIR, "ertrag_validation.json")
+# Watermark: letzter vollständig validierter Tag + Byte-Offset in FroniusDaten.csv
+ERTRAG_WATERMARK = os.path.join(WORKING_DIR, "ertrag_watermark.json")
+
+TIME_COLUMN = "Zeitstempel"
+PV_COLUMN = "PV-Leistung (kW)"
 
 
 def load_data():
-    """Lade Fronius und Ertrag Daten."""
+    """Lade Fronius und Ertrag Daten (gestreamt, nur die benötigten Spalten)."""
     try:
-        fronius = pd.read_csv(FRONIUS_CSV, parse_dates=["Zeitstempel"], dtype={"Zeitstempel": str}) if os.path.exists(FRONIUS_CSV) else pd.DataFrame()
-        if not fronius.empty and "Zeitstempel" in fronius.columns:
-            fronius["Zeitstempel"] = pd.to_datetime(fronius["Zeitstempel"], errors="coerce")
-            fronius = fronius.dropna(subset=["Zeitstempel"])
+        fronius = read_window(FRONIUS_CSV, columns=[PV_COLUMN])
     except Exception as e:
         print(f"[ERTRAG] Error loading Fronius: {e}")
         fronius = pd.DataFrame()
     
     try:
-        ertrag = pd.read_csv(ERTRAG_CSV, parse_dates=["Zeitstempel"], dtype={"Zeitstempel": str}) if os.path.exists(ERTRAG_CSV) else pd.DataFrame()
-        if not ertrag.empty and "Zeitstempel" in ertrag.columns:
-            ertrag["Zeitstempel"] = pd.to_datetime(ertrag["Zeitstempel"], errors="coerce")
-            ertrag = ertrag.dropna(subset=["Zeitstempel"])
+        ertrag = read_window(ERTRAG_CSV, columns=["Ertrag_kWh"])
     except Exception as e:
         print(f"[ERTRAG] Error loading Ertrag: {e}")
         ertrag = pd.DataFrame()
@@ -48,10 +60,12 @@ def reconstruct_ertrag_from_fronius(fronius_df: pd.DataFrame) -> pd.DataFrame:
     """
     Rekonstruiere ErtragHistory aus FroniusDaten durch tägliche Integration.
     
-    Methode:
-    - Gruppiere FroniusDaten nach Tag
-    - Berechne PV-Energie pro Tag durch Trapez-Integration
-    - Energy [kWh] = ∑(kW × Δt_hours) für alle Messwerte an diesem Tag
+    Methode: dieselbe Integration wie DataStore.get_energy_totals und die
+    Rollups (core.datastore.integrate_energy):
+    - Trapez-Integration zwischen aufeinanderfolgenden Messwerten
+    - Ein Intervall zählt zum Tag des späteren Messwerts (auch über Mitternacht)
+    - Intervalle länger als ENERGY_MAX_GAP (Datenlücke) zählen nicht
+    - Intervalle an einem fehlenden Wert (NaN) zählen nicht, der Tag bleibt
     
     Args:
         fronius_df: FroniusDaten DataFrame mit Spalten: Zeitstempel, PV-Leistung (kW)
@@ -62,57 +76,188 @@ def reconstruct_ertrag_from_fronius(fronius_df: pd.DataFrame) -> pd.DataFrame:
     if fronius_df.empty:
         return pd.DataFrame(columns=["Zeitstempel", "Ertrag_kWh"])
     
-    fronius_df = fronius_df.copy().sort_values("Zeitstempel").reset_index(drop=True)
+    fronius_df = fronius_df.sort_values("Zeitstempel", kind="stable")
     
-    # Extrahiere Datum (ohne Zeit)
-    fronius_df["Date"] = fronius_df["Zeitstempel"].dt.date
+    # Naive Zeitstempel als Sekunden seit 1970 (lokale Wanduhrzeit wie in der DB)
+    ts = fronius_df["Zeitstempel"].to_numpy(dtype="datetime64[s]").astype(np.int64)
+    pv = fronius_df["PV-Leistung (kW)"].to_numpy(dtype=np.float64)
     
-    ertrag_records = []
+    energy = integrate_energy(ts, {"pv": pv}, ENERGY_MAX_GAP)["pv"]
+    days, starts = bucket_starts(ts, 86400)
+    daily = np.add.reduceat(energy, starts)
     
-    # Iteriere über jeden Tag
-    for date, day_group in fronius_df.groupby("Date"):
-        day_group = day_group.sort_values("Zeitstempel").reset_index(drop=True)
-        
-        if day_group.empty:
-            continue
-        
-        # Berechne Zeitdifferenzen zwischen Messwerten (in Stunden)
-        time_diffs = day_group["Zeitstempel"].diff()
-        time_diffs_hours = time_diffs.dt.total_seconds() / 3600
-        time_diffs_hours.iloc[0] = 0  # Erste Differenz = 0
+    keep = daily > 0
+    return pd.DataFrame({
+        "Zeitstempel": pd.to_datetime(days[keep], unit="s"),
+        "Ertrag_kWh": daily[keep],
+    })
+
+
+def _scan_watermark(path: str, end: int | None = None) -> dict:
+    """
+    Ermittle den Watermark für `path` durch Rückwärtslesen ab `end`
+    (Standard: Ende der letzten vollständigen Zeile).
+    
+    Der zuletzt begonnene Tag gilt als unvollständig: `offset` zeigt auf
+    seine erste Zeile, `validated_day` ist der Tag davor und `prev` dessen
+    letzter Messwert (für das Trapez über Mitternacht).
+    """
+    with open(path, "rb") as f:
+        stat = os.fstat(f.fileno())
+        header = f.readline()
+        data_start = len(header)
+        names = header.decode("utf-8-sig", errors="replace").strip().split(",")
+        watermark = {"inode": stat.st_ino, "offset": data_start, "validated_day": None, "prev": None}
         
-        # Berechne Energie: kW × Δt_h = kWh
-        # Nutze Trapez-Integration für bessere Genauigkeit
-        energy_kwh = 0.0
-        for i in range(len(day_group) - 1):
-            p1 = day_group["PV-Leistung (kW)"].iloc[i]
-            p2 = day_group["PV-Leistung (kW)"].iloc[i + 1]
-            dt = (day_group["Zeitstempel"].iloc[i + 1] - day_group["Zeitstempel"].iloc[i]).total_seconds() / 3600
-            
-            # Trapez-Regel: E = (P1 + P2) / 2 × Δt
-            energy_kwh += (p1 + p2) / 2.0 * dt
+        if end is None:
+            # Ende der letzten vollständigen Zeile
+            f.seek(max(data_start, stat.st_size - 65536))
+            tail = f.read()
+            end = stat.st_size - len(tail) + tail.rfind(b"\n") + 1
+        if end <= data_start:
+            return watermark
         
-        if energy_kwh > 0:
-            ertrag_records.append({
-                "Zeitstempel": pd.Timestamp(datetime.combine(date, datetime.min.time())),
-                "Ertrag_kWh": energy_kwh
-            })
+        probe = 65536
+        while True:
+            start = max(data_start, end - probe)
+            f.seek(start)
+            lines = f.read(end - start).split(b"\n")[:-1]
+            pos = start
+            if start > data_start:
+                # Erste Zeile ist angeschnitten
+                pos += len(lines[0]) + 1
+                lines = lines[1:]
+            offsets = []
+            for line in lines:
+                offsets.append(pos)
+                pos += len(line) + 1
+            last_day = lines[-1][:10] if lines else b""
+            for i in range(len(lines) - 1, -1, -1):
+                if lines[i][:10] != last_day:
+                    watermark["offset"] = offsets[i + 1]
+                    values = lines[i].decode("utf-8", errors="replace").strip().split(",")
+                    try:
+                        prev_ts = values[names.index(TIME_COLUMN)]
+                        watermark["prev"] = [prev_ts, float(values[names.index(PV_COLUMN)])]
+                        watermark["validated_day"] = prev_ts[:10]
+                    except (ValueError, IndexError):
+                        pass
+                    return watermark
+            if start == data_start:
+                return watermark
+            probe *= 4
+
+
+def _validate_incremental():
+    """
+    Validiere nur Tage ab dem Watermark und übernimm sie in ErtragHistory.csv.
+    
+    Nach einer Monatsrotation (core.csvlog) werden die neuen Messwerte ab
+    dem Watermark segmentübergreifend gelesen.
+    
+    Returns:
+        True bei Erfolg, None wenn kein gültiger Watermark vorliegt
+        (neue/ersetzte Datei) - dann ist ein Vollaufbau nötig
+    """
+    try:
+        with open(ERTRAG_WATERMARK, "r") as f:
+            watermark = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(FRONIUS_CSV) or not os.path.exists(ERTRAG_CSV):
+        return None
+    
+    chunk = b""
+    with open(FRONIUS_CSV, "rb") as f:
+        stat = os.fstat(f.fileno())
+        rotated = stat.st_ino != watermark.get("inode") or stat.st_size < watermark.get("offset", 0)
+        if not rotated:
+            names = f.readline().decode("utf-8-sig", errors="replace").strip().split(",")
+            f.seek(watermark["offset"])
+            chunk = f.read()
+            chunk = chunk[:chunk.rfind(b"\n") + 1]
+    if rotated and not (watermark.get("prev") and archive_segments(FRONIUS_CSV)):
+        print("→ FroniusDaten.csv ersetzt/gekürzt - Vollaufbau nötig")
+        return None
+    
+    if rotated:
+        # Monatsrotation: alles nach dem letzten validierten Messwert, auch aus dem Archiv
+        new = read_window(FRONIUS_CSV, start=datetime.fromisoformat(watermark["prev"][0]) + timedelta(seconds=1), columns=[PV_COLUMN])
+        if new.empty:
+            new = pd.DataFrame(columns=[TIME_COLUMN, PV_COLUMN])
+        new = new.dropna(subset=[TIME_COLUMN]).drop_duplicates(subset=[TIME_COLUMN], keep="first")
+    elif chunk:
+        new = pd.read_csv(io.BytesIO(chunk), header=None, names=names, usecols=[TIME_COLUMN, PV_COLUMN])
+        new[TIME_COLUMN] = pd.to_datetime(new[TIME_COLUMN], errors="coerce")
+        new[PV_COLUMN] = pd.to_numeric(new[PV_COLUMN], errors="coerce")
+        new = new.dropna(subset=[TIME_COLUMN]).drop_duplicates(subset=[TIME_COLUMN], keep="first")
+    else:
+        new = pd.DataFrame(columns=[TIME_COLUMN, PV_COLUMN])
+    
+    print(f"\n✓ Watermark: validiert bis {watermark.get('validated_day')}, {len(new)} neue Messwerte")
+    if new.empty:
+        return True
+    
+    # Tage ab dem ersten neuen Messwert neu berechnen, letzter Wert davor als Trapez-Anker
+    first_day = new[TIME_COLUMN].min().normalize()
+    samples = new
+    if watermark.get("prev"):
+        prev = pd.DataFrame({TIME_COLUMN: [pd.Timestamp(watermark["prev"][0])], PV_COLUMN: [watermark["prev"][1]]})
+        samples = pd.concat([prev, new], ignore_index=True)
+    days = reconstruct_ertrag_from_fronius(samples)
+    days = days[days["Zeitstempel"] >= first_day]
     
-    return pd.DataFrame(ertrag_records)
+    ertrag = pd.read_csv(ERTRAG_CSV)
+    ertrag["Zeitstempel"] = pd.to_datetime(ertrag["Zeitstempel"], errors="coerce")
+    ertrag = ertrag[ertrag["Zeitstempel"] < first_day]
+    ertrag_final = pd.concat([ertrag, days], ignore_index=True).sort_values("Zeitstempel")
+    ertrag_final.to_csv(ERTRAG_CSV, index=False)
+    print(f"✓ ErtragHistory: {len(days)} Tage ab {first_day.date()} aktualisiert")
+    
+    new_watermark = _scan_watermark(FRONIUS_CSV, None if rotated else watermark["offset"] + len(chunk))
+    if new_watermark["prev"] is None:
+        # aktive Datei enthält nur den laufenden Tag: alter Anker gilt weiter
+        new_watermark["prev"] = watermark.get("prev")
+        new_watermark["validated_day"] = watermark.get("validated_day")
+    with open(ERTRAG_WATERMARK, "w") as f:
+        json.dump(new_watermark, f)
+    
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "mode": "incremental",
+        "fronius_new_entries": len(new),
+        "days_updated": [d.date().isoformat() for d in days["Zeitstempel"]],
+        "validated_day": new_watermark["validated_day"],
+    }
+    with open(ERTRAG_VALIDATION_LOG, "w") as f:
+        json.dump(report, f, indent=2)
+    return True
 
 
-def validate_and_repair_ertrag():
+def validate_and_repair_ertrag(full_rebuild: bool = False):
     """
-    Hauptvalidierungsfunktion:
+    Hauptvalidierungsfunktion.
+    
+    Standard: inkrementell ab dem Watermark (nur neue Messwerte, nur
+    betroffene Tage). Vollaufbau, wenn `full_rebuild` gesetzt ist oder kein
+    gültiger Watermark existiert:
     1. Lade aktuelle ErtragHistory
     2. Rekonstruiere aus FroniusDaten
     3. Vergleiche und repariere
-    4. Speichere Backup und Validierungsbericht
+    4. Speichere Backup, Validierungsbericht und Watermark
     """
     print("\n" + "="*60)
     print("ERTRAG-VALIDIERUNG GESTARTET")
     print("="*60)
     
+    if not full_rebuild and _validate_incremental():
+        print("\n" + "="*60)
+        print("ERTRAG-VALIDIERUNG ABGESCHLOSSEN (inkrementell)")
+        print("="*60 + "\n")
+        return True
+    
+    # Watermark vor dem Laden bestimmen: später angehängte Zeilen liegen dahinter
+    watermark = _scan_watermark(FRONIUS_CSV) if os.path.exists(FRONIUS_CSV) else None
     fronius, ertrag_current = load_data()
     
     if fronius.empty:
@@ -155,6 +300,7 @@ def validate_and_repair_ertrag():
     # Schreibe Validierungsbericht
     report = {
         "timestamp": datetime.now().isoformat(),
+        "mode": "full",
         "fronius_entries": len(fronius),
         "fronius_range": {
             "start": fronius["Zeitstempel"].min().isoformat(),
@@ -173,6 +319,9 @@ def validate_and_repair_ertrag():
     
     print(f"✓ Validierungsbericht: {ERTRAG_VALIDATION_LOG}")
     
+    with open(ERTRAG_WATERMARK, "w") as f:
+        json.dump(watermark, f)
+    
     print("\n" + "="*60)
     print("ERTRAG-VALIDIERUNG ABGESCHLOSSEN")
     print("="*60 + "\n")
@@ -181,4 +330,5 @@ def validate_and_repair_ertrag():
 
 
 if __name__ == "__main__":
-    validate_and_repair_ertrag()
+    # --full: kompletten Neuaufbau erzwingen
+    validate_and_repair_ertrag(full_rebuild="--full" in sys.argv)
@@ -0,0 +1,174 @@
+"""
+HTTP-Sitzungen für die Geräte (Wechselrichter, Heizung)
+=======================================================
+Pro Gerät eine `requests.Session` mit genau einer Keep-Alive-Verbindung:
+statt für jeden Messwert (alle 10 s) eine neue TCP-Verbindung aufzubauen,
+wird die bestehende weiterverwendet. Das spart auf dem Pi und auf den
+eingebetteten Webservern der Geräte Handshake und Latenz.
+
+- Timeouts getrennt für Verbindungsaufbau und Antwort
+- Retry (urllib3) nur für Verbindungsaufbau und 502/503/504, nicht nach
+  gesendeter Anfrage - das Zeitbudget des Abrufs bleibt begrenzt
+- nach Fehlern wird die Sitzung verworfen und beim nächsten Abruf neu
+  angelegt; bricht eine wiederverwendete Verbindung ab (Gerät hat sie
+  geschlossen), wird sofort einmal mit frischer Verbindung wiederholt
+- die Sitzung wird für die Dauer eines Abrufs ausgeliehen, der Lock nie
+  über die Anfrage gehalten: ein paralleler Aufrufer (während ein Abruf
+  hängt) wartet nicht, sondern bekommt eine eigene, frische Sitzung
+
+Benchmark gegen einen lokalen Stub-Server: python src/core/httpsession.py
+"""
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Timeout Verbindungsaufbau (s); Antwort-Timeout kommt vom Aufrufer
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 5
+# Wiederholungen bei Verbindungsfehlern / 502, 503, 504
+RETRIES = 2
+RETRY_BACKOFF = 0.2
+
+
+class DeviceSession:
+    """Keep-Alive-Sitzung zu einem Gerät, wird nach Fehlern neu aufgebaut."""
+
+    def __init__(self, name, connect_timeout=CONNECT_TIMEOUT, retries=RETRIES):
+        self.name = name
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self._session = None  # freie Keep-Alive-Sitzung (None = ausgeliehen/keine)
+        self._generation = 0  # reset() verwirft auch ausgeliehene Sitzungen
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "sessions": 0}
+
+    def _create(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=False,  # nach gesendeter Anfrage nicht wiederholen
+            status=self.retries,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        with self._lock:
+            self.stats["sessions"] += 1
+        return session
+
+    def reset(self):
+        """Sitzung schließen; der nächste Abruf baut neu auf."""
+        with self._lock:
+            session, self._session = self._session, None
+            self._generation += 1
+        _close(session)
+
+    def _checkout(self):
+        """Freie Sitzung ausleihen (None = keine frei) und Generation dazu."""
+        with self._lock:
+            self.stats["requests"] += 1
+            session, self._session = self._session, None
+            return session, self._generation
+
+    def _checkin(self, session, generation):
+        """Sitzung zurückgeben; ist schon eine frei oder wurde zurückgesetzt, schließen."""
+        with self._lock:
+            if self._session is None and generation == self._generation:
+                self._session = session
+                return
+        _close(session)
+
+    def get(self, url, timeout=READ_TIMEOUT):
+        """
+        GET über die Keep-Alive-Verbindung (Signatur wie requests.get).
+
+        Args:
+            timeout: Antwort-Timeout in s oder Tupel (connect, read)
+        """
+        if not isinstance(timeout, tuple):
+            timeout = (min(self.connect_timeout, timeout), timeout)
+        session, generation = self._checkout()
+        reused = session is not None
+        if not reused:
+            session = self._create()
+        try:
+            try:
+                response = session.get(url, timeout=timeout)
+            except requests.ConnectionError as e:
+                if not reused or isinstance(e, requests.Timeout):
+                    raise
+                # vom Gerät geschlossene Keep-Alive-Verbindung: einmal neu
+                _close(session)
+                session = self._create()
+                response = session.get(url, timeout=timeout)
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            _close(session)
+            raise
+        self._checkin(session, generation)
+        return response
+
+
+def _close(session):
+    if session is not None:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+if __name__ == "__main__":
+    import statistics
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    POLLS = 300
+    BODY = b'{"Body": {"Data": {"Site": {"P_PV": 1234.0}}}}'
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-Alive wie die Geräte
+        disable_nagle_algorithm = True  # Header und Body getrennt geschrieben
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/solar_api"
+
+    def bench(label, get):
+        get(url, timeout=READ_TIMEOUT).json()  # Aufwärmen
+        samples = []
+        for _ in range(POLLS):
+            t0 = time.perf_counter()
+            get(url, timeout=READ_TIMEOUT).json()
+            samples.append((time.perf_counter() - t0) * 1000)
+        samples.sort()
+        print(
+            f"[HTTP] {label:<22} Ø {statistics.mean(samples):.3f} ms  "
+            f"p50 {samples[len(samples) // 2]:.3f} ms  p95 {samples[int(len(samples) * 0.95)]:.3f} ms"
+        )
+        return statistics.mean(samples)
+
+    before = bench("requests.get (neu)", requests.get)
+    session = DeviceSession("stub")
+    after = bench("DeviceSession (alive)", session.get)
+    print(f"[HTTP] Faktor {before / after:.1f}x, Sitzungen: {session.stats}")
+    server.shutdown()
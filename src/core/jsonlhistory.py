@@ -0,0 +1,134 @@
+"""
+Begrenzte Verlaufsdatei im JSON-Lines-Format
+============================================
+Ersetzt das Muster "ganze JSON-Liste laden, ein Element anhängen, alles
+neu schreiben" (z.B. Pufferspeicher.json alle 10 s):
+
+- append: eine Zeile anhängen, O(1), kein Lesen der Datei
+- tail(k): die letzten k Einträge, von hinten blockweise gelesen, O(k)
+- Kompaktierung: erst wenn die Datei 2 * max_entries Zeilen hat, werden
+  die jüngsten max_entries per temporärer Datei + os.replace behalten.
+  Pro max_entries Anhänge also ein Umschreiben statt eines je Sample.
+
+Eine beim Absturz halb geschriebene letzte Zeile wird beim Lesen
+übersprungen und vor dem ersten Anhängen abgeschnitten.
+"""
+
+import json
+import os
+import threading
+
+# Blockgröße beim Rückwärtslesen (tail)
+TAIL_BLOCK = 8192
+
+
+class JsonlHistory:
+    """Ringpuffer auf Platte: höchstens 2 * max_entries Zeilen, mindestens max_entries lesbar."""
+
+    def __init__(self, path, max_entries=1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lines = None  # Zeilenzahl, beim ersten Anhängen gezählt
+        self._lock = threading.Lock()
+        self.compactions = 0
+
+    def _count_lines(self):
+        try:
+            with open(self.path, "rb") as f:
+                return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 16), b""))
+        except OSError:
+            return 0
+
+    def append(self, entry):
+        """Eintrag (JSON-serialisierbar) anhängen; kompaktiert bei Bedarf."""
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._lines is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._drop_torn_line()
+                self._lines = self._count_lines()
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._lines += 1
+            if self._lines >= 2 * self.max_entries:
+                self._compact()
+
+    def _drop_torn_line(self):
+        """Unvollständige letzte Zeile (Absturz beim Schreiben) abschneiden."""
+        try:
+            f = open(self.path, "r+b")
+        except OSError:
+            return
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(TAIL_BLOCK, pos)
+                f.seek(pos - step)
+                newline = f.read(step).rfind(b"\n")
+                if newline >= 0:
+                    pos = pos - step + newline + 1
+                    break
+                pos -= step
+            if pos != f.seek(0, os.SEEK_END):
+                f.truncate(pos)
+
+    def _compact(self):
+        keep = self._tail_lines(self.max_entries)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.writelines(raw + b"\n" for raw in keep)
+        os.replace(tmp, self.path)
+        self._lines = len(keep)
+        self.compactions += 1
+
+    def _tail_lines(self, k):
+        """Letzte k vollständige Zeilen (bytes, ohne Zeilenende)."""
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return []
+        with f:
+            pos = f.seek(0, os.SEEK_END)
+            blocks = []
+            newlines = 0
+            # k + 1 Zeilenenden: die vorderste Zeile kann angeschnitten sein
+            while pos > 0 and newlines <= k:
+                step = min(TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                block = f.read(step)
+                newlines += block.count(b"\n")
+                blocks.append(block)
+        data = b"".join(reversed(blocks))
+        complete = data.rfind(b"\n") + 1
+        lines = data[:complete].split(b"\n")[:-1]
+        if pos > 0:
+            lines = lines[1:]  # erste Zeile ggf. angeschnitten
+        return [raw for raw in lines if raw.strip()][-k:]
+
+    def tail(self, k):
+        """Die letzten k Einträge, älteste zuerst; kaputte Zeilen ausgelassen."""
+        if k <= 0:
+            return []
+        with self._lock:
+            lines = self._tail_lines(k)
+        entries = []
+        for raw in lines:
+            try:
+                entries.append(json.loads(raw))
+            except ValueError:
+                continue
+        return entries
+
+    def latest(self):
+        """Jüngster Eintrag oder None."""
+        entries = self.tail(1)
+        return entries[-1] if entries else None
+
+
+if __name__ == "__main__":
+    import sys
+
+    for jsonl_path in sys.argv[1:]:
+        history = JsonlHistory(jsonl_path)
+        print(f"[JSONL] {jsonl_path}: {history._count_lines()} Zeilen, letzter Eintrag {history.latest()}")
@@ -0,0 +1,328 @@
+"""
+Zentraler Zeitreihen-Cache für die UI
+=====================================
+Hält die letzten Tage der Fronius- und BMK-Messwerte im Speicher, als
+NumPy-Ringpuffer (Zeitstempel int64, Werte float32). Befüllt wird er beim
+Start aus den CSV-Logs und danach über den Datenbus (`append`, jedes
+Sample der Sammler); `refresh` liest nur die seit dem letzten Aufruf
+angehängten Zeilen und dient als Fallback, wenn keine Samples kommen.
+Alle Views und Tabs fragen per Zeitfenster ab, statt Dateien zu parsen.
+
+Zeitstempel wie in der DataStore: Sekunden der lokalen Wanduhrzeit seit 1970.
+"""
+
+import csv
+import os
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.csvlog import archive_segments, find_offset, read_archive, read_header, read_new_lines
+from core.databus import get_databus
+from core.datastore import (
+    HEATING_COLUMNS,
+    ROLLUP_COLUMNS,
+    _fronius_column_indices,
+    _parse_fronius_rows,
+    _parse_heating_row,
+    from_epoch,
+    hold_segments,
+    to_epoch,
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+# Zeitraum im Speicher (deckt Historie 4 Tage / Analyse 3 Tage ab)
+HISTORY_HOURS = 96
+# Kleinstes erwartetes Messintervall in Sekunden (bestimmt die Puffergröße)
+MIN_SAMPLE_INTERVAL = 5
+
+# Quelle -> (CSV-Datei, Spalten)
+SOURCES = {
+    "fronius": ("FroniusDaten.csv", ROLLUP_COLUMNS["fronius"]),
+    "heating": ("Heizungstemperaturen.csv", HEATING_COLUMNS),
+}
+
+
+def _lower_bound(start):
+    """Fenster-Anfang in Epoch-Sekunden (aufgerundet, damit ts >= start exakt gilt)."""
+    return to_epoch(start) + (1 if start.microsecond else 0)
+
+
+class RingBuffer:
+    """Ringpuffer fester Größe für zeitlich aufsteigende Samples."""
+
+    def __init__(self, capacity, width):
+        self.ts = np.zeros(capacity, dtype=np.int64)
+        self.values = np.full((capacity, width), np.nan, dtype=np.float32)
+        self.capacity = capacity
+        self.count = 0
+        self.head = 0  # nächste Schreibposition
+        self._ordered = None
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+        self.head = 0
+        self._ordered = None
+
+    def last_ts(self):
+        return int(self.ts[self.head - 1]) if self.count else None
+
+    def extend(self, ts, values):
+        """Samples anhängen; nicht aufsteigende Zeitstempel werden verworfen."""
+        ts = np.asarray(ts, dtype=np.int64)
+        if not len(ts):
+            return 0
+        values = np.asarray(values, dtype=np.float32).reshape(len(ts), -1)
+        # nur streng aufsteigend (Duplikate, Uhr-Rücksprünge raus)
+        last = self.last_ts()
+        floor = np.maximum.accumulate(np.concatenate(([-1 if last is None else last], ts[:-1])))
+        keep = ts > floor
+        ts, values = ts[keep], values[keep]
+        if len(ts) > self.capacity:
+            ts, values = ts[-self.capacity:], values[-self.capacity:]
+        n = len(ts)
+        if n == 0:
+            return 0
+        idx = (self.head + np.arange(n)) % self.capacity
+        self.ts[idx] = ts
+        self.values[idx] = values
+        self.head = (self.head + n) % self.capacity
+        self.count = min(self.capacity, self.count + n)
+        self._ordered = None
+        return n
+
+    def ordered(self):
+        """(ts, values) in zeitlicher Reihenfolge; bis zum nächsten extend gecacht."""
+        if self._ordered is None:
+            if self.count < self.capacity:
+                self._ordered = (self.ts[:self.count], self.values[:self.count])
+            else:
+                self._ordered = (
+                    np.concatenate((self.ts[self.head:], self.ts[:self.head])),
+                    np.concatenate((self.values[self.head:], self.values[:self.head])),
+                )
+        return self._ordered
+
+    def window(self, lo=None, hi=None):
+        """Samples mit lo <= ts <= hi (Epoch-Sekunden, None = offen) als Views."""
+        ts, values = self.ordered()
+        i = 0 if lo is None else int(np.searchsorted(ts, lo, side="left"))
+        j = len(ts) if hi is None else int(np.searchsorted(ts, hi, side="right"))
+        return ts[i:j], values[i:j]
+
+
+class TimeSeriesStore:
+    """Prozessweiter Cache der letzten HISTORY_HOURS aus den CSV-Logs."""
+
+    def __init__(self, data_dir=DATA_DIR, history_hours=HISTORY_HOURS):
+        self.data_dir = data_dir
+        self.history = timedelta(hours=history_hours)
+        capacity = history_hours * 3600 // MIN_SAMPLE_INTERVAL
+        self._buffers = {name: RingBuffer(capacity, len(columns)) for name, (_, columns) in SOURCES.items()}
+        self._columns = {name: {c: i for i, c in enumerate(columns)} for name, (_, columns) in SOURCES.items()}
+        # Quelle -> (inode, Offset, Fronius-Spaltenindizes)
+        self._cursor = {}
+        self._lock = threading.Lock()
+
+    def path(self, source):
+        return os.path.join(self.data_dir, SOURCES[source][0])
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """
+        Neue Zeilen aller Logs einlesen (Start und Fallback, wenn der Datenbus
+        nichts liefert, z.B. weil die Sammler in einem anderen Prozess laufen).
+
+        Returns:
+            Anzahl neu übernommener Samples
+        """
+        added = 0
+        with self._lock:
+            for source in SOURCES:
+                try:
+                    added += self._ingest(source)
+                except OSError as e:
+                    print(f"[TS] {source}: Lesefehler {e}")
+        return added
+
+    def _ingest(self, source):
+        path = self.path(source)
+        if not os.path.exists(path):
+            return 0
+        stat = os.stat(path)
+        cursor = self._cursor.get(source)
+        added = 0
+        if cursor is None or cursor[0] != stat.st_ino or stat.st_size < cursor[1]:
+            # Erster Aufruf oder Datei ersetzt/gekürzt/rotiert: Fenster neu laden,
+            # der Anfang liegt nach einem Monatswechsel ggf. im Archiv
+            self._buffers[source].clear()
+            start = datetime.now() - self.history
+            for archive, _ in archive_segments(path, start):
+                names, lines = read_archive(archive, start)
+                added += self._extend_lines(source, lines, _fronius_column_indices(names))
+            with open(path, "rb") as f:
+                indices = _fronius_column_indices(read_header(f))
+            offset = find_offset(path, start)
+            cursor = (stat.st_ino, offset, indices)
+
+        lines, offset = read_new_lines(path, cursor[1])
+        self._cursor[source] = (cursor[0], offset, cursor[2])
+        return added + self._extend_lines(source, lines, cursor[2])
+
+    def _extend_lines(self, source, lines, indices):
+        """CSV-Zeilen parsen und an den Puffer hängen."""
+        if not lines:
+            return 0
+        rows = csv.reader(lines)
+        if source == "fronius":
+            records = list(_parse_fronius_rows(rows, indices))
+        else:
+            records = [r for r in map(_parse_heating_row, rows) if r is not None]
+        if not records:
+            return 0
+        data = np.array(records, dtype=np.float64)
+        return self._buffers[source].extend(data[:, 0].astype(np.int64), data[:, 1:])
+
+    def append(self, sample):
+        """Sample vom Datenbus übernehmen (Sammler-Thread)."""
+        columns = SOURCES[sample.topic][1]
+        row = [np.nan if sample.values.get(c) is None else sample.values[c] for c in columns]
+        with self._lock:
+            self._buffers[sample.topic].extend([to_epoch(sample.time)], [row])
+
+    # ------------------------------------------------------------------
+    # Abfragen
+    # ------------------------------------------------------------------
+    def _column_index(self, source, column):
+        return self._columns[source][column]
+
+    def latest(self, source):
+        """Letztes Sample als Dict {'time': datetime, Spalte: Wert (None bei NaN)}."""
+        with self._lock:
+            ts, values = self._buffers[source].window()
+            if not len(ts):
+                return None
+            return self._as_dict(source, ts[-1], values[-1])
+
+    def last_time(self, source):
+        """Zeitpunkt des letzten Samples oder None."""
+        with self._lock:
+            last = self._buffers[source].last_ts()
+        return from_epoch(last) if last is not None else None
+
+    def find_latest(self, source, predicate, max_samples=200):
+        """Jüngstes der letzten `max_samples` Samples, für das predicate(dict) gilt."""
+        with self._lock:
+            ts, values = self._buffers[source].window()
+            for i in range(len(ts) - 1, max(-1, len(ts) - 1 - max_samples), -1):
+                sample = self._as_dict(source, ts[i], values[i])
+                if predicate(sample):
+                    return sample
+        return None
+
+    def _as_dict(self, source, ts, row):
+        sample = {"time": from_epoch(int(ts))}
+        for column, i in self._columns[source].items():
+            value = float(row[i])
+            sample[column] = None if np.isnan(value) else value
+        return sample
+
+    def window(self, source, columns, start, end=None):
+        """
+        Rohsamples im Zeitfenster.
+
+        Returns:
+            (Zeitstempel als datetime64[s]-Array, Werte float64 (n, len(columns)))
+        """
+        lo = _lower_bound(start) if start is not None else None
+        hi = to_epoch(end) if end is not None else None
+        cols = [self._column_index(source, c) for c in columns]
+        with self._lock:
+            ts, values = self._buffers[source].window(lo, hi)
+            return ts.astype("datetime64[s]"), values[:, cols].astype(np.float64)
+
+    def series(self, source, column, start, end=None):
+        """[(datetime, Wert)] im Zeitfenster, NaN ausgelassen."""
+        times, values = self.window(source, [column], start, end)
+        values = values[:, 0]
+        valid = ~np.isnan(values)
+        return list(zip(times[valid].tolist(), values[valid].tolist()))
+
+    def binned(self, source, column, start, bin_seconds, end=None, hold=None):
+        """
+        Mittelwerte je Zeit-Bin (an Vielfachen von bin_seconds ausgerichtet).
+
+        Args:
+            hold: Halteglied für Deadband-Logs (core.deadband): jedes Sample
+                gilt bis zum nächsten, höchstens `hold` Sekunden (auch ein
+                Wert vor `start`); Mittel zeitgewichtet (Σ Wert·Δt / ΣΔt),
+                Bins ohne Sample übernehmen den gehaltenen Wert.
+                None = Mittel der Samples je Bin, leere Bins auslassen.
+
+        Returns:
+            [(Bin-Start als datetime, Mittelwert)], leere (nicht gehaltene)
+            Bins ausgelassen
+        """
+        lo = _lower_bound(start)
+        hi = to_epoch(end) if end is not None else None
+        col = self._column_index(source, column)
+        with self._lock:
+            ts, values = self._buffers[source].window(lo - hold if hold else lo, hi)
+            values = values[:, col].astype(np.float64)
+        if not len(ts):
+            return []
+
+        if hold:
+            # gehaltene Werte je Bin bis Fensterende (höchstens hold nach dem letzten Sample)
+            idx, seg_start, duration = hold_segments(ts, bin_seconds, hold)
+            limit = hi + 1 if hi is not None else to_epoch(datetime.now())
+            duration = np.minimum(duration, limit - seg_start)
+            keep = (seg_start >= lo - lo % bin_seconds) & (duration > 0) & ~np.isnan(values[idx])
+            bins = seg_start[keep] - seg_start[keep] % bin_seconds
+            weights = duration[keep].astype(np.float64)
+            starts, inverse = np.unique(bins, return_inverse=True)
+            means = np.bincount(inverse, weights=values[idx[keep]] * weights) / np.bincount(inverse, weights=weights)
+        else:
+            valid = ~np.isnan(values)
+            ts, values = ts[valid], values[valid]
+            bins = ts - ts % bin_seconds
+            starts, inverse = np.unique(bins, return_inverse=True)
+            means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+
+        return [(from_epoch(int(b)), float(v)) for b, v in zip(starts, means)]
+
+_shared_series = None
+_shared_lock = threading.Lock()
+
+
+def get_timeseries():
+    """Prozessweiter TimeSeriesStore (aus den CSVs befüllt, danach über den Datenbus)."""
+    global _shared_series
+    with _shared_lock:
+        if _shared_series is None:
+            _shared_series = TimeSeriesStore()
+            _shared_series.refresh()
+            bus = get_databus()
+            for source in SOURCES:
+                bus.listen(source, _shared_series.append)
+        return _shared_series
+
+
+if __name__ == "__main__":
+    import time
+
+    t0 = time.perf_counter()
+    store = get_timeseries()
+    print(f"[TS] Initial geladen in {time.perf_counter() - t0:.3f}s")
+    for name in SOURCES:
+        print(f"[TS] {name}: {len(store._buffers[name])} Samples, letztes {store.last_time(name)}")
+    t0 = time.perf_counter()
+    store.refresh()
+    print(f"[TS] Refresh ohne neue Zeilen: {(time.perf_counter() - t0) * 1000:.2f} ms")
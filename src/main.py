@@ -1,5 +1,4 @@
 import threading
-import queue
 import logging
 import time
 import tkinter as tk
@@ -13,8 +12,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 
 
-from core import BMKDATEN
-from core import Wechselrichter
+from core.collector import CollectorEngine, default_sources
 from ui.app import MainApp
 
 # Force Spotify redirect URI to loopback IP (avoid localhost which Spotify nicht erlaubt)
@@ -85,64 +83,29 @@ for noisy in [
 ]:
     logging.getLogger(noisy).setLevel(logging.WARNING)
 
-shutdown_event = threading.Event()
+# Die Sammler veröffentlichen jeden Messwert selbst auf dem Datenbus
+# (core.databus); die UI abonniert dort und liest im Normalbetrieb keine Dateien.
+# Alle Geräte laufen in einer gemeinsamen asyncio-Loop (core.collector).
+collector = CollectorEngine(default_sources())
 
 
-# Thread-safe queue for data updates
-data_queue = queue.Queue()
-
-def run_wechselrichter():
+def main():
+    # Starte Spotify-Login nach GUI-Start, damit Terminal nicht blockiert
     try:
-        while not shutdown_event.is_set():
-            # Instead of running Wechselrichter.run() directly, get the data and put it in the queue
-            try:
-                Wechselrichter.abrufen_und_speichern()
-                # If you want to pass data to the GUI, you could put it in the queue here
-                # data = ...
-                # data_queue.put(('wechselrichter', data))
-            except Exception as e:
-                logging.error(f"Wechselrichter-Thread Fehler: {e}")
-            time.sleep(10)
+        import spotifylogin
+        threading.Thread(target=spotifylogin.start_oauth, daemon=True).start()
+    except ImportError:
+        print("[MAIN] Could not import spotifylogin")
     except Exception as e:
-        logging.error(f"Wechselrichter-Thread Fehler: {e}")
-
-def run_bmkdaten():
-    try:
-        while not shutdown_event.is_set():
-            try:
-                BMKDATEN.abrufen_und_speichern()
-                # If you want to pass data to the GUI, you could put it in the queue here
-                # data = ...
-                # data_queue.put(('bmkdaten', data))
-            except Exception as e:
-                logging.error(f"BMKDATEN-Thread Fehler: {e}")
-            time.sleep(10)
-    except Exception as e:
-        logging.error(f"BMKDATEN-Thread Fehler: {e}")
-
-
-def main():
-        # Starte Spotify-Login nach GUI-Start, damit Terminal nicht blockiert
-        try:
-            import spotifylogin
-            threading.Thread(target=spotifylogin.start_oauth, daemon=True).start()
-        except ImportError:
-            print("[MAIN] Could not import spotifylogin")
-        except Exception as e:
-            print(f"[MAIN] Error initializing Spotify: {e}")
+        print(f"[MAIN] Error initializing Spotify: {e}")
     print("[STARTUP] 🚀 Starte Smart Home Dashboard...")
     start_time = time.time()
     
-    # Starte Datensammler parallel
-    threads = [
-        threading.Thread(target=run_wechselrichter, daemon=True, name="Wechselrichter"),
-        threading.Thread(target=run_bmkdaten, daemon=True, name="BMKDATEN"),
-    ]
-    
-    print("[STARTUP] 📊 Starte Datensammler (parallel)...")
-    for t in threads:
-        t.start()
-        print(f"[STARTUP]   ✓ {t.name} Thread gestartet")
+    # Starte Datensammler (eine Event-Loop, festes Raster pro Gerät)
+    print("[STARTUP] 📊 Starte Datensammler...")
+    collector.start()
+    for source in collector.sources:
+        print(f"[STARTUP]   ✓ {source.name} alle {source.interval:.0f}s (Timeout {source.timeout:.0f}s)")
     
     # UI starten (geschieht parallel zu Datensammlung)
     print("[STARTUP] 🎨 Initialisiere UI...")
@@ -169,29 +132,11 @@ def main():
 
     def on_close():
         logging.info("Programm wird beendet…")
-        shutdown_event.set()
+        collector.stop()
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_close)
-
-    # Poll the queue for data updates and schedule GUI updates in the main thread
-    def poll_queue():
-        try:
-            while True:
-                item = data_queue.get_nowait()
-                # Example: handle data from threads (extend as needed)
-                # if item[0] == 'wechselrichter':
-                #     app.handle_wechselrichter_data(item[1])
-                # elif item[0] == 'bmkdaten':
-                #     app.handle_bmkdaten_data(item[1])
-        except queue.Empty:
-            pass
-        root.after(500, poll_queue)
-
-    poll_queue()
     root.mainloop()
 
-            # Debug prints and placeholder code removed for production cleanup
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import ttk
-import os
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -16,6 +15,7 @@ from ui.styles import (
     emoji,
 )
 from ui.components.card import Card
+from core.timeseries import get_timeseries
 
 class AnalyseTab:
     """Energie-Effizienz Analyse mit modernem Card-Layout."""
@@ -25,11 +25,6 @@ class AnalyseTab:
         self.notebook = notebook
         self.alive = True
         
-        # Working directory
-        project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        data_root = os.path.join(project_root, "data")
-        self.fronius_csv = os.path.join(data_root, "FroniusDaten.csv")
-        self.heating_csv = os.path.join(data_root, "Heizungstemperaturen.csv")
         
         # Tab Frame
         self.tab_frame = tk.Frame(notebook, bg=COLOR_ROOT)
@@ -63,18 +58,16 @@ class AnalyseTab:
     def stop(self):
         self.alive = False
 
-    def _read_csv_data(self, path: str) -> pd.DataFrame:
-        """Lese CSV Daten."""
-        if not os.path.exists(path):
-            return pd.DataFrame()
+    def _load_frame(self, source: str, columns: dict[str, str], start) -> pd.DataFrame:
+        """Zeitfenster ab `start` aus dem Zeitreihen-Cache; columns: Spalte -> Plot-Name."""
         try:
-            df = pd.read_csv(path)
-            df.columns = df.columns.str.strip()
-            df["Zeitstempel"] = pd.to_datetime(df["Zeitstempel"])
-            return df
+            times, values = get_timeseries().window(source, list(columns), start)
         except Exception as e:
-            print(f"CSV-Fehler {path}: {e}")
+            print(f"Zeitreihen-Fehler {source}: {e}")
             return pd.DataFrame()
+        df = pd.DataFrame(values, columns=list(columns.values()))
+        df.insert(0, "Zeitstempel", times)
+        return df
 
     def _style_axes(self):
         """Styling für Achsen."""
@@ -94,22 +87,10 @@ class AnalyseTab:
         self.ax1.set_facecolor(COLOR_CARD)
         self._style_axes()
         
-        # Load data
-        df_pv = self._read_csv_data(self.fronius_csv)
-        df_heating = self._read_csv_data(self.heating_csv)
-        
-        if df_pv.empty or df_heating.empty:
-            self.ax1.text(0.5, 0.5, "Zu wenig Daten", color=COLOR_SUBTEXT, ha="center", va="center", 
-                         transform=self.ax1.transAxes, fontsize=12)
-            self.canvas.draw()
-            return
-
-        # Filter last 3 days
-        now = pd.Timestamp.now()
-        start_date = now - pd.Timedelta(days=3)
-        
-        df_pv = df_pv[df_pv["Zeitstempel"] >= start_date]
-        df_heating = df_heating[df_heating["Zeitstempel"] >= start_date]
+        # Load data (nur die letzten 3 Tage)
+        start_date = pd.Timestamp.now() - pd.Timedelta(days=3)
+        df_pv = self._load_frame("fronius", {"pv_power": "PV-Leistung (kW)"}, start_date)
+        df_heating = self._load_frame("heating", {"puffer_top": "Pufferspeicher Oben"}, start_date)
         
         if df_pv.empty or df_heating.empty:
             self.ax1.text(0.5, 0.5, "Keine Daten für die letzten 3 Tage", color=COLOR_SUBTEXT, ha="center", 
@@ -130,7 +111,8 @@ class AnalyseTab:
         ax2.set_ylabel("Puffer Oben (°C)", color=COLOR_WARNING, fontsize=10)
         ax2.plot(df_heating["Zeitstempel"], df_heating.get("Pufferspeicher Oben", 
                 df_heating.get("Puffer_Top", df_heating.get("PufferTop", pd.Series([0])))),
-                color=COLOR_WARNING, label="Puffer Oben", linewidth=1.6, linestyle="--")
+                color=COLOR_WARNING, label="Puffer Oben", linewidth=1.6, linestyle="--",
+                drawstyle="steps-post")  # Halteglied, Log nur bei Änderung (core.deadband)
         ax2.tick_params(axis='y', labelcolor=COLOR_WARNING, labelsize=9)
         
         # Styling
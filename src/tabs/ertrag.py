@@ -18,6 +18,11 @@ from ui.styles import (
 )
 from ui.components.card import Card
 
+try:
+    from core.datastore import get_datastore
+except ImportError:
+    get_datastore = None
+
 
 class ErtragTab:
     """PV-Ertrag pro Tag über längeren Zeitraum."""
@@ -64,7 +69,21 @@ class ErtragTab:
             except Exception:
                 pass
 
+    def _load_pv_daily_db(self, days: int):
+        """Tagesenergie aus dem Tages-Rollup der DataStore (leer = CSV-Fallback)."""
+        if get_datastore is None:
+            return []
+        try:
+            buckets = get_datastore().get_rollup("fronius", datetime.now() - timedelta(days=days), resolution=86400)
+        except Exception as e:
+            print(f"[ERTRAG] DataStore nicht verfügbar: {e}")
+            return []
+        return [(b["time"], b["pv_kwh"]) for b in buckets if b["pv_kwh"] > 0]
+
     def _load_pv_daily(self, days: int = 365):
+        out = self._load_pv_daily_db(days)
+        if out:
+            return out
         path = self._data_path("ErtragHistory.csv")
         if not os.path.exists(path):
             return []
@@ -92,12 +111,19 @@ class ErtragTab:
 
     def _load_pv_monthly(self, months: int = 12):
         """Lade und aggregiere PV-Ertrag nach Monaten."""
+        monthly = {}
+        # Bevorzugt: max. 365 Tages-Buckets statt ErtragHistory.csv neu zu summieren
+        for ts, val in self._load_pv_daily_db(months * 30):
+            month_str = ts.strftime("%Y-%m")
+            monthly[month_str] = monthly.get(month_str, 0.0) + val
+        if monthly:
+            return [(datetime.strptime(month_str, "%Y-%m"), total) for month_str, total in sorted(monthly.items())]
+        
         path = self._data_path("ErtragHistory.csv")
         if not os.path.exists(path):
             return []
         
         cutoff = datetime.now() - timedelta(days=months * 30)
-        monthly = {}
         
         try:
             with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
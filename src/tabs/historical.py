@@ -3,6 +3,7 @@ import tkinter as tk
 from tkinter import ttk
 import csv
 from datetime import datetime, timedelta
+import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from matplotlib.ticker import MaxNLocator
@@ -21,6 +22,14 @@ from ui.styles import (
 )
 from ui.components.card import Card
 
+# Zeitreihen-Cache für die letzten Tage; SQLite heating-Tabelle und CSV als Fallback
+from core.timeseries import get_timeseries
+from core.csvlog import find_offset, read_header, read_new_lines, read_range
+try:
+    from core.datastore import get_datastore
+except ImportError:
+    get_datastore = None
+
 
 class HistoricalTab:
     """Historie der Heizung/Puffer/Außen + aktuelle Werte."""
@@ -103,6 +112,12 @@ class HistoricalTab:
         if self._last_temps_cache and (now - self._last_cache_time) < 120:
             return self._last_temps_cache
         
+        rows = self._load_temps_cache(days=4) or self._load_temps_db(days=4)
+        if rows:
+            self._last_temps_cache = rows
+            self._last_cache_time = now
+            return rows
+        
         paths = [
             self._data_path("Heizungstemperaturen.csv"),
         ]
@@ -115,58 +130,82 @@ class HistoricalTab:
             
             print(f"[HISTORIE] Lade: {path}")
             rows = []
-            all_rows = []
             cutoff = datetime.now() - timedelta(days=4)
             try:
-                with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
-                    reader = csv.DictReader(f)
-                    for row in reader:
-                        try:
-                            ts_raw = row.get("Zeit") or row.get("Zeitstempel") or ""
-                            ts = datetime.fromisoformat(ts_raw)
-                            top = self._safe_float(
-                                row.get("Pufferspeicher Oben") or row.get("Puffer_Top") or row.get("PufferTop") or row.get("puffer_top")
-                            )
-                            mid = self._safe_float(
-                                row.get("Pufferspeicher Mitte") or row.get("Puffer_Mitte") or row.get("PufferMid") or row.get("puffer_mid")
-                            )
-                            bot = self._safe_float(
-                                row.get("Pufferspeicher Unten") or row.get("Puffer_Bottom") or row.get("PufferBot") or row.get("puffer_bot")
-                            )
-                            boiler = self._safe_float(
-                                row.get("Kesseltemperatur") or row.get("Boiler") or row.get("Kessel")
-                            )
-                            outside = self._safe_float(
-                                row.get("Außentemperatur") or row.get("Aussentemperatur") or row.get("Außentemp") or row.get("Aussentemp") or row.get("Aussen") or row.get("Außen") or row.get("out_temp")
-                            )
-                            if None in (top, mid, bot, boiler, outside):
-                                continue
-                            all_rows.append((ts, top, mid, bot, boiler, outside))
-                            if ts >= cutoff:
-                                rows.append((ts, top, mid, bot, boiler, outside))
-                        except Exception:
+                # nur das Zeitfenster lesen (aktive Datei bzw. überlappende Archive)
+                with open(path, "rb") as f:
+                    names = read_header(f)
+                lines = read_range(path, cutoff)
+                recent = bool(lines)
+                if not recent:
+                    # nichts Aktuelles: letzte Werte der aktiven Datei (höchstens ein Monat)
+                    lines, _ = read_new_lines(path, find_offset(path, None))
+                for row in csv.DictReader(lines, fieldnames=names):
+                    try:
+                        ts_raw = row.get("Zeit") or row.get("Zeitstempel") or ""
+                        ts = datetime.fromisoformat(ts_raw)
+                        top = self._safe_float(
+                            row.get("Pufferspeicher Oben") or row.get("Puffer_Top") or row.get("PufferTop") or row.get("puffer_top")
+                        )
+                        mid = self._safe_float(
+                            row.get("Pufferspeicher Mitte") or row.get("Puffer_Mitte") or row.get("PufferMid") or row.get("puffer_mid")
+                        )
+                        bot = self._safe_float(
+                            row.get("Pufferspeicher Unten") or row.get("Puffer_Bottom") or row.get("PufferBot") or row.get("puffer_bot")
+                        )
+                        boiler = self._safe_float(
+                            row.get("Kesseltemperatur") or row.get("Boiler") or row.get("Kessel")
+                        )
+                        outside = self._safe_float(
+                            row.get("Außentemperatur") or row.get("Aussentemperatur") or row.get("Außentemp") or row.get("Aussentemp") or row.get("Aussen") or row.get("Außen") or row.get("out_temp")
+                        )
+                        if None in (top, mid, bot, boiler, outside):
                             continue
+                        rows.append((ts, top, mid, bot, boiler, outside))
+                    except Exception:
+                        continue
             except Exception as e:
                 print(f"[HISTORIE] Fehler beim Laden: {e}")
                 continue
             
             rows.sort(key=lambda r: r[0])
+            if not recent:
+                rows = rows[-500:]
             if rows:
                 self._last_temps_cache = rows
                 self._last_cache_time = now
                 return rows
-            
-            all_rows.sort(key=lambda r: r[0])
-            if all_rows:
-                result = all_rows[-500:]
-                self._last_temps_cache = result
-                self._last_cache_time = now
-                return result
         
         self._last_temps_cache = []
         self._last_cache_time = now
         return []
 
+    def _load_temps_cache(self, days: int = 4):
+        """Letzte Tage aus dem Zeitreihen-Cache (leer = DataStore/CSV-Fallback)."""
+        times, values = get_timeseries().window(
+            "heating",
+            ["puffer_top", "puffer_mid", "puffer_bot", "kesseltemp", "außentemp"],
+            datetime.now() - timedelta(days=days),
+        )
+        complete = ~np.isnan(values).any(axis=1)
+        return [(ts, *vals) for ts, vals in zip(times[complete].tolist(), values[complete].tolist())]
+
+    def _load_temps_db(self, days: int = 4):
+        """Indizierte Zeitbereichsabfrage auf die heating-Tabelle (leer = CSV-Fallback)."""
+        if get_datastore is None:
+            return []
+        try:
+            records = get_datastore().get_heating_range(datetime.now() - timedelta(days=days))
+        except Exception as e:
+            print(f"[HISTORIE] DataStore nicht verfügbar: {e}")
+            return []
+        rows = []
+        for ts, boiler, outside, top, mid, bot, _warm in records:
+            if None in (top, mid, bot, boiler, outside):
+                continue
+            rows.append((ts, top, mid, bot, boiler, outside))
+        return rows
+
     @staticmethod
     def _safe_float(value) -> float | None:
         if value is None:
@@ -205,11 +244,13 @@ class HistoricalTab:
             if rows:
                 ts, top, mid, bot, boiler, outside = zip(*rows)
                 # Moderneres Design mit besseren Farben und Liniendicken
-                self.ax.plot(ts, top, color=COLOR_PRIMARY, label="Puffer oben", linewidth=2.0, alpha=0.8)
-                self.ax.plot(ts, mid, color=COLOR_INFO, label="Puffer mitte", linewidth=1.5, alpha=0.7)
-                self.ax.plot(ts, bot, color=COLOR_SUBTEXT, label="Puffer unten", linewidth=1.5, alpha=0.6)
-                self.ax.plot(ts, boiler, color=COLOR_WARNING, label="Boiler", linewidth=2.0, alpha=0.8)
-                self.ax.plot(ts, outside, color=COLOR_DANGER, label="Außen", linewidth=1.8, alpha=0.8, linestyle='--')
+                # Stufen statt Rampen: das Log speichert nur Änderungen (core.deadband)
+                steps = "steps-post"
+                self.ax.plot(ts, top, color=COLOR_PRIMARY, label="Puffer oben", linewidth=2.0, alpha=0.8, drawstyle=steps)
+                self.ax.plot(ts, mid, color=COLOR_INFO, label="Puffer mitte", linewidth=1.5, alpha=0.7, drawstyle=steps)
+                self.ax.plot(ts, bot, color=COLOR_SUBTEXT, label="Puffer unten", linewidth=1.5, alpha=0.6, drawstyle=steps)
+                self.ax.plot(ts, boiler, color=COLOR_WARNING, label="Boiler", linewidth=2.0, alpha=0.8, drawstyle=steps)
+                self.ax.plot(ts, outside, color=COLOR_DANGER, label="Außen", linewidth=1.8, alpha=0.8, linestyle='--', drawstyle=steps)
                 self.ax.set_ylabel("°C", color=COLOR_TEXT, fontsize=10, fontweight='bold')
                 self.ax.tick_params(axis="y", colors=COLOR_TEXT, labelsize=9)
                 self.ax.tick_params(axis="x", colors=COLOR_SUBTEXT, labelsize=8)
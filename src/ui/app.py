@@ -3,7 +3,6 @@ import os
 import platform
 import shutil
 import subprocess
-import csv
 from datetime import datetime, timedelta
 import json
 import logging
@@ -30,10 +29,13 @@ from ui.components.statusbar import StatusBar
 from ui.components.rounded import RoundedFrame
 from ui.views.energy_flow import EnergyFlowView
 from ui.views.buffer_storage import BufferStorageView
+from ui.renderworker import get_renderworker
+from core.databus import get_databus
+from core.timeseries import get_timeseries
 
 # SQLite DataStore for fast queries
 try:
-    from core.datastore import DataStore
+    from core.datastore import get_datastore
     USE_DATASTORE = True
 except ImportError:
     USE_DATASTORE = False
@@ -45,182 +47,28 @@ _PROJECT_ROOT = os.path.dirname(_SRC_DIR)
 _DATA_ROOT = os.path.join(_PROJECT_ROOT, "data")
 
 
+# Ohne Samples vom Datenbus für diese Zeit (s) liest der UI-Loop die CSV-Logs selbst
+BUS_STALE_SECONDS = 30
+
+# Energiefluss mit laufenden Strichen (DASH_ANIMATION=1), Ziel-fps per DASH_ANIMATION_FPS
+ENERGY_ANIMATION = os.getenv("DASH_ANIMATION", "0") == "1"
+ENERGY_ANIMATION_FPS = float(os.getenv("DASH_ANIMATION_FPS", "20"))
+
+
 def _data_path(filename: str) -> str:
     return os.path.join(_DATA_ROOT, filename)
 
 
-def _read_lines_safe(path: str) -> list[str]:
-    try:
-        with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
-            return f.readlines()
-    except Exception:
-        return []
-
-
-def _read_tail_lines(path: str, max_bytes: int = 262144, max_lines: int = 2000) -> list[str]:
-    try:
-        with open(path, "rb") as f:
-            f.seek(0, os.SEEK_END)
-            size = f.tell()
-            f.seek(max(0, size - max_bytes))
-            chunk = f.read().decode("utf-8-sig", errors="replace")
-        lines = chunk.splitlines()
-    except Exception:
-        lines = _read_lines_safe(path)
-
-    if max_lines and len(lines) > max_lines:
-        return lines[-max_lines:]
-    return lines
-
-
-def _read_last_data_line(path: str, max_bytes: int = 65536) -> str | None:
-    try:
-        with open(path, "rb") as f:
-            f.seek(0, os.SEEK_END)
-            size = f.tell()
-            f.seek(max(0, size - max_bytes))
-            chunk = f.read().decode("utf-8-sig", errors="replace")
-        lines = chunk.splitlines()
-    except Exception:
-        lines = _read_lines_safe(path)
-
-    for line in reversed(lines):
-        line = line.strip()
-        if not line:
-            continue
-        if line.lower().startswith("zeit"):
-            continue
-        return line
-    return None
-
-
-def _normalize_header(name: str) -> str:
-    return (
-        name.strip()
-        .lower()
-        .replace("ä", "ae")
-        .replace("ö", "oe")
-        .replace("ü", "ue")
-        .replace("ß", "ss")
-        .replace(" ", "")
-        .replace("_", "")
-    )
-
-
-def _read_csv_header(path: str) -> list[str]:
-    try:
-        with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                return next(csv.reader([line]))
-    except Exception:
-        return []
-    return []
-
-
-def _read_last_row_dict(path: str) -> dict[str, str]:
-    header = _read_csv_header(path)
-    if not header:
-        return {}
-    last_line = _read_last_data_line(path)
-    if not last_line:
-        return {}
-    try:
-        row = next(csv.reader([last_line]))
-    except Exception:
-        return {}
-    if len(row) < len(header):
-        row += [""] * (len(header) - len(row))
-    return dict(zip(header, row))
-
-
-def _get_row_value(row_dict: dict[str, str], *keys: str) -> str | None:
-    if not row_dict:
-        return None
-    norm_map = {_normalize_header(k): k for k in row_dict.keys()}
-    for key in keys:
-        norm = _normalize_header(key)
-        if norm in norm_map:
-            return row_dict.get(norm_map[norm])
-    return None
-
-
-def _safe_float(value: str | None) -> float | None:
-    if value is None:
-        return None
-    try:
-        return float(value)
-    except Exception:
-        return None
-
-
-def _parse_bmk_row(row: list[str]) -> dict[str, str]:
-    """Parse a BMK CSV row that contains the full PP data (Betriebsmodus as col 1)."""
-    if not row or len(row) < 10:
-        return {}
-    if _safe_float(row[1]) is not None:
-        return {}
-    values = row[1:]
-    return {
-        "Betriebsmodus": values[0] if len(values) > 0 else "",
-        "Kesseltemperatur": values[2] if len(values) > 2 else "",
-        "Außentemperatur": values[3] if len(values) > 3 else "",
-        "Pufferspeicher Oben": values[5] if len(values) > 5 else "",
-        "Pufferspeicher Mitte": values[6] if len(values) > 6 else "",
-        "Pufferspeicher Unten": values[7] if len(values) > 7 else "",
-        "Warmwasser": values[13] if len(values) > 13 else "",
-    }
-
-
-def _parse_short_bmk_row(row: list[str]) -> dict[str, str]:
-    """Parse a short 7-column BMK row (no Betriebsmodus)."""
-    if not row or len(row) < 7:
-        return {}
-    return {
-        "Kesseltemperatur": row[1],
-        "Außentemperatur": row[2],
-        "Pufferspeicher Oben": row[3],
-        "Pufferspeicher Mitte": row[4],
-        "Pufferspeicher Unten": row[5],
-        "Warmwasser": row[6],
-    }
-
-
-def _is_plausible_bmk(values: dict[str, str]) -> bool:
-    out_temp = _safe_float(values.get("Außentemperatur"))
-    p_top = _safe_float(values.get("Pufferspeicher Oben"))
-    p_mid = _safe_float(values.get("Pufferspeicher Mitte"))
-    p_bot = _safe_float(values.get("Pufferspeicher Unten"))
-    warm = _safe_float(values.get("Warmwasser"))
-
+def _is_plausible_bmk(sample: dict) -> bool:
+    """BMK-Sample aus dem Zeitreihen-Cache mit plausiblen Temperaturen?"""
+    out_temp = sample.get("außentemp")
     if out_temp is None or not (-40 <= out_temp <= 50):
         return False
-    for v in [p_top, p_mid, p_bot, warm]:
+    for key in ("puffer_top", "puffer_mid", "puffer_bot", "warmwasser"):
+        v = sample.get(key)
         if v is None or not (10 <= v <= 95):
             return False
     return True
-
-
-def _get_last_valid_bmk_values(path: str, max_lines: int = 200) -> dict[str, str]:
-    lines = _read_lines_safe(path)
-    if not lines:
-        return {}
-    for line in reversed(lines[-max_lines:]):
-        line = line.strip()
-        if not line or line.lower().startswith("zeit"):
-            continue
-        try:
-            row = next(csv.reader([line]))
-        except Exception:
-            continue
-        parsed = _parse_bmk_row(row)
-        if not parsed:
-            parsed = _parse_short_bmk_row(row)
-        if parsed and _is_plausible_bmk(parsed):
-            return parsed
-    return {}
 try:
     from tabs.historical import HistoricalTab
 except ImportError:
@@ -277,6 +125,9 @@ class MainApp:
         self.root = root
         self.root.title("Smart Home Dashboard")
         
+        # Zeitreihen-Cache: einziger Leser der CSV-Logs, alle Views fragen hier ab
+        self.timeseries = get_timeseries()
+
         # Initialize DataStore with parallel import
         self.datastore = None
         if USE_DATASTORE:
@@ -361,6 +212,8 @@ class MainApp:
         # LAYOUT FIX: Start with minimal size, will resize after layout settles
         self.energy_view = EnergyFlowView(self.energy_card.content(), width=240, height=200)
         self.energy_view.pack(fill=tk.BOTH, expand=True, pady=2)
+        if ENERGY_ANIMATION:
+            self.energy_view.set_animated(True, fps=ENERGY_ANIMATION_FPS)
 
         # Buffer Card (30%) - reduced size and padding
         self.buffer_card = Card(self.body, padding=6)
@@ -396,11 +249,7 @@ class MainApp:
                 print(f"[LAYOUT] Final widget sizes - Energy: {energy_w}x{energy_h}, Buffer: {buffer_h}")
             
             # Force views to initialize with these final sizes
-            self.energy_view.width = energy_w
-            self.energy_view.height = energy_h
-            self.energy_view.nodes = self.energy_view._define_nodes()
-            self.energy_view._base_img = self.energy_view._render_background()
-            self.energy_view.canvas.config(width=energy_w, height=energy_h)
+            self.energy_view.resize(energy_w, energy_h)
             
             self.buffer_view.height = buffer_h
             self.buffer_view.configure(height=buffer_h)
@@ -421,6 +270,30 @@ class MainApp:
         self.notebook.add(self.pv_status_tab, text=emoji("🔆 PV Status", "PV Status"))
         self._init_pv_status_tab()
 
+        # State (einmalig; _loop plant sich selbst neu)
+        self._tick = 0
+        self._last_data = {
+            "pv": 0,
+            "load": 0,
+            "grid": 0,
+            "batt": 0,
+            "soc": 0,
+            "out_temp": 0,
+            "puffer_top": 0,
+            "puffer_mid": 0,
+            "puffer_bot": 0,
+        }
+        self._last_fresh_update = 0
+
+        # Datenbus: Sammler-Threads -> Tk-Hauptthread (after_idle, neuester Wert je Topic)
+        self.databus = get_databus()
+        self.databus.attach(self.root)
+        self.databus.subscribe("fronius", self._on_fronius_sample)
+        self.databus.subscribe("heating", self._on_heating_sample)
+        # Render-Worker: PIL-Rasterung der Widgets außerhalb des Tk-Hauptthreads
+        get_renderworker().attach(self.root)
+        self._loop()
+
         # Add other tabs
         self._add_other_tabs()
 
@@ -449,51 +322,26 @@ class MainApp:
         self._update_pv_status_tab()
 
     def _update_pv_status_tab(self):
-        fronius_csv = _data_path("FroniusDaten.csv")
-        if os.path.exists(fronius_csv):
-            try:
-                last_line = _read_last_data_line(fronius_csv)
-                if last_line:
-                    row = next(csv.reader([last_line]))
-                    self.pv_status_pv.set(f"{row[1]} kW" if len(row) > 1 else "-- kW")
-                    self.pv_status_batt.set(f"{row[5]} %" if len(row) > 5 else "-- %")
-                    self.pv_status_grid.set(f"{row[2]} kW" if len(row) > 2 else "-- kW")
-                    try:
-                        pv = float(row[1]) if len(row) > 1 else None
-                        batt = float(row[5]) if len(row) > 5 else None
-                        grid = float(row[2]) if len(row) > 2 else None
-                        if pv is not None and pv < 0.2:
-                            rec = "Wenig PV – Netzbezug möglich."
-                        elif batt is not None and batt < 20:
-                            rec = "Batterie fast leer."
-                        elif grid is not None and grid > 0.5:
-                            rec = "Hoher Netzbezug."
-                        else:
-                            rec = "Alles ok."
-                    except:
-                        rec = "--"
-                    self.pv_status_recommend.set(rec)
-                    self.pv_status_time.set(str(row[0]) if len(row) > 0 else "--")
-            except Exception:
-                pass
+        sample = self.timeseries.latest("fronius")
+        if sample:
+            pv = sample["pv_power"]
+            batt = sample["soc"]
+            grid = sample["grid_power"]
+            self.pv_status_pv.set(f"{pv:.2f} kW" if pv is not None else "-- kW")
+            self.pv_status_batt.set(f"{batt:.0f} %" if batt is not None else "-- %")
+            self.pv_status_grid.set(f"{grid:.2f} kW" if grid is not None else "-- kW")
+            if pv is not None and pv < 0.2:
+                rec = "Wenig PV – Netzbezug möglich."
+            elif batt is not None and batt < 20:
+                rec = "Batterie fast leer."
+            elif grid is not None and grid > 0.5:
+                rec = "Hoher Netzbezug."
+            else:
+                rec = "Alles ok."
+            self.pv_status_recommend.set(rec)
+            self.pv_status_time.set(sample["time"].strftime("%Y-%m-%d %H:%M:%S"))
         self.root.after(30000, self._update_pv_status_tab)  # Pi 5: Update every 30s
 
-        # State
-        self._tick = 0
-        self._last_data = {
-            "pv": 0,
-            "load": 0,
-            "grid": 0,
-            "batt": 0,
-            "soc": 0,
-            "out_temp": 0,
-            "puffer_top": 0,
-            "puffer_mid": 0,
-            "puffer_bot": 0,
-        }
-        self._last_fresh_update = 0
-        self._loop()
-
     def _add_other_tabs(self):
         """Integriert den SpotifyTab (modern, mit OAuth) sowie Tado, Hue, System und Calendar Tabs."""
         if SpotifyTab:
@@ -586,31 +434,41 @@ class MainApp:
         self.root.after(100, self.root.quit)
     
     def _init_datastore_async(self):
-        """Initialisiere DataStore und importiere CSVs parallel im Hintergrund."""
+        """Initialisiere DataStore und halte ihn per Tail-Import aktuell (Hintergrund)."""
         def worker():
             try:
                 start = time.time()
-                self.datastore = DataStore()
+                self.datastore = get_datastore()
                 
                 # Check if import needed
                 cursor = self.datastore.conn.cursor()
                 cursor.execute("SELECT COUNT(*) FROM fronius")
                 count = cursor.fetchone()[0]
                 
-                if count == 0:
+                fronius_path = _data_path("FroniusDaten.csv")
+                if not os.path.exists(fronius_path):
+                    print(f"[DB] ⚠️ {fronius_path} nicht gefunden")
+                elif count == 0:
                     print("[DB] 📊 Importiere FroniusDaten.csv parallel...")
-                    fronius_path = _data_path("FroniusDaten.csv")
-                    if os.path.exists(fronius_path):
-                        self.datastore.import_fronius_csv(fronius_path)
-                        elapsed = time.time() - start
-                        print(f"[DB] ✅ Import abgeschlossen in {elapsed:.1f}s")
-                    else:
-                        print(f"[DB] ⚠️ {fronius_path} nicht gefunden")
-                else:
-                    print(f"[DB] ✅ DataStore bereit ({count} records)")
+                
+                # Erster Sync importiert bei leerer DB alles, danach nur neue Zeilen
+                imported = self.datastore.sync_fronius_csv(fronius_path)
+                # Einmaliger Backfill der Heizungshistorie (danach schreibt BMKDATEN direkt)
+                self.datastore.backfill_heating_csv(_data_path("Heizungstemperaturen.csv"))
+                elapsed = time.time() - start
+                print(f"[DB] ✅ DataStore bereit ({count + imported} records, {imported} neu in {elapsed:.1f}s)")
             except Exception as e:
                 print(f"[DB] ❌ Initialisierung fehlgeschlagen: {e}")
                 self.datastore = None
+                return
+            
+            # Danach im Takt des Wechselrichter-Threads nachziehen (O(neue Zeilen))
+            while self.datastore:
+                time.sleep(10)
+                try:
+                    self.datastore.sync_fronius_csv(fronius_path)
+                except Exception as e:
+                    logging.debug(f"DataStore Sync Fehler: {e}")
         
         # Start in background thread
         threading.Thread(target=worker, daemon=True).start()
@@ -854,11 +712,15 @@ class MainApp:
     def _loop(self):
         self._tick += 1
 
-        # Versuche echte Daten zu laden
-        try:
-            self._fetch_real_data()
-        except Exception as e:
-            logging.debug(f"Fehler beim Abrufen echter Daten: {e}")
+        # Messwerte kommen über den Datenbus; nur wenn der schweigt (Start,
+        # Sammler in eigenem Prozess) die neuen CSV-Zeilen selbst einlesen
+        idle = self.databus.seconds_since_publish()
+        if idle is None or idle > BUS_STALE_SECONDS:
+            self.timeseries.refresh()
+            try:
+                self._fetch_real_data()
+            except Exception as e:
+                logging.debug(f"Fehler beim Abrufen echter Daten: {e}")
 
         # Header every 3s
         now = datetime.now()
@@ -919,177 +781,92 @@ class MainApp:
         # Sparkline moved into right card; keep footer minimal
 
     def _get_last_timestamp(self) -> datetime | None:
-        def _last_csv_ts(path: str) -> datetime | None:
-            if not os.path.exists(path):
-                return None
-            lines = _read_tail_lines(path, max_bytes=131072, max_lines=800)
-            if len(lines) < 2:
-                return None
-            for line in reversed(lines):
-                line = line.strip()
-                if not line or line.lower().startswith("zeit"):
-                    continue
-                try:
-                    row = next(csv.reader([line]))
-                    ts = datetime.fromisoformat(row[0])
-                    return ts
-                except Exception:
-                    continue
-            return None
-
-        fronius = _last_csv_ts(_data_path("FroniusDaten.csv"))
-        heating = _last_csv_ts(_data_path("Heizungstemperaturen.csv"))
-        ts_candidates = [t for t in [fronius, heating] if t]
+        ts_candidates = [t for t in (self.timeseries.last_time("fronius"), self.timeseries.last_time("heating")) if t]
         if not ts_candidates:
             return None
         return max(ts_candidates)
 
     def _load_pv_sparkline(self, minutes: int = 60) -> list[float]:
-        path = _data_path("FroniusDaten.csv")
-        if not os.path.exists(path):
-            return []
         cutoff = datetime.now() - timedelta(minutes=minutes)
-        lines = _read_tail_lines(path, max_bytes=196608, max_lines=800)
-        if len(lines) < 2:
-            return []
-        # Use recent lines only for speed
-        recent_lines = lines[-400:]
-        values = []
-        for line in recent_lines:
-            line = line.strip()
-            if not line or line.lower().startswith("zeit"):
-                continue
-            try:
-                row = next(csv.reader([line]))
-                ts = datetime.fromisoformat(row[0])
-                if ts < cutoff:
-                    continue
-                pv_kw = float(row[1])
-                values.append(pv_kw)
-            except Exception:
-                continue
-        return values
-
-    def _fetch_real_data(self):
-        """Versucht, echte Daten aus CSV/APIs zu laden - mit SQLite Fallback."""
-        import csv
-
-        fronius_csv = _data_path("FroniusDaten.csv")
-        bmk_csv = _data_path("Heizungstemperaturen.csv")
+        return [pv_kw for _, pv_kw in self.timeseries.series("fronius", "pv_power", cutoff)]
+
+    def _on_fronius_sample(self, sample):
+        """Datenbus (Tk-Thread): neuester Fronius-Messwert, sofort anzeigen."""
+        if self._apply_fronius(sample.values):
+            self.energy_view.update_flows(
+                self._last_data["pv"],
+                self._last_data["load"],
+                self._last_data["grid"],
+                self._last_data["batt"],
+                self._last_data["soc"],
+            )
+            self.status.update_center(f"SOC {self._last_data['soc']:.0f}%")
+
+    def _on_heating_sample(self, sample):
+        """Datenbus (Tk-Thread): neuester BMK-Messwert (Anzeige beim nächsten Tick)."""
+        if _is_plausible_bmk(sample.values):
+            self._apply_heating(sample.values)
+
+    def _apply_fronius(self, values: dict) -> bool:
+        """Fronius-Werte (kW, Betrag wie in der CSV) in _last_data übernehmen."""
+        pv_kw = values.get("pv_power")
+        grid_kw = values.get("grid_power")
+        batt_kw = values.get("batt_power")
+        load_kw = values.get("load_power")
+        if None in (pv_kw, grid_kw, batt_kw, load_kw):
+            return False
 
-        # Hole letzte CSV-Zeile vorab, um sie bei Bedarf (oder wenn frischer als DB) zu nutzen
-        csv_row = None
-        csv_ts = None
-        if os.path.exists(fronius_csv):
-            try:
-                last_line = _read_last_data_line(fronius_csv)
-                if last_line:
-                    csv_row = next(csv.reader([last_line]))
-                    csv_ts = datetime.fromisoformat(csv_row[0]) if csv_row else None
-            except Exception:
-                csv_row = None
-                csv_ts = None
+        # Derive grid sign from power balance
+        netz_calc_kw = pv_kw + batt_kw - load_kw
+        if abs(grid_kw) > 1e-4:
+            grid_kw = abs(grid_kw) * (1 if netz_calc_kw <= 0 else -1)
+        else:
+            grid_kw = netz_calc_kw
+
+        self._last_data["pv"] = pv_kw * 1000  # kW -> W
+        self._last_data["grid"] = grid_kw * 1000
+        self._last_data["batt"] = -batt_kw * 1000  # Invert: negativ = laden, positiv = entladen
+        self._last_data["load"] = load_kw * 1000
+        if values.get("soc") is not None:
+            self._last_data["soc"] = values["soc"]
+        return True
+
+    def _apply_heating(self, values: dict):
+        self._last_data["out_temp"] = values["außentemp"]
+        self._last_data["puffer_top"] = values["puffer_top"]
+        self._last_data["puffer_mid"] = values["puffer_mid"]
+        self._last_data["puffer_bot"] = values["puffer_bot"]
+        self._last_data["warmwasser"] = values["warmwasser"]
 
-        # Fronius Daten - bevorzuge DataStore wenn verfügbar
-        if self.datastore:
+    def _fetch_real_data(self):
+        """Aktuelle Werte aus dem Zeitreihen-Cache - SQLite nur wenn keine CSV-Daten."""
+        sample = self.timeseries.latest("fronius")
+        if sample:
+            self._apply_fronius(sample)
+        elif self.datastore:
             try:
                 record = self.datastore.get_last_fronius_record()
                 if record:
-                    record_ts = None
-                    try:
-                        record_ts = datetime.fromisoformat(record['timestamp'])
-                    except Exception:
-                        record_ts = None
-
-                    # Wenn CSV frischer ist als DB-Record, nimm CSV statt stale DB-Wert
-                    if csv_ts and record_ts and record_ts < csv_ts:
-                        record = None  # erzwinge CSV unten
-                    else:
-                        pv_kw = record['pv']
-                        grid_kw = record['grid']
-                        batt_kw = record['batt']
-                        soc = record['soc']
-
-                        # Calculate load from balance
-                        load_kw = pv_kw + batt_kw - grid_kw
-
-                        self._last_data["pv"] = pv_kw * 1000  # kW -> W
-                        self._last_data["grid"] = grid_kw * 1000
-                        self._last_data["batt"] = -batt_kw * 1000
-                        self._last_data["load"] = load_kw * 1000
-                        self._last_data["soc"] = soc
-
-                        # Skip CSV fallback if DataStore worked
-                        bmk_csv_exists = True
-            except Exception as e:
-                logging.debug(f"DataStore Fronius Fehler: {e} - Fallback zu CSV")
-                self.datastore = None  # Deactivate on error
-        
-        # CSV Fallback (nur wenn DataStore nicht funktioniert)
-        if (not self.datastore or csv_row) and os.path.exists(fronius_csv):
-            try:
-                row = csv_row
-                if not row:
-                    last_line = _read_last_data_line(fronius_csv)
-                    row = next(csv.reader([last_line])) if last_line else None
-                if row and len(row) >= 6:
-                    pv_kw = float(row[1])
-                    grid_kw = float(row[2])
-                    batt_kw = float(row[3])
-                    load_kw = float(row[4])
-
-                    # Derive grid sign from power balance
-                    netz_calc_kw = pv_kw + batt_kw - load_kw
-                    if abs(grid_kw) > 1e-4:
-                        grid_kw = abs(grid_kw) * (1 if netz_calc_kw <= 0 else -1)
-                    else:
-                        grid_kw = netz_calc_kw
+                    pv_kw = record['pv']
+                    grid_kw = record['grid']
+                    batt_kw = record['batt']
+
+                    # Calculate load from balance
+                    load_kw = pv_kw + batt_kw - grid_kw
 
                     self._last_data["pv"] = pv_kw * 1000  # kW -> W
                     self._last_data["grid"] = grid_kw * 1000
-                    self._last_data["batt"] = -batt_kw * 1000  # Invert: negativ = laden, positiv = entladen
+                    self._last_data["batt"] = -batt_kw * 1000
                     self._last_data["load"] = load_kw * 1000
-                    self._last_data["soc"] = float(row[5])
+                    self._last_data["soc"] = record['soc']
             except Exception as e:
-                logging.debug(f"Fronius CSV Fehler: {e}")
+                logging.debug(f"DataStore Fronius Fehler: {e}")
+                self.datastore = None  # Deactivate on error
 
-        # BMK Daten (letzter Eintrag)
-        if os.path.exists(bmk_csv):
-            try:
-                row_dict = _read_last_row_dict(bmk_csv)
-                last_line = _read_last_data_line(bmk_csv)
-                row = next(csv.reader([last_line])) if last_line else []
-                parsed = _get_last_valid_bmk_values(bmk_csv) or _parse_bmk_row(row) or _parse_short_bmk_row(row)
-
-                out_val = _safe_float(parsed.get("Außentemperatur")) if parsed else None
-                top_val = _safe_float(parsed.get("Pufferspeicher Oben")) if parsed else None
-                mid_val = _safe_float(parsed.get("Pufferspeicher Mitte")) if parsed else None
-                bot_val = _safe_float(parsed.get("Pufferspeicher Unten")) if parsed else None
-                warm_val = _safe_float(parsed.get("Warmwasser")) if parsed else None
-
-                if out_val is None and row_dict:
-                    out_val = _safe_float(_get_row_value(row_dict, "Außentemperatur", "Aussentemperatur", "OutdoorTemp", "OutTemp"))
-                if top_val is None and row_dict:
-                    top_val = _safe_float(_get_row_value(row_dict, "Pufferspeicher Oben", "Puffer_Oben", "Puffer Oben"))
-                if mid_val is None and row_dict:
-                    mid_val = _safe_float(_get_row_value(row_dict, "Pufferspeicher Mitte", "Puffer_Mitte", "Puffer Mitte"))
-                if bot_val is None and row_dict:
-                    bot_val = _safe_float(_get_row_value(row_dict, "Pufferspeicher Unten", "Puffer_Unten", "Puffer Unten"))
-                if warm_val is None and row_dict:
-                    warm_val = _safe_float(_get_row_value(row_dict, "Warmwasser", "Warmwassertemperatur"))
-
-                if out_val is not None:
-                    self._last_data["out_temp"] = out_val
-                if top_val is not None:
-                    self._last_data["puffer_top"] = top_val
-                if mid_val is not None:
-                    self._last_data["puffer_mid"] = mid_val
-                if bot_val is not None:
-                    self._last_data["puffer_bot"] = bot_val
-                if warm_val is not None:
-                    self._last_data["warmwasser"] = warm_val
-            except Exception as e:
-                logging.debug(f"BMK CSV Fehler: {e}")
+        # BMK Daten (letzter plausibler Eintrag)
+        heating = self.timeseries.find_latest("heating", _is_plausible_bmk)
+        if heating:
+            self._apply_heating(heating)
 
 
 def run():
@@ -19,6 +19,7 @@ matplotlib.use('Agg')  # Für Embedding
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.cm as cm
+from ui.renderworker import get_renderworker
 
 # --- GLASMORPHISM FARBEN ---
 COLOR_DARK_BG = "#0a0e1a"
@@ -210,7 +211,15 @@ class ModernBoilerWidget:
         self._update_gradient(0, 0, 0)
     
     def _update_gradient(self, temp_top, temp_mid, temp_bot):
-        """Erstellt gradient image mit Temperaturen"""
+        """Gradient zu den Temperaturen; gerendert im Render-Worker, hier nur der Bildtausch"""
+        get_renderworker().submit(
+            self.gradient_label,
+            lambda: self._render_gradient(temp_top, temp_mid, temp_bot),
+            self._show_gradient,
+        )
+
+    def _render_gradient(self, temp_top, temp_mid, temp_bot):
+        """Erstellt gradient image mit Temperaturen (ohne Tk-Aufrufe)"""
         
         # Größe
         w, h = 180, 200
@@ -262,8 +271,9 @@ class ModernBoilerWidget:
                   fill='white', anchor='mm', font=None)
         
         # Blur für smooth look
-        img = img.filter(ImageFilter.GaussianBlur(radius=2))
-        
+        return img.filter(ImageFilter.GaussianBlur(radius=2))
+
+    def _show_gradient(self, img):
         # Zu TkImage
         self.tk_img = ImageTk.PhotoImage(img)
         self.gradient_label.configure(image=self.tk_img)
@@ -9,6 +9,7 @@ from tkinter import Canvas
 from PIL import Image, ImageDraw, ImageFont
 import io
 import os
+from ui.renderworker import get_renderworker
 
 # Glasmorphism Farbpalette (dunkel & transparent)
 COLOR_GLASS_BG = "#1a1f2e"     # Transparente Glass Cards
@@ -123,7 +124,11 @@ class EnergyFlowWidgetV2:
         return img.resize(size)
     
     def _draw(self):
-        """Zeichnet Glasmorphism Energiefluss-Visualisierung"""
+        """Zeichnet Glasmorphism Energiefluss-Visualisierung (Render-Worker, hier nur der Bildtausch)"""
+        get_renderworker().submit(self.canvas, self._render, self._show)
+
+    def _render(self):
+        """PIL-Bild zu den aktuellen Werten als PPM-Daten (ohne Tk-Aufrufe)"""
         # PIL Image erstellen mit dunklem Hintergrund
         img = Image.new('RGBA', (self.width, self.height), color=(10, 14, 26, 255))
         draw = ImageDraw.Draw(img)
@@ -183,9 +188,11 @@ class EnergyFlowWidgetV2:
         elif self.battery_power < -10:  # Laden
             self._draw_glow_arrow(draw, 350, 240, 350, 290, COLOR_WARNING, 3)
         
+        return self._pil_to_ppm(img.convert('RGB'))
+
+    def _show(self, ppm):
         # Speichern als PhotoImage
-        img_rgb = img.convert('RGB')
-        self.photo_image = tk.PhotoImage(data=self._pil_to_ppm(img_rgb))
+        self.photo_image = tk.PhotoImage(data=ppm)
         self.canvas.delete("all")
         self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo_image)
     
@@ -0,0 +1,234 @@
+"""
+Bildtakt für Tk-Animationen
+===========================
+Ruft eine Zeichenfunktion im Tk-Hauptthread mit Zielrate auf (`after`)
+und passt sich an, wenn Zeichnen oder Tk-Loop nicht mithalten:
+
+- festes Raster: Frame k ist bei t0 + k / fps fällig; hängt die Loop,
+  werden verpasste Frames ausgelassen statt nachgeholt
+- je Frame Zeichendauer und Verzug (Frame später als fällig) gemessen,
+  gleitender Mittelwert über etwa eine Sekunde
+- zu teuer oder zu spät: erst Qualitätsstufe senken, dann fps halbieren
+  (bis min_fps); läuft es RECOVER_SECONDS ruhig, Schritt für Schritt
+  zurück (erst fps, dann Qualität)
+- Widget nicht sichtbar (anderer Tab, minimiert): keine Frames, nur eine
+  Sichtbarkeitsprüfung alle PAUSE_POLL_MS
+
+Beispiel:
+
+    scheduler = FrameScheduler(canvas, draw, fps=20, levels=3)
+    scheduler.start()   # draw(now, quality) je Frame, quality 0..levels-1
+"""
+
+import time
+import tkinter as tk
+
+# Sichtbarkeitsprüfung während der Pause (ms)
+PAUSE_POLL_MS = 500
+# Drosseln ab diesem Anteil am Frameabstand (Zeichendauer bzw. Verzug)
+BUSY_HIGH = 0.5
+LATE_HIGH = 0.5
+# Als ruhig gilt: Zeichendauer und Verzug unter diesen Anteilen
+BUSY_LOW = 0.2
+LATE_LOW = 0.1
+# Ruhige Zeit (s), bevor eine Drosselung zurückgenommen wird
+RECOVER_SECONDS = 5.0
+# Nach jeder Änderung erst so lange (s) messen
+SETTLE_SECONDS = 1.0
+
+
+class FrameStats:
+    """Kennzahlen der gezeichneten Frames."""
+
+    def __init__(self):
+        self.frames = 0
+        self.skipped = 0  # ausgelassene Frames (Loop zu spät)
+        self.throttles = 0  # Drosselungen (Qualität oder fps)
+        self.last_cost = None
+        self.max_cost = 0.0
+        self.total_cost = 0.0
+        self.max_lag = 0.0
+        self.avg_cost = 0.0  # gleitend (~1 s)
+        self.avg_lag = 0.0
+
+    def as_dict(self):
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "throttles": self.throttles,
+            "last_cost": self.last_cost,
+            "mean_cost": self.total_cost / self.frames if self.frames else None,
+            "max_cost": self.max_cost,
+            "avg_cost": self.avg_cost,
+            "avg_lag": self.avg_lag,
+            "max_lag": self.max_lag,
+        }
+
+
+class FrameScheduler:
+    """Zielrate mit Messung und Drosselung; alle Aufrufe im Tk-Hauptthread."""
+
+    def __init__(self, widget, draw, fps=20, min_fps=5, levels=3, log_prefix="[ANIM]", summary_interval=None):
+        """
+        Args:
+            widget: Tk-Widget für after() und die Sichtbarkeit
+            draw: draw(now, quality) zeichnet einen Frame; now = perf_counter()
+            fps: Zielrate
+            min_fps: untere Grenze beim Drosseln
+            levels: Anzahl Qualitätsstufen (quality 0 = einfachste)
+            summary_interval: Sekunden zwischen Zusammenfassungen im Log (None = keine)
+        """
+        self.widget = widget
+        self.draw = draw
+        self.target_fps = float(fps)
+        self.min_fps = float(min(min_fps, fps))
+        self.levels = levels
+        self.log_prefix = log_prefix
+        self.summary_interval = summary_interval
+        self.fps = self.target_fps
+        self.quality = levels - 1
+        self._stats = FrameStats()
+        self._after_id = None
+        self._running = False
+        self._paused = False
+        self._due = None  # perf_counter des nächsten Frames
+        self._settle = 0.0
+        self._calm = 0.0
+        self._last_summary = time.perf_counter()
+
+    # ------------------------------------------------------------------
+    # Steuerung
+    # ------------------------------------------------------------------
+    def start(self):
+        """Animation starten (idempotent), mit voller Qualität und Zielrate."""
+        if self._running:
+            return
+        self._running = True
+        self._due = None
+        self._schedule(0)
+
+    def stop(self):
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except tk.TclError:
+                pass  # Widget schon zerstört
+            self._after_id = None
+        self._running = False
+
+    def is_running(self):
+        return self._running
+
+    def is_paused(self):
+        """True, solange das Widget unsichtbar ist."""
+        return self._paused
+
+    def stats(self):
+        """Kennzahlen plus aktuelle fps/Stufe (Kopie)."""
+        result = self._stats.as_dict()
+        result.update(fps=self.fps, quality=self.quality, paused=self._paused)
+        return result
+
+    def summary(self):
+        s = self._stats
+        return (
+            f"{self.fps:.0f} fps, Stufe {self.quality}, {s.frames} Frames, "
+            f"Frame Ø {s.avg_cost * 1000:.1f} ms / max {s.max_cost * 1000:.1f} ms, "
+            f"Verzug Ø {s.avg_lag * 1000:.1f} ms, {s.skipped} ausgelassen, {s.throttles}x gedrosselt"
+        )
+
+    # ------------------------------------------------------------------
+    # Takt
+    # ------------------------------------------------------------------
+    def _schedule(self, delay_ms):
+        self._after_id = self.widget.after(delay_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        if not self._running:
+            return
+        try:
+            visible = self.widget.winfo_viewable()
+        except tk.TclError:
+            self._running = False  # Widget zerstört
+            return
+        if not visible:
+            self._paused = True
+            self._due = None
+            self._schedule(PAUSE_POLL_MS)
+            return
+        self._paused = False
+
+        interval = 1.0 / self.fps
+        now = time.perf_counter()
+        if self._due is None:
+            self._due = now  # Start bzw. nach der Pause: kein Verzug
+        lag = max(0.0, now - self._due)
+        self.draw(now, self.quality)
+        end = time.perf_counter()
+        self._record(end - now, lag, interval)
+
+        # nächster Frame im Raster; was schon vorbei ist, wird ausgelassen
+        self._due += interval
+        if self._due < end:
+            missed = int((end - self._due) / interval) + 1
+            self._stats.skipped += missed
+            self._due += missed * interval
+        if self.summary_interval and end - self._last_summary >= self.summary_interval:
+            self._last_summary = end
+            print(f"{self.log_prefix} {self.summary()}")
+        self._schedule(max(1, int((self._due - end) * 1000)))
+
+    def _record(self, cost, lag, interval):
+        s = self._stats
+        s.frames += 1
+        s.last_cost = cost
+        s.total_cost += cost
+        s.max_cost = max(s.max_cost, cost)
+        s.max_lag = max(s.max_lag, lag)
+        alpha = min(1.0, interval)  # ~1 s Gedächtnis
+        s.avg_cost += alpha * (cost - s.avg_cost)
+        s.avg_lag += alpha * (lag - s.avg_lag)
+        self._adapt(interval)
+
+    def _adapt(self, interval):
+        self._settle += interval
+        if self._settle < SETTLE_SECONDS:
+            return
+        s = self._stats
+        busy = s.avg_cost / interval
+        late = s.avg_lag / interval
+        if busy > BUSY_HIGH or late > LATE_HIGH:
+            self._calm = 0.0
+            if self.quality > 0:
+                self.quality -= 1
+            elif self.fps > self.min_fps:
+                self.fps = max(self.min_fps, self.fps / 2)
+            else:
+                return
+            s.throttles += 1
+            self._changed("gedrosselt")
+        elif busy < BUSY_LOW and late < LATE_LOW:
+            self._calm += interval
+            if self._calm < RECOVER_SECONDS:
+                return
+            if self.fps < self.target_fps:
+                self.fps = min(self.target_fps, self.fps * 2)
+            elif self.quality < self.levels - 1:
+                self.quality += 1
+            else:
+                return
+            self._changed("erhöht")
+        else:
+            self._calm = 0.0
+
+    def _changed(self, what):
+        s = self._stats
+        print(
+            f"{self.log_prefix} Animation {what}: {self.fps:.0f} fps, Stufe {self.quality} "
+            f"(Frame Ø {s.avg_cost * 1000:.1f} ms, Verzug Ø {s.avg_lag * 1000:.1f} ms)"
+        )
+        # neue Messung für die neue Einstellung
+        s.avg_lag = 0.0
+        self._settle = 0.0
+        self._calm = 0.0
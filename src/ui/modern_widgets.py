@@ -13,6 +13,7 @@ from tkinter import StringVar
 from PIL import Image, ImageDraw, ImageTk, ImageFont
 import numpy as np
 import io
+from ui.renderworker import get_renderworker
 
 # Check if plotly is available
 try:
@@ -146,7 +147,15 @@ class BatteryGaugeWidget:
         self._update_pil_battery(50)
     
     def _update_pil_battery(self, soc):
-        """Zeichnet Custom Batterie"""
+        """Zeichnet Custom Batterie im Render-Worker, hier nur der Bildtausch"""
+        get_renderworker().submit(
+            self.battery_label,
+            lambda: self._render_pil_battery(soc),
+            self._show_pil_battery,
+        )
+
+    def _render_pil_battery(self, soc):
+        """Batterie-Bild zum SoC (ohne Tk-Aufrufe)"""
         w, h = self.width, self.height
         img = Image.new('RGBA', (w, h), (15, 23, 42, 255))
         draw = ImageDraw.Draw(img)
@@ -203,7 +212,9 @@ class BatteryGaugeWidget:
         text_y = batt_y + batt_height + 20
         
         draw.text((text_x, text_y), text, fill="white", font=None)
-        
+        return img
+
+    def _show_pil_battery(self, img):
         # Zu TkImage
         self.tk_img = ImageTk.PhotoImage(img)
         self.battery_label.configure(image=self.tk_img)
@@ -308,7 +319,15 @@ class CircularProgressWidget:
         self.frame.grid(**kwargs)
     
     def _update_progress(self, value):
-        """Zeichnet kreisförmigen Fortschritt"""
+        """Zeichnet kreisförmigen Fortschritt im Render-Worker, hier nur der Bildtausch"""
+        get_renderworker().submit(
+            self.progress_label,
+            lambda: self._render_progress(value),
+            self._show_progress,
+        )
+
+    def _render_progress(self, value):
+        """Fortschrittsring zum Wert (ohne Tk-Aufrufe)"""
         size = self.size
         img = Image.new('RGBA', (size, size), (15, 23, 42, 255))
         draw = ImageDraw.Draw(img)
@@ -350,7 +369,9 @@ class CircularProgressWidget:
         text_y = size // 2 - text_height // 2
         
         draw.text((text_x, text_y), text, fill="white", font=None)
-        
+        return img
+
+    def _show_progress(self, img):
         # Zu TkImage
         self.tk_img = ImageTk.PhotoImage(img)
         self.progress_label.configure(image=self.tk_img)
@@ -0,0 +1,162 @@
+"""
+Render-Worker für PIL-Widgets
+=============================
+Die PIL-Rasterung der Widgets läuft in einem eigenen Thread; der
+Tk-Hauptthread tauscht nur noch das fertige Bild ein (PhotoImage):
+
+- submit(key, render, apply): render() im Worker liefert das fertige Bild,
+  apply(bild) läuft danach im Tk-Hauptthread (after_idle, wie der Datenbus)
+- pro Key zählt nur der neueste Stand: ein noch wartender Auftrag wird
+  durch den neueren ersetzt, ein fertiges, noch nicht eingetauschtes Bild
+  durch das nächste fertige
+- ein begonnener Frame wird fertig gerendert und angezeigt, auch wenn
+  schon neuere Daten warten: kommen Daten schneller als gerendert wird,
+  aktualisiert sich die Anzeige trotzdem (im Rendertakt)
+- Aufträge verschiedener Keys der Reihe nach, ein Worker für alle Widgets
+
+Der Hauptthread wartet nie auf das Rendern. PIL gibt den GIL bei vielen
+Operationen frei, Python-Code wechselt spätestens nach
+sys.getswitchinterval() (5 ms) den Thread: die Eingabelatenz bleibt so bei
+einigen Millisekunden plus dem längsten einzelnen PIL-Aufruf, egal wie
+lange ein Frame insgesamt braucht.
+
+Ohne attach(root) (Demos, Benchmarks) rendert submit wie bisher direkt im
+aufrufenden Thread.
+"""
+
+import threading
+import time
+
+# Polling-Intervall (ms), falls Tcl ohne Threads gebaut ist
+FRAME_MS = 50
+
+
+class RenderWorker:
+    """Ein Render-Thread; Ergebnisse je Key an den Tk-Hauptthread (neuestes gewinnt)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending = {}  # Key -> (render, apply), noch nicht begonnen
+        self._results = {}  # Key -> (Bild, apply), noch nicht eingetauscht
+        self._root = None
+        self._threaded = False
+        self._scheduled = False
+        self._thread = None
+        self.stats = {
+            "submitted": 0,
+            "rendered": 0,
+            "replaced": 0,  # wartender Auftrag durch neueren ersetzt
+            "stale": 0,  # fertiges Bild vor dem Eintauschen durch neueres ersetzt
+            "errors": 0,
+            "max_render": 0.0,  # s im Worker
+            "max_apply": 0.0,  # s im Tk-Hauptthread
+        }
+
+    def attach(self, root):
+        """Tk-Root setzen und Worker-Thread starten; ab jetzt wird asynchron gerendert."""
+        self._root = root
+        try:
+            self._threaded = root.tk.eval("info exists tcl_platform(threaded)") == "1"
+        except Exception:
+            self._threaded = False
+        if not self._threaded:
+            root.after(FRAME_MS, self._poll)
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True, name="RenderWorker")
+            self._thread.start()
+
+    def submit(self, key, render, apply):
+        """
+        Frame in Auftrag geben (Tk-Hauptthread).
+
+        Args:
+            key: Widget bzw. Bildfläche; pro Key gilt nur der neueste Auftrag
+            render: render() -> Bild, läuft im Worker; darf keine Tk-Aufrufe machen
+            apply: apply(bild) im Tk-Hauptthread, nur das Eintauschen
+        """
+        if self._root is None:
+            apply(render())
+            return
+        with self._cond:
+            self.stats["submitted"] += 1
+            if key in self._pending:
+                self.stats["replaced"] += 1
+            self._pending[key] = (render, apply)
+            self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # Worker-Thread
+    # ------------------------------------------------------------------
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # ältester wartender Key zuerst (ersetzte Aufträge behalten ihren Platz)
+                key = next(iter(self._pending))
+                render, apply = self._pending.pop(key)
+
+            started = time.perf_counter()
+            try:
+                image = render()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[RENDER] Fehler in {getattr(render, '__qualname__', render)}: {e}")
+                continue
+            elapsed = time.perf_counter() - started
+
+            with self._cond:
+                self.stats["rendered"] += 1
+                self.stats["max_render"] = max(self.stats["max_render"], elapsed)
+                if key in self._results:
+                    self.stats["stale"] += 1
+                self._results[key] = (image, apply)
+                schedule = self._threaded and not self._scheduled
+                if schedule:
+                    self._scheduled = True
+
+            if schedule:
+                try:
+                    # threaded Tcl reicht den Aufruf an den Hauptthread weiter
+                    self._root.after_idle(self._flush)
+                except Exception:
+                    # Mainloop (noch) nicht aktiv oder Fenster zerstört
+                    with self._cond:
+                        self._scheduled = False
+
+    # ------------------------------------------------------------------
+    # Tk-Hauptthread
+    # ------------------------------------------------------------------
+    def _flush(self):
+        """Fertige Bilder eintauschen (Tk-Thread)."""
+        with self._cond:
+            results, self._results = self._results, {}
+            self._scheduled = False
+        for image, apply in results.values():
+            started = time.perf_counter()
+            try:
+                apply(image)
+            except Exception as e:
+                print(f"[RENDER] Fehler beim Anzeigen: {e}")
+            self.stats["max_apply"] = max(self.stats["max_apply"], time.perf_counter() - started)
+
+    def _poll(self):
+        if self._results:
+            self._flush()
+        try:
+            self._root.after(FRAME_MS, self._poll)
+        except Exception:
+            pass
+
+
+_shared_worker = None
+_shared_lock = threading.Lock()
+
+
+def get_renderworker():
+    """Prozessweiter Render-Worker (alle PIL-Widgets teilen sich einen Thread)."""
+    global _shared_worker
+    with _shared_lock:
+        if _shared_worker is None:
+            _shared_worker = RenderWorker()
+        return _shared_worker
@@ -1,12 +1,14 @@
 import tkinter as tk
+import math
 import os
-import csv
 import time
 from datetime import datetime, timedelta
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
+from matplotlib.collections import PolyCollection
+import matplotlib.dates as mdates
 from mpl_toolkits.axes_grid1 import make_axes_locatable
 from matplotlib.patches import FancyBboxPatch, Ellipse, Rectangle
 from matplotlib.colors import LinearSegmentedColormap, Normalize
@@ -23,21 +25,75 @@ from ui.styles import (
     COLOR_PRIMARY,
 )
 
+# Zeitreihen-Cache für die letzten Tage, SQLite-Rollups nur als Fallback
+from core.deadband import MAX_HOLD_SECONDS
+from core.timeseries import get_timeseries
+try:
+    from core.datastore import get_datastore
+except ImportError:
+    get_datastore = None
+
 
 DEBUG_LOG = os.getenv("DASH_DEBUG", "0") == "1"
 
+# Abstand der Farbskala zu den Messwerten (°C); Grenzen auf ganze Grad
+NORM_MARGIN = 3
+# Sparkline: Zeitfenster (h) und Update-Intervall (s)
+SPARK_HOURS = 24
+SPARK_INTERVAL = 30
+
+
+class _BlitLayer:
+    """
+    Statischer Teil einer Figur als Hintergrund-Bitmap, dynamische Artists per Blit.
+
+    Die dynamischen Artists sind "animated": die volle Zeichnung (draw)
+    lässt sie aus, im draw_event wird der Hintergrund kopiert und sie
+    werden darüber gezeichnet. update() stellt danach nur den Hintergrund
+    wieder her, zeichnet die dynamischen Artists neu und blittet, statt
+    die ganze Figur (Titel, Achsen, Farbskala) neu zu rendern.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.artists = []
+        self._bg = None
+        self._bg_bounds = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_artists(self, artists: list):
+        """Dynamische Artists in Zeichenreihenfolge (zorder wie in der Figur)."""
+        for artist in artists:
+            artist.set_animated(True)
+        self.artists = artists
+        self._bg = None
+
+    def _on_draw(self, event):
+        figure = self.canvas.figure
+        self._bg = self.canvas.copy_from_bbox(figure.bbox)
+        self._bg_bounds = figure.bbox.bounds
+        self._draw_artists()
+
+    def _draw_artists(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        """Nur die dynamischen Artists neu zeichnen (Blit); ohne gültigen Hintergrund volle Zeichnung."""
+        figure = self.canvas.figure
+        if self._bg is None or self._bg_bounds != figure.bbox.bounds:
+            self.canvas.draw_idle()  # erste Zeichnung bzw. Größe geändert
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_artists()
+        self.canvas.blit(figure.bbox)
+
+    def redraw(self):
+        """Statischer Teil hat sich geändert: volle Zeichnung, neuer Hintergrund im draw_event."""
+        self._bg = None
+        self.canvas.draw_idle()
 
-def _normalize_header(name: str) -> str:
-    return (
-        name.strip()
-        .lower()
-        .replace("ä", "ae")
-        .replace("ö", "oe")
-        .replace("ü", "ue")
-        .replace("ß", "ss")
-        .replace(" ", "")
-        .replace("_", "")
-    )
 
 class BufferStorageView(tk.Frame):
     """Zylindrischer Pufferspeicher mit geclippter Heatmap + Sparkline."""
@@ -113,6 +169,7 @@ class BufferStorageView(tk.Frame):
         self.ax = self.fig.add_subplot(111)
         self.ax.set_facecolor("none")
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self._blit = _BlitLayer(self.canvas)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.configure(width=int(fig_width * 100), height=int(fig_height * 100))
         self.canvas_widget.pack(fill=tk.BOTH, expand=True)
@@ -167,7 +224,7 @@ class BufferStorageView(tk.Frame):
         self.ax.add_patch(hl)
 
         # Labels for Pufferspeicher zones
-        self.ax.text(0.20, 0.98, "Pufferspeicher", transform=self.ax.transAxes, color=COLOR_TITLE, fontsize=12, va="top", ha="center", weight="bold")
+        puffer_title = self.ax.text(0.20, 0.98, "Pufferspeicher", transform=self.ax.transAxes, color=COLOR_TITLE, fontsize=12, va="top", ha="center", weight="bold")
 
         # Boiler cylinder (right, single color with better styling) - much smaller height (about half Pufferspeicher), on same baseline
         self.boiler_rect = FancyBboxPatch(
@@ -194,7 +251,25 @@ class BufferStorageView(tk.Frame):
                    facecolor="#ffffff", alpha=0.06, linewidth=0)
         self.ax.add_patch(boiler_hl)
         
-        self.ax.text(0.69, 0.60, "Boiler", transform=self.ax.transAxes, color=COLOR_TITLE, fontsize=12, va="top", ha="center", weight="bold")
+        boiler_title = self.ax.text(0.69, 0.60, "Boiler", transform=self.ax.transAxes, color=COLOR_TITLE, fontsize=12, va="top", ha="center", weight="bold")
+
+        # Messwerte: einmal angelegt, Updates nur per set_text/set_color
+        self.val_texts = [
+            self.ax.text(0.04, 0.85, "", transform=self.ax.transAxes, fontsize=9, va="center", ha="right", weight="bold"),
+            self.ax.text(0.04, 0.50, "", transform=self.ax.transAxes, fontsize=10, va="center", ha="right", weight="bold"),
+            self.ax.text(0.04, 0.15, "", transform=self.ax.transAxes, fontsize=9, va="center", ha="right", weight="bold"),
+        ]
+        self.boiler_temp_text = self.ax.text(0.69, 0.30, "", transform=self.ax.transAxes, color="#FFFFFF", fontsize=8,
+                                             va="center", ha="center", weight="bold", zorder=100)
+
+        # Dynamisch (Blit): Heatmap und Boilerfarbe samt allem, was darüber
+        # liegt (Kappen, Glanz, die überlappenden Titel), plus Messwerte;
+        # die Farbskala bleibt im Hintergrund
+        self._blit.set_artists([
+            self.im, puffer_cyl, puffer_top, puffer_bottom, hl,
+            self.boiler_rect, self.boiler_top, self.boiler_bottom, boiler_hl,
+            puffer_title, boiler_title, *self.val_texts, self.boiler_temp_text,
+        ])
         
         # Add colorbar on the right
         from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -216,7 +291,12 @@ class BufferStorageView(tk.Frame):
         return f"#{r:02x}{g:02x}{b:02x}"
 
     def update_temperatures(self, top: float, mid: float, bottom: float, kessel_c: float | None = None):
-        """Update temperature display - uses draw_idle() to avoid blocking."""
+        """
+        Temperaturen anzeigen: Heatmap, Messwerte und Boilerfarbe per Blit.
+
+        Volle Zeichnung nur, wenn sich die Farbskala ändert (Grenzen auf
+        ganze Grad gerundet, bei Puffer-Temperaturen selten).
+        """
         if not self.winfo_exists():
             return
         if not hasattr(self, "canvas_widget") or not self.canvas_widget.winfo_exists():
@@ -231,52 +311,36 @@ class BufferStorageView(tk.Frame):
             print(f"[BUFFER] update_temperatures() at {elapsed:.3f}s: {top:.1f}/{mid:.1f}/{bottom:.1f}")
         
         self._last_temps = temps
-        vmin = min(temps) - 3
-        vmax = max(temps) + 3
-        self.norm = Normalize(vmin=vmin, vmax=vmax)
+        vmin = math.floor(min(temps)) - NORM_MARGIN
+        vmax = math.ceil(max(temps)) + NORM_MARGIN
+        scale_changed = (vmin, vmax) != (self.norm.vmin, self.norm.vmax)
+        if scale_changed:
+            self.norm = Normalize(vmin=vmin, vmax=vmax)
+            self.im.set_norm(self.norm)
 
         self.data = self._build_stratified_data(top, mid, bottom)
         self.im.set_data(self.data)
-        self.im.set_norm(self.norm)
-
-        c_top = self._temp_color(top)
-        c_mid = self._temp_color(mid)
-        c_bot = self._temp_color(bottom)
 
-        for t in self.val_texts:
-            t.remove()
-        self.val_texts = [
-            self.ax.text(0.04, 0.85, f"{top:.1f}°C", transform=self.ax.transAxes, color=c_top, fontsize=9, va="center", ha="right", weight="bold"),
-            self.ax.text(0.04, 0.50, f"{mid:.1f}°C", transform=self.ax.transAxes, color=c_mid, fontsize=10, va="center", ha="right", weight="bold"),
-            self.ax.text(0.04, 0.15, f"{bottom:.1f}°C", transform=self.ax.transAxes, color=c_bot, fontsize=9, va="center", ha="right", weight="bold"),
-        ]
+        for text, temp in zip(self.val_texts, temps):
+            text.set_text(f"{temp:.1f}°C")
+            text.set_color(self._temp_color(temp))
 
         if kessel_c is not None:
-            c_kessel = self._temp_color(kessel_c)
-            self.boiler_rect.set_facecolor(c_kessel)
-            # Add boiler temperature text - smaller and without outline
-            if hasattr(self, 'boiler_temp_text'):
-                self.boiler_temp_text.remove()
-            if hasattr(self, 'boiler_temp_outline'):
-                for outline_text in self.boiler_temp_outline:
-                    outline_text.remove()
-            self.boiler_temp_text = self.ax.text(0.69, 0.30, f"{kessel_c:.1f}°C", 
-                transform=self.ax.transAxes, color="#FFFFFF", fontsize=8, 
-                va="center", ha="center", weight="bold", zorder=100)
+            self.boiler_rect.set_facecolor(self._temp_color(kessel_c))
+            self.boiler_temp_text.set_text(f"{kessel_c:.1f}°C")
         
         self._update_sparkline()
         
-        # Use draw_idle() to defer redraw and avoid blocking
-        # Note: This will redraw all static elements too (titles), causing flicker
-        # But it's necessary for matplotlib updates. The flicker is minimized by
-        # only updating when temperatures actually change (see check at top)
-        if DEBUG_LOG:
-            print(f"[BUFFER] Calling canvas.draw_idle() at {time.time() - self._start_time:.3f}s")
-        
         # Redraw safely if widget still exists
         try:
             if self.canvas_widget.winfo_exists():
-                self.canvas.draw_idle()
+                t0 = time.perf_counter()
+                if scale_changed:
+                    self._blit.redraw()  # Farbskala neu
+                else:
+                    self._blit.update()
+                if DEBUG_LOG:
+                    print(f"[BUFFER] {'draw_idle' if scale_changed else 'blit'} {1000 * (time.perf_counter() - t0):.1f} ms")
         except Exception as e:
             print(f"[BUFFER] Canvas draw error: {e}")
 
@@ -296,6 +360,7 @@ class BufferStorageView(tk.Frame):
         return vals.reshape(h, 1)
 
     def _create_sparkline(self):
+        """Sparkline einmal aufbauen; _update_sparkline setzt nur noch Daten und ggf. Grenzen."""
         self.spark_fig = Figure(figsize=(3.4, 0.9), dpi=100)  # Pi 5: Stable DPI
         self.spark_fig.patch.set_alpha(0)
         self.spark_ax = self.spark_fig.add_subplot(111)
@@ -303,42 +368,18 @@ class BufferStorageView(tk.Frame):
         self.spark_canvas = FigureCanvasTkAgg(self.spark_fig, master=self.spark_frame)
         self.spark_canvas.get_tk_widget().pack(fill=tk.X, expand=False)
 
-    def _update_sparkline(self):
-        if (datetime.now().timestamp() - self._last_spark_update) < 30:  # Pi 5: Update every 30s
-            return
-        if not hasattr(self, "spark_canvas"):
-            return
-        if not self.spark_canvas.get_tk_widget().winfo_exists():
-            return
-        self._last_spark_update = datetime.now().timestamp()
-        
-        pv_series = self._load_pv_series(hours=24, bin_minutes=15)
-        temp_series = self._load_outdoor_temp_series(hours=24, bin_minutes=15)
-        
-        self.spark_ax.clear()
-        
-        # Create second y-axis for temperature
-        if hasattr(self, "spark_ax2"):
-            try:
-                self.spark_ax2.remove()
-            except Exception:
-                pass
+        # Second y-axis for temperature
         self.spark_ax2 = self.spark_ax.twinx()
         ax2 = self.spark_ax2
-        
-        # Plot PV production (left axis) - yellow/green
-        if pv_series:
-            xs_pv, ys_pv = zip(*pv_series)
-            self.spark_ax.plot(xs_pv, ys_pv, color=COLOR_SUCCESS, linewidth=2.0, alpha=0.9, label="PV")
-            self.spark_ax.fill_between(xs_pv, ys_pv, color=COLOR_SUCCESS, alpha=0.15)
-            self.spark_ax.scatter([xs_pv[-1]], [ys_pv[-1]], color=COLOR_SUCCESS, s=12, zorder=10)
-        
-        # Plot outdoor temperature (right axis) - blue
-        if temp_series:
-            xs_temp, ys_temp = zip(*temp_series)
-            ax2.plot(xs_temp, ys_temp, color=COLOR_INFO, linewidth=2.0, alpha=0.9, label="Temp", linestyle="--")
-            ax2.scatter([xs_temp[-1]], [ys_temp[-1]], color=COLOR_INFO, s=12, zorder=10)
-        
+
+        # PV production (left axis) - yellow/green, outdoor temperature (right axis) - blue
+        self._spark_pv_fill = PolyCollection([], color=COLOR_SUCCESS, alpha=0.15)
+        self.spark_ax.add_collection(self._spark_pv_fill, autolim=False)
+        self._spark_pv_line, = self.spark_ax.plot([], [], color=COLOR_SUCCESS, linewidth=2.0, alpha=0.9, label="PV")
+        self._spark_pv_dot, = self.spark_ax.plot([], [], "o", color=COLOR_SUCCESS, markersize=math.sqrt(12), zorder=10)
+        self._spark_temp_line, = ax2.plot([], [], color=COLOR_INFO, linewidth=2.0, alpha=0.9, label="Temp", linestyle="--")
+        self._spark_temp_dot, = ax2.plot([], [], "o", color=COLOR_INFO, markersize=math.sqrt(12), zorder=10)
+
         # Subtle axis styling
         self.spark_ax.spines['top'].set_visible(False)
         self.spark_ax.spines['right'].set_visible(False)
@@ -368,102 +409,113 @@ class BufferStorageView(tk.Frame):
         self.spark_ax.xaxis.set_major_locator(plt.MaxNLocator(6))
         
         # Format x-axis to show hours
-        import matplotlib.dates as mdates
         self.spark_ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+
+        # Linien, Fläche und Endpunkte per Blit; Achsen nur bei neuen Grenzen
+        self._spark_blit = _BlitLayer(self.spark_canvas)
+        self._spark_blit.set_artists([
+            self._spark_pv_fill, self._spark_pv_line, self._spark_pv_dot,
+            self._spark_temp_line, self._spark_temp_dot,
+        ])
+        self._spark_limits = None
+
+    def _update_sparkline(self):
+        """
+        PV und Außentemperatur der letzten SPARK_HOURS, alle SPARK_INTERVAL s.
+
+        Die Achsgrenzen springen nur zur vollen Stunde bzw. auf die nächste
+        Tick-Marke (MaxNLocator); solange sie passen, werden nur Linien und
+        Fläche per set_data/set_verts ersetzt und geblittet.
+        """
+        if (datetime.now().timestamp() - self._last_spark_update) < SPARK_INTERVAL:  # Pi 5: Update every 30s
+            return
+        if not hasattr(self, "spark_canvas"):
+            return
+        if not self.spark_canvas.get_tk_widget().winfo_exists():
+            return
+        self._last_spark_update = datetime.now().timestamp()
         
-        # Ensure labels are visible within figure bounds
-        try:
-            self.spark_fig.tight_layout(pad=0.3)
-        except Exception as e:
-            print(f"[BUFFER] tight_layout warning: {e}")
-        
+        pv_series = self._load_pv_series(hours=SPARK_HOURS, bin_minutes=15)
+        temp_series = self._load_outdoor_temp_series(hours=SPARK_HOURS, bin_minutes=15)
+        xs_pv, ys_pv = self._series_arrays(pv_series)
+        xs_temp, ys_temp = self._series_arrays(temp_series)
+
+        self._spark_pv_line.set_data(xs_pv, ys_pv)
+        self._spark_pv_dot.set_data(xs_pv[-1:], ys_pv[-1:])
+        # Fläche wie fill_between(xs, ys): Kurve hin, Nulllinie zurück
+        if len(xs_pv):
+            polygon = np.column_stack([np.r_[xs_pv, xs_pv[::-1]], np.r_[ys_pv, np.zeros(len(ys_pv))]])
+            self._spark_pv_fill.set_verts([polygon])
+        else:
+            self._spark_pv_fill.set_verts([])
+        self._spark_temp_line.set_data(xs_temp, ys_temp)
+        self._spark_temp_dot.set_data(xs_temp[-1:], ys_temp[-1:])
+
+        # Zeitachse: volle Stunden, das Fenster [jetzt - SPARK_HOURS, jetzt] liegt innen
+        hour = datetime.now().replace(minute=0, second=0, microsecond=0)
+        xlim = (mdates.date2num(hour - timedelta(hours=SPARK_HOURS)), mdates.date2num(hour + timedelta(hours=1)))
+        limits = (
+            xlim,
+            self._tick_limits(self.spark_ax, min(0.0, ys_pv.min()), ys_pv.max()) if len(ys_pv) else None,
+            self._tick_limits(self.spark_ax2, ys_temp.min(), ys_temp.max()) if len(ys_temp) else None,
+        )
+
         try:
-            self.spark_canvas.draw_idle()
+            if limits == self._spark_limits:
+                self._spark_blit.update()
+                return
+            self._spark_limits = limits
+            self.spark_ax.set_xlim(*xlim)
+            if limits[1]:
+                self.spark_ax.set_ylim(*limits[1])
+            if limits[2]:
+                self.spark_ax2.set_ylim(*limits[2])
+            # Ensure labels are visible within figure bounds
+            try:
+                self.spark_fig.tight_layout(pad=0.3)
+            except Exception as e:
+                print(f"[BUFFER] tight_layout warning: {e}")
+            self._spark_blit.redraw()
         except Exception as e:
             print(f"[BUFFER] Sparkline canvas draw error: {e}")
 
+    def _series_arrays(self, series: list[tuple[datetime, float]]) -> tuple[np.ndarray, np.ndarray]:
+        """(Zeit, Wert)-Liste als Matplotlib-Datumszahlen und Werte."""
+        if not series:
+            return np.empty(0), np.empty(0)
+        times, values = zip(*series)
+        return mdates.date2num(times), np.asarray(values, dtype=float)
+
+    def _tick_limits(self, ax, lo: float, hi: float) -> tuple[float, float]:
+        """Achsgrenzen auf die äußeren Tick-Marken des Locators gerundet (ändern sich selten)."""
+        if hi - lo < 1e-9:
+            lo, hi = lo - 1, hi + 1
+        ticks = ax.yaxis.get_major_locator().tick_values(lo, hi)
+        return float(ticks[0]), float(ticks[-1])
+
     def _load_pv_series(self, hours: int = 24, bin_minutes: int = 15) -> list[tuple[datetime, float]]:
         """Load PV production with smoothing."""
-        path = self._data_path("FroniusDaten.csv")
-        if not os.path.exists(path):
-            return []
         cutoff = datetime.now() - timedelta(hours=hours)
-        lines = self._read_lines_safe(path)
-        if len(lines) < 2:
-            return []
-        rows = []
-        for line in lines[-1000:]:
-            line = line.strip()
-            if not line or line.lower().startswith("zeit"):
-                continue
+        out = get_timeseries().binned("fronius", "pv_power", cutoff, bin_minutes * 60)
+        if not out and get_datastore is not None:
             try:
-                row = next(csv.reader([line]))
-                ts = datetime.fromisoformat(row[0])
-                if ts < cutoff:
-                    continue
-                pv_kw = float(row[1])  # PV production in kW
-                ts_bin = ts - timedelta(minutes=ts.minute % bin_minutes, seconds=ts.second, microseconds=ts.microsecond)
-                rows.append((ts_bin, pv_kw))
-            except Exception:
-                continue
-        if not rows:
+                buckets = get_datastore().get_rollup("fronius", cutoff, resolution=bin_minutes * 60)
+                out = [(b["time"], b["pv_power"]) for b in buckets if b["pv_power"] is not None]
+            except Exception as e:
+                if DEBUG_LOG:
+                    print(f"[BUFFER] DataStore PV query failed: {e}")
+        if not out:
             return []
-        # Aggregate by time bin
-        agg = {}
-        for ts, val in rows:
-            s, c = agg.get(ts, (0.0, 0))
-            agg[ts] = (s + val, c + 1)
-        out = [(ts, s / c) for ts, (s, c) in sorted(agg.items())]
         # Strong smoothing with moving average (window of 5)
         return self._smooth_series(out, window=5)
     
     def _load_outdoor_temp_series(self, hours: int = 24, bin_minutes: int = 15) -> list[tuple[datetime, float]]:
         """Load outdoor temperature with smoothing."""
-        path = self._data_path("Heizungstemperaturen.csv")
-        if not os.path.exists(path):
-            return []
-        cutoff = datetime.now() - timedelta(hours=hours)
-        lines = self._read_lines_safe(path)
-        if len(lines) < 2:
-            return []
-        header = []
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if line.lower().startswith("zeit"):
-                header = next(csv.reader([line]))
-                break
-        idx_map = self._header_indices(header) if header else {}
-        rows = []
-        for line in lines[-800:]:
-            line = line.strip()
-            if not line or line.lower().startswith("zeit"):
-                continue
-            try:
-                row = next(csv.reader([line]))
-                ts = datetime.fromisoformat(row[0])
-                if ts < cutoff:
-                    continue
-                val = self._row_value_by_keys(
-                    row,
-                    idx_map,
-                    "Außentemperatur",
-                    "Aussentemperatur",
-                    "Außentemp",
-                    "Aussentemp",
-                    "Aussen",
-                    "Außen",
-                    "OutdoorTemp",
-                    "OutTemp",
-                )
-                if val is None:
-                    continue
-                outdoor_temp = float(val)
-                ts_bin = ts - timedelta(minutes=ts.minute % bin_minutes, seconds=ts.second, microseconds=ts.microsecond)
-                rows.append((ts_bin, outdoor_temp))
-            except Exception:
-                continue
+        rows = self._load_heating_rows(
+            "außentemp",
+            hours,
+            bin_minutes,
+        )
         if not rows:
             return []
         # Aggregate by time bin
@@ -474,6 +526,21 @@ class BufferStorageView(tk.Frame):
         out = [(ts, s / c) for ts, (s, c) in sorted(agg.items())]
         # Strong smoothing with moving average (window of 5)
         return self._smooth_series(out, window=5)
+
+    def _load_heating_rows(self, column: str, hours: int, bin_minutes: int) -> list[tuple[datetime, float]]:
+        """Heizungswerte als (Zeit-Bin, Mittelwert): Zeitreihen-Cache, SQLite-Rollups als Fallback."""
+        cutoff = datetime.now() - timedelta(hours=hours)
+        # Log ist deadband-gefiltert: leere Bins halten den letzten Wert
+        rows = get_timeseries().binned("heating", column, cutoff, bin_minutes * 60, hold=MAX_HOLD_SECONDS)
+        if rows or get_datastore is None:
+            return rows
+        try:
+            buckets = get_datastore().get_rollup("heating", cutoff, resolution=bin_minutes * 60)
+            return [(b["time"], b[column]) for b in buckets if b[column] is not None]
+        except Exception as e:
+            if DEBUG_LOG:
+                print(f"[BUFFER] DataStore heating query failed: {e}")
+            return []
     
     def _smooth_series(self, series: list[tuple[datetime, float]], window: int = 5) -> list[tuple[datetime, float]]:
         """Apply moving average smoothing to series."""
@@ -489,61 +556,12 @@ class BufferStorageView(tk.Frame):
             smoothed.append((series[i][0], smoothed_val))
         return smoothed
 
-    @staticmethod
-    def _header_indices(header: list[str]) -> dict[str, int]:
-        return {_normalize_header(name): idx for idx, name in enumerate(header)}
-
-    @staticmethod
-    def _row_value_by_keys(row: list[str], idx_map: dict[str, int], *keys: str) -> str | None:
-        for key in keys:
-            norm = _normalize_header(key)
-            if norm in idx_map:
-                idx = idx_map[norm]
-                if 0 <= idx < len(row):
-                    return row[idx]
-        return None
-
     def _load_puffer_series(self, hours: int = 24, bin_minutes: int = 15) -> list[tuple[datetime, float]]:
-        path = self._data_path("Heizungstemperaturen.csv")
-        if not os.path.exists(path):
-            return []
-        cutoff = datetime.now() - timedelta(hours=hours)
-        lines = self._read_lines_safe(path)
-        if len(lines) < 2:
-            return []
-        header = []
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            if line.lower().startswith("zeit"):
-                header = next(csv.reader([line]))
-                break
-        idx_map = self._header_indices(header) if header else {}
-        rows = []
-        for line in lines[-800:]:
-            line = line.strip()
-            if not line or line.lower().startswith("zeit"):
-                continue
-            try:
-                row = next(csv.reader([line]))
-                ts = datetime.fromisoformat(row[0])
-                if ts < cutoff:
-                    continue
-                val = self._row_value_by_keys(
-                    row,
-                    idx_map,
-                    "Pufferspeicher Mitte",
-                    "Puffer_Mitte",
-                    "Puffer Mitte",
-                )
-                if val is None:
-                    continue
-                mid = float(val)
-                ts_bin = ts - timedelta(minutes=ts.minute % bin_minutes, seconds=ts.second, microseconds=ts.microsecond)
-                rows.append((ts_bin, mid))
-            except Exception:
-                continue
+        rows = self._load_heating_rows(
+            "puffer_mid",
+            hours,
+            bin_minutes,
+        )
         if not rows:
             return []
         agg = {}
@@ -556,40 +574,3 @@ class BufferStorageView(tk.Frame):
             w = out[max(0, i-1):min(len(out), i+2)]
             smoothed.append((out[i][0], sum(v for _, v in w) / len(w)))
         return smoothed
-
-    @staticmethod
-    def _data_path(filename: str) -> str:
-        # Calculate root directory: src/ui/views -> root/
-        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        # Try multiple common paths
-        candidates = [
-            os.path.join(root_dir, "data", filename),  # data/ directory in root
-            os.path.join(root_dir, filename),  # Root directory
-            os.path.join("/home/laurenz/projekt1/Projekt1/data", filename),  # Raspberry Pi data path
-            os.path.join("/home/laurenz/projekt1/Projekt1", filename),  # Raspberry Pi root
-        ]
-        for candidate in candidates:
-            if os.path.exists(candidate):
-                return candidate
-        # Default fallback
-        return candidates[0]
-
-    @staticmethod
-    def _read_lines_safe(path: str, max_bytes: int = 262144, max_lines: int = 2000) -> list[str]:
-        try:
-            with open(path, "rb") as f:
-                f.seek(0, os.SEEK_END)
-                size = f.tell()
-                f.seek(max(0, size - max_bytes))
-                chunk = f.read().decode("utf-8-sig", errors="replace")
-            lines = chunk.splitlines()
-        except Exception:
-            try:
-                with open(path, "r", encoding="utf-8-sig", errors="replace") as f:
-                    lines = f.readlines()
-            except Exception:
-                return []
-
-        if max_lines and len(lines) > max_lines:
-            return lines[-max_lines:]
-        return lines
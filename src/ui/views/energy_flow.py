@@ -2,7 +2,11 @@ import tkinter as tk
 import math
 import time
 import os
+from collections import OrderedDict
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageTk
+from ui.framescheduler import FrameScheduler
+from ui.renderworker import get_renderworker
 from ui.styles import (
     COLOR_CARD,
     COLOR_BORDER,
@@ -25,6 +29,25 @@ def _s(val: float) -> int:
 
 DEBUG_LOG = os.getenv("DASH_DEBUG", "0") == "1"
 
+# Hintergrundverlauf: Farbe, Alpha in der Mitte, Exponent des Abfalls
+BG_COLOR = (14, 24, 40)
+BG_ALPHA = 220
+BG_FALLOFF = 0.7
+
+# LRU für vorgerenderte Texte (Glyph-Masken, gedrehte Flusslabels, Textmaße)
+SPRITE_CACHE_SIZE = 256
+
+# Animierter Modus (set_animated): laufende Striche auf den Pfeilen
+ANIM_FPS = 20
+ANIM_MIN_FPS = 5
+ANIM_SUMMARY_INTERVAL = 60.0  # s, nur mit DASH_DEBUG=1
+DASH_LENGTH = 8
+DASH_SPACING = (64, 40, 24)  # Abstand je Qualitätsstufe (0 = wenigste Striche)
+# Geschwindigkeit in px/s: Sockel + Anteil je kW, gedeckelt
+DASH_SPEED_MIN = 12.0
+DASH_SPEED_PER_KW = 18.0
+DASH_SPEED_MAX = 140.0
+
 class EnergyFlowView(tk.Frame):
     """PIL-basierter, flimmerfreier Energiefluss. Ein Canvas-Image pro Update."""
 
@@ -33,11 +56,14 @@ class EnergyFlowView(tk.Frame):
         self._start_time = time.time()
         self.canvas = tk.Canvas(self, width=width, height=height, highlightthickness=0, bg=COLOR_CARD)
         self.canvas.pack(fill=tk.BOTH, expand=True)
-        self._resize_pending = False  # Debounce Configure events
         self.canvas.bind("<Configure>", self._on_canvas_resize)
 
+        # width/height: Zielgröße (Tk-Thread); _layout_size: Größe, für die
+        # nodes/_base_img gebaut sind (Render-Worker, siehe _render_job)
         self.width = width
         self.height = height
+        self._layout_size = (width, height)
+        self._worker = get_renderworker()
         self.node_radius = _s(38)
         self.ring_gap = _s(10)
         self._tk_img = None
@@ -46,7 +72,24 @@ class EnergyFlowView(tk.Frame):
         self._font_tiny = ImageFont.truetype("arial.ttf", _s(17)) if self._has_font("arial.ttf") else None
         # Emoji font support with multiple fallbacks
         self._font_emoji = self._find_emoji_font(_s(36))
-        
+        self._font_default = ImageFont.load_default()
+        self._fonts = {}  # (Größe, Gewicht, Emoji) -> Font für _text_center
+        self._sprites = OrderedDict()  # LRU, siehe _sprite
+        self._measure = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+        # Frame über der statischen Ebene (_base_img), Dirty-Rect siehe _static_layer
+        self._static_src = None  # _base_img, zu dem _frame gehört
+        self._frame = None
+        self._dirty = None  # (x0, y0, x1, y1) der dynamischen Elemente im Frame
+
+        # Animation: Canvas-Linien über dem Bild, nur coords() je Frame
+        self._scheduler = None
+        self._dash_paths = []  # je Pfeil (x0, y0, ux, uy, Länge, px/s, Farbe, Breite), Tk-Thread
+        self._frame_dashes = []  # Strichbahnen zu _frame (Render-Worker), mit dem Bild an _show
+        self._dash_items = []
+        self._dash_styles = []  # (Farbe, Breite) je Item, nur bei Änderung setzen
+        self._dash_shown = 0
+
         # Load PNG icons - will be pasted onto PIL image
         self._icons_pil = {}  # PIL Images for embedding
         self._load_icons()
@@ -60,56 +103,69 @@ class EnergyFlowView(tk.Frame):
 
     def _on_canvas_resize(self, event):
         """Re-render background and last frame when the canvas grows."""
-        # Debounce rapid resize events
-        if self._resize_pending:
-            return
-        
         new_w = max(240, int(event.width))
         new_h = max(200, int(event.height))
         if abs(new_w - self.width) < 10 and abs(new_h - self.height) < 10:  # 10px threshold
             return
 
-        self._resize_pending = True
         self.width = new_w
         self.height = new_h
-        self.nodes = self._define_nodes()
-        self._base_img = self._render_background()
         self.canvas.config(width=new_w, height=new_h)
-
-        if self._last_flows:
-            pv, load, grid, batt, soc = self._last_flows
-            frame = self.render_frame(pv, load, grid, batt, soc)
-        else:
-            frame = self._base_img
-
+        self._request_frame()
+
+    def _request_frame(self):
+        """
+        Frame zur Zielgröße und den letzten Flüssen beim Render-Worker bestellen.
+
+        Der Worker baut bei Bedarf Layout und Hintergrund neu und rendert,
+        der Tk-Thread tauscht nur noch das Bild ein (_show). Ein noch nicht
+        begonnener Auftrag wird durch den neueren ersetzt.
+        """
+        size = (self.width, self.height)
+        flows = self._last_flows
+        self._worker.submit(self.canvas, lambda: self._render_job(size, flows), self._show)
+
+    def _render_job(self, size: tuple, flows: tuple | None) -> tuple:
+        """
+        Render-Worker: Layout zu size, dann Frame zu flows (None = nur Hintergrund).
+
+        Liefert (Bild, Strichbahnen); nodes/_base_img liest nur der Worker,
+        der Tk-Thread bekommt die Strichbahnen erst mit dem passenden Bild.
+        """
+        if size != self._layout_size:
+            self._layout_size = size
+            self.nodes = self._define_nodes()
+            self._base_img = self._render_background()
+        if not flows:
+            return self._base_img, []
+        # Kopie: der Worker überschreibt _frame schon beim nächsten Auftrag
+        return self.render_frame(*flows).copy(), self._frame_dashes
+
+    def _show(self, rendered: tuple):
+        """
+        (Bild, Strichbahnen) anzeigen (Tk-Thread): Striche und Pfeile wechseln gemeinsam.
+
+        Gleiche Größe: vorhandenes PhotoImage überschreiben statt neu anlegen.
+        """
+        frame, self._dash_paths = rendered
+        if self._tk_img is not None and (self._tk_img.width(), self._tk_img.height()) == frame.size:
+            self._tk_img.paste(frame)
+            return
         self._tk_img = ImageTk.PhotoImage(frame)
         self.canvas.itemconfig(self._canvas_img, image=self._tk_img)
-        self._resize_pending = False
 
     def resize(self, width: int, height: int):
-        """FIXED: Only update canvas size and dimensions, don't recreate background."""
+        """Canvas auf width x height; Layout, Hintergrund und Frame baut der Render-Worker."""
         elapsed = time.time() - self._start_time
         if DEBUG_LOG:
             print(f"[ENERGY] resize() called at {elapsed:.3f}s with {width}x{height}")
-        
-        old_w, old_h = self.width, self.height
+
         width = max(240, int(width))
         height = max(200, int(height))
-        
-        # Only update canvas config and internal dimensions
         self.canvas.config(width=width, height=height)
         self.width = width
         self.height = height
-        self.nodes = self._define_nodes()
-        
-        # Only recreate background if size changed significantly (>20px)
-        if abs(width - old_w) > 20 or abs(height - old_h) > 20:
-            if DEBUG_LOG:
-                print(f"[ENERGY] Large size change, recreating background")
-            self._base_img = self._render_background()
-        else:
-            if DEBUG_LOG:
-                print(f"[ENERGY] Small change, skipping background recreate")
+        self._request_frame()
 
     def _has_font(self, name: str) -> bool:
         try:
@@ -175,7 +231,7 @@ class EnergyFlowView(tk.Frame):
         return None
 
     def _define_nodes(self):
-        w, h = self.width, self.height
+        w, h = self._layout_size
         margin_x = int(w * 0.06)
         margin_top = _s(40)
         margin_bottom = _s(90)  # Platz für SoC-Text unter der Batterie
@@ -189,11 +245,27 @@ class EnergyFlowView(tk.Frame):
         }
 
     def _render_background(self) -> Image.Image:
-        img = self._draw_bg_gradient()
-        draw = ImageDraw.Draw(img)
+        """
+        Hintergrund + Knoten als ein Bild.
+
+        ImageDraw auf RGBA ersetzt Pixel (kein Mischen): jedes Pixel trägt
+        die Farbe der zuletzt gezeichneten Ellipse, sonst den Verlauf. Die
+        Ellipsen (Schatten, Glow, Radial, Kreis) landen daher als Index in
+        einer Ebenen-Karte (PIL-Rasterung, gleiche Pixel wie bisher), die
+        Farben kommen per Palette aus NumPy, zusammengesetzt mit einem
+        Image.fromarray.
+        """
+        pixels = self._draw_bg_gradient()
+        layer_map = Image.new("I", self._layout_size, 0)
+        draw = ImageDraw.Draw(layer_map)
+        palette = [(0, 0, 0, 0)]  # Index 0 = Verlauf
         # Draw node circles (background + effects)
         for name, (x, y) in self.nodes.items():
-            self._draw_node_circle(draw, x, y, name)
+            self._draw_node_circle(draw, palette, x, y, name)
+        index = np.asarray(layer_map)
+        colors = np.array(palette, dtype=np.uint8)
+        pixels = np.where((index > 0)[..., None], colors[index], pixels)
+        img = Image.fromarray(pixels, "RGBA")
         # Paste icons on top
         for name, (x, y) in self.nodes.items():
             if name in self._icons_pil:
@@ -207,35 +279,31 @@ class EnergyFlowView(tk.Frame):
                 img.paste(icon, (paste_x, paste_y), icon)  # Use alpha channel
         return img
 
-    def _draw_bg_gradient(self) -> Image.Image:
-        """Elliptical gradient: matches widget shape, very transparent at edges."""
-        img = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 0))
-        d = ImageDraw.Draw(img)
-        
-        center_x = self.width // 2
-        center_y = self.height // 2
+    def _draw_bg_gradient(self) -> np.ndarray:
+        """Elliptical gradient: matches widget shape, very transparent at edges (H x W x 4, uint8)."""
+        width, height = self._layout_size
+        center_x = width // 2
+        center_y = height // 2
         
-        # Subtle blueish color
-        color = (14, 24, 40)
+        # Elliptical distance - scales with widget dimensions
+        dx = (np.arange(width) - center_x) / (width / 2)
+        dy = (np.arange(height) - center_y) / (height / 2)
         
-        for y in range(self.height):
-            for x in range(self.width):
-                # Elliptical distance - scales with widget dimensions
-                dx = (x - center_x) / (self.width / 2)
-                dy = (y - center_y) / (self.height / 2)
-                
-                # Normalized elliptical distance (0=center, 1=edge)
-                norm_dist = min(1.0, (dx ** 2 + dy ** 2) ** 0.5)
-                
-                # Alpha falloff: center ~220, edges ~5 (nearly invisible)
-                # Smoother power function for seamless blend
-                alpha_val = int(220 * (1.0 - norm_dist ** 0.7))
-                
-                d.point((x, y), fill=(color[0], color[1], color[2], alpha_val))
+        # Normalized elliptical distance (0=center, 1=edge)
+        norm_dist = np.minimum(1.0, np.sqrt(dx[np.newaxis, :] ** 2 + dy[:, np.newaxis] ** 2))
         
-        return img
-
-    def _draw_node_circle(self, draw: ImageDraw.ImageDraw, x: int, y: int, name: str):
+        # Alpha falloff: center ~220, edges ~5 (nearly invisible)
+        pixels = np.empty((height, width, 4), dtype=np.uint8)
+        pixels[..., :3] = BG_COLOR
+        pixels[..., 3] = (BG_ALPHA * (1.0 - norm_dist ** BG_FALLOFF)).astype(np.uint8)
+        return pixels
+
+    def _layer_ellipse(self, draw: ImageDraw.ImageDraw, palette: list, bbox, rgba: tuple):
+        """Ellipse in die Ebenen-Karte, Farbe als neuer Palettenindex."""
+        palette.append(rgba)
+        draw.ellipse(bbox, fill=len(palette) - 1)
+
+    def _draw_node_circle(self, draw: ImageDraw.ImageDraw, palette: list, x: int, y: int, name: str):
         """Draw node circle background with effects (no text/icons)."""
         r = self.node_radius + (6 if name == "home" else 0)
         fill = COLOR_BORDER
@@ -248,42 +316,106 @@ class EnergyFlowView(tk.Frame):
         elif name == "battery":
             fill = COLOR_WARNING
         # Beautiful soft shadow + subtle glow
-        self._draw_soft_shadow(draw, x, y, r, fill)
-        self._draw_subtle_glow(draw, x, y, r, fill)
+        self._draw_soft_shadow(draw, palette, x, y, r, fill)
+        self._draw_subtle_glow(draw, palette, x, y, r, fill)
         # Radial gradient (subtle)
-        self._draw_radial(draw, x, y, r, fill)
-        draw.ellipse([x - r, y - r, x + r, y + r], fill=fill, outline=None, width=0)
+        self._draw_radial(draw, palette, x, y, r, fill)
+        self._layer_ellipse(draw, palette, [x - r, y - r, x + r, y + r], self._hex_to_rgb(fill) + (255,))
 
-    def _text_center(self, draw: ImageDraw.ImageDraw, text: str, x: int, y: int, size: int, color: str = COLOR_TEXT, fontweight: str = "normal", outline: bool = False):
+    def _text_font(self, text: str, size: int, fontweight: str = "normal"):
+        """Font für _text_center, je (Größe, Gewicht, Emoji) einmal aufgelöst."""
         # Use emoji font for emoji characters, otherwise use bold font
         is_emoji = any(ord(c) > 0x1F000 for c in text)
-        
+        key = (size, fontweight, is_emoji)
+        font = self._fonts.get(key)
+        if font is not None:
+            return font
         if is_emoji and self._font_emoji:
             font = self._font_emoji
         else:
             try:
                 font = ImageFont.truetype("arial.ttf", size, weight="bold" if fontweight == "bold" else "normal")
             except Exception:
-                font = self._font_big if size > 20 and self._font_big else ImageFont.load_default()
+                font = self._font_big if size > 20 and self._font_big else self._font_default
                 if size <= 20:
-                    font = self._font_small if self._font_small else ImageFont.load_default()
-        bbox = draw.textbbox((0, 0), text, font=font)
+                    font = self._font_small if self._font_small else self._font_default
+        self._fonts[key] = font
+        return font
+
+    def _sprite(self, key: tuple, build):
+        """LRU-Cache der vorgerenderten Texte: Treffer nach hinten, ältester Eintrag fliegt raus."""
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = build()
+            self._sprites[key] = sprite
+            if len(self._sprites) > SPRITE_CACHE_SIZE:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(key)
+        return sprite
+
+    def _text_box(self, text: str, font) -> tuple:
+        """textbbox((0, 0)) eines Textes, gecacht."""
+        return self._sprite(("box", text, font), lambda: self._measure.textbbox((0, 0), text, font=font))
+
+    def _glyph(self, text: str, font, color: str, phase: tuple, outline: bool = False) -> tuple:
+        """
+        Vorgerenderter Text als (Tinte, Maske, dx, dy), Schlüssel (Text, Font, Farbe, ...).
+
+        draw.text rastert mit dem Nachkommaanteil der Position (phase), daher
+        gehört er zum Schlüssel; die Maske entsteht genau wie bei draw.text.
+        Einfügen mit _paste_glyph an (floor(x) - dx, floor(y) - dy).
+        """
+
+        def build():
+            left, top, right, bottom = self._text_box(text, font)
+            pad = 3 if outline else 1
+            dx = pad - min(0, math.floor(left))
+            dy = pad - min(0, math.floor(top))
+            size = (dx + math.ceil(right) + pad + 1, dy + math.ceil(bottom) + pad + 1)
+            x, y = dx + phase[0], dy + phase[1]
+            mask = Image.new("L", size, 0)
+            ImageDraw.Draw(mask).text((x, y), text, font=font, fill=255)
+            if not outline:
+                return color, mask, dx, dy
+            # Kontur: dieselbe Maske um ganze Pixel versetzt (gleicher
+            # Nachkommaanteil), 24x übereinander, dann der Text. Tinte je
+            # Pixel so, dass Tinte * Deckung = Text über schwarzer Kontur.
+            text_cover = np.asarray(mask, dtype=np.float32) / 255
+            clear = np.ones_like(text_cover)
+            for ox in [-2, -1, 0, 1, 2]:
+                for oy in [-2, -1, 0, 1, 2]:
+                    if ox != 0 or oy != 0:  # Skip center
+                        clear *= 1 - np.roll(text_cover, (oy, ox), axis=(0, 1))
+            clear *= 1 - text_cover
+            cover = 1 - clear
+            share = text_cover / np.maximum(cover, 1e-6)
+            ink = np.empty(cover.shape + (4,), dtype=np.uint8)
+            ink[..., :3] = (np.array(self._hex_to_rgb(color), dtype=np.float32) * share[..., None] + 0.5).astype(np.uint8)
+            ink[..., 3] = 255
+            cover_mask = Image.fromarray((cover * 255 + 0.5).astype(np.uint8), "L")
+            return Image.fromarray(ink, "RGBA"), cover_mask, dx, dy
+
+        return self._sprite(("glyph", text, font, color, phase, outline), build)
+
+    def _paste_glyph(self, img: Image.Image, x: float, y: float, glyph: tuple) -> tuple:
+        """Glyph wie draw.text an (x, y) einfügen; liefert die Box im Bild."""
+        ink, mask, dx, dy = glyph
+        x0, y0 = math.floor(x) - dx, math.floor(y) - dy
+        box = (x0, y0, x0 + mask.width, y0 + mask.height)
+        img.paste(ink, box, mask)
+        return box
+
+    def _text_center(self, img: Image.Image, text: str, x: int, y: int, size: int, color: str = COLOR_TEXT, fontweight: str = "normal", outline: bool = False) -> tuple:
+        font = self._text_font(text, size, fontweight)
+        bbox = self._text_box(text, font)
         tw = bbox[2] - bbox[0]
         th = bbox[3] - bbox[1]
         text_x = x - tw / 2
         text_y = y - th / 2
-        
-        # Draw black outline for better readability
-        if outline:
-            outline_color = "#000000"
-            # Draw outline in 8 directions + thicker center
-            for dx in [-2, -1, 0, 1, 2]:
-                for dy in [-2, -1, 0, 1, 2]:
-                    if dx != 0 or dy != 0:  # Skip center
-                        draw.text((text_x + dx, text_y + dy), text, font=font, fill=outline_color)
-        
-        # Draw main text on top
-        draw.text((text_x, text_y), text, font=font, fill=color)
+        # Draw black outline for better readability (im Glyph enthalten)
+        glyph = self._glyph(text, font, color, (text_x % 1, text_y % 1), outline)
+        return self._paste_glyph(img, text_x, text_y, glyph)
 
     def _edge_points(self, src, dst, offset: float):
         x0, y0 = src
@@ -296,7 +428,7 @@ class EnergyFlowView(tk.Frame):
             (x1 - ux * offset, y1 - uy * offset),
         )
 
-    def _draw_arrow(self, draw: ImageDraw.ImageDraw, src, dst, color: str, width: float):
+    def _draw_arrow(self, draw: ImageDraw.ImageDraw, src, dst, color: str, width: float) -> tuple:
         start, end = self._edge_points(src, dst, self.node_radius)
         x0, y0 = start
         x1, y1 = end
@@ -309,8 +441,12 @@ class EnergyFlowView(tk.Frame):
         left = (x1 - ux * size + uy * size * 0.6, y1 - uy * size - ux * size * 0.6)
         right = (x1 - ux * size - uy * size * 0.6, y1 - uy * size + ux * size * 0.6)
         draw.polygon([left, right, (x1, y1)], fill=color)
+        xs = (x0, x1, left[0], right[0])
+        ys = (y0, y1, left[1], right[1])
+        pad = width / 2 + 2
+        return (int(min(xs) - pad), int(min(ys) - pad), int(max(xs) + pad) + 1, int(max(ys) + pad) + 1)
 
-    def _draw_flow_label(self, base_img: Image.Image, src, dst, watts: float, offset: int = 8, along: int = 0, color: str = COLOR_TEXT, flip_text: bool = False):
+    def _draw_flow_label(self, base_img: Image.Image, src, dst, watts: float, offset: int = 8, along: int = 0, color: str = COLOR_TEXT, flip_text: bool = False) -> tuple:
         start, end = self._edge_points(src, dst, self.node_radius + 6)
         mx = (start[0] + end[0]) / 2
         my = (start[1] + end[1]) / 2
@@ -332,27 +468,35 @@ class EnergyFlowView(tk.Frame):
         if flip_text:
             angle += 180
         value_text, unit_text = self._format_power_parts(abs(watts))
-        font_val = self._font_small if self._font_small else ImageFont.load_default()
-        font_unit = self._font_tiny if self._font_tiny else ImageFont.load_default()
+        rotated = self._sprite(
+            ("label", value_text, unit_text, color, angle),
+            lambda: self._render_label(value_text, unit_text, color, angle),
+        )
 
-        dummy = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
-        ddraw = ImageDraw.Draw(dummy)
-        vbox = ddraw.textbbox((0, 0), value_text, font=font_val)
-        ubox = ddraw.textbbox((0, 0), unit_text, font=font_unit)
+        rx, ry = rotated.size
+        x0, y0 = int(px - rx / 2), int(py - ry / 2)
+        base_img.paste(rotated, (x0, y0), rotated)
+        return (x0, y0, x0 + rx, y0 + ry)
+
+    def _render_label(self, value_text: str, unit_text: str, color: str, angle: float) -> Image.Image:
+        """Flusslabel (Wert + Einheit) aus Glyph-Sprites, gedreht."""
+        font_val = self._font_small if self._font_small else self._font_default
+        font_unit = self._font_tiny if self._font_tiny else self._font_default
+        vbox = self._text_box(value_text, font_val)
+        ubox = self._text_box(unit_text, font_unit)
         vw, vh = vbox[2] - vbox[0], vbox[3] - vbox[1]
         uw, uh = ubox[2] - ubox[0], ubox[3] - ubox[1]
         h = max(vh, uh)
         w = vw + 4 + uw
 
         txt_img = Image.new("RGBA", (w + 12, h + 12), (0, 0, 0, 0))
-        tdraw = ImageDraw.Draw(txt_img)
         unit_color = self._tint(color, 0.45)
-        tdraw.text((6, 6 + (h - vh) / 2), value_text, font=font_val, fill=color)
-        tdraw.text((6 + vw + 4, 6 + (h - uh) / 2), unit_text, font=font_unit, fill=unit_color)
-        rotated = txt_img.rotate(angle, resample=Image.BICUBIC, expand=True)
-
-        rx, ry = rotated.size
-        base_img.paste(rotated, (int(px - rx / 2), int(py - ry / 2)), rotated)
+        for text, font, fill, x, y in (
+            (value_text, font_val, color, 6, 6 + (h - vh) / 2),
+            (unit_text, font_unit, unit_color, 6 + vw + 4, 6 + (h - uh) / 2),
+        ):
+            self._paste_glyph(txt_img, x, y, self._glyph(text, font, fill, (x % 1, y % 1)))
+        return txt_img.rotate(angle, resample=Image.BICUBIC, expand=True)
 
     def _format_power(self, watts: float) -> str:
         if abs(watts) < 1000:
@@ -375,7 +519,7 @@ class EnergyFlowView(tk.Frame):
         b = int(b + (255 - b) * amount)
         return f"#{r:02x}{g:02x}{b:02x}"
 
-    def _draw_soft_shadow(self, draw: ImageDraw.ImageDraw, x: int, y: int, r: int, color: str):
+    def _draw_soft_shadow(self, draw: ImageDraw.ImageDraw, palette: list, x: int, y: int, r: int, color: str):
         """Very soft multi-layer shadow with smooth falloff."""
         # Shadow offset slightly down and right
         offset_x = 2
@@ -391,13 +535,15 @@ class EnergyFlowView(tk.Frame):
         ]
         
         for shadow_r, alpha in shadow_layers:
-            draw.ellipse(
+            self._layer_ellipse(
+                draw,
+                palette,
                 [x - shadow_r + offset_x, y - shadow_r + offset_y, 
                  x + shadow_r + offset_x, y + shadow_r + offset_y],
-                fill=(0, 0, 0, alpha)
+                (0, 0, 0, alpha),
             )
 
-    def _draw_subtle_glow(self, draw: ImageDraw.ImageDraw, x: int, y: int, r: int, color: str):
+    def _draw_subtle_glow(self, draw: ImageDraw.ImageDraw, palette: list, x: int, y: int, r: int, color: str):
         """Very subtle color-matched glow with smooth falloff."""
         base = self._hex_to_rgb(color)
         
@@ -411,28 +557,46 @@ class EnergyFlowView(tk.Frame):
         ]
         
         for glow_r, alpha in glow_layers:
-            draw.ellipse(
-                [x - glow_r, y - glow_r, x + glow_r, y + glow_r],
-                fill=base + (alpha,)
-            )
+            self._layer_ellipse(draw, palette, [x - glow_r, y - glow_r, x + glow_r, y + glow_r], base + (alpha,))
 
-    def _draw_radial(self, draw: ImageDraw.ImageDraw, x: int, y: int, r: int, color: str):
+    def _draw_radial(self, draw: ImageDraw.ImageDraw, palette: list, x: int, y: int, r: int, color: str):
         for i in range(r, 0, -4):
             t = 1 - (i / r)
             c = self._tint(color, 0.18 + t * 0.25)
-            draw.ellipse([x - i, y - i, x + i, y + i], fill=c)
+            self._layer_ellipse(draw, palette, [x - i, y - i, x + i, y + i], self._hex_to_rgb(c) + (255,))
 
-    def _draw_soc_ring(self, draw: ImageDraw.ImageDraw, center, soc: float):
+    def _draw_soc_ring(self, draw: ImageDraw.ImageDraw, center, soc: float) -> tuple:
         x, y = center
         r = self.node_radius + self.ring_gap
         bbox = [x - r, y - r, x + r, y + r]
         extent = max(0, min(360, 360 * soc / 100))
         color = COLOR_SUCCESS if soc >= 70 else (COLOR_WARNING if soc >= 35 else COLOR_DANGER)
         draw.arc(bbox, start=-90, end=-90 + extent, fill=color, width=4)
+        return (x - r - 1, y - r - 1, x + r + 2, y + r + 2)
+
+    def _static_layer(self) -> Image.Image:
+        """
+        Statische Ebene (_base_img: Hintergrund, Knoten, Icons) und Frame dazu.
+
+        Der Frame bleibt zwischen den Updates erhalten: vor dem Zeichnen wird
+        nur das Dirty-Rect des letzten Updates aus der statischen Ebene
+        zurückkopiert, Pfeile/Labels/Texte landen nur dort. Ein neues
+        _base_img (neues Layout in _render_job) startet einen neuen Frame.
+        """
+        if self._static_src is not self._base_img:
+            self._static_src = self._base_img
+            self._frame = self._base_img.copy()
+            self._dirty = None
+        return self._static_src
 
     def render_frame(self, pv_w: float, load_w: float, grid_w: float, batt_w: float, soc: float) -> Image.Image:
-        img = self._base_img.copy()
+        """Frame zu den Flüssen (Strichbahnen dazu in _frame_dashes); das Bild wird beim nächsten Aufruf überschrieben."""
+        static = self._static_layer()
+        img = self._frame
+        if self._dirty is not None:
+            img.paste(static.crop(self._dirty), self._dirty[:2])
         draw = ImageDraw.Draw(img)
+        boxes = []
 
         pv = self.nodes["pv"]
         grid = self.nodes["grid"]
@@ -445,40 +609,126 @@ class EnergyFlowView(tk.Frame):
         def thickness(watts):
             return clamp(2 + abs(watts) / 1500, 2, 8)
 
+        # Flüsse: (von, nach, Watt, Farbe, Label-Abstand, Label drehen)
+        flows = []
         # PV -> Haus
         if pv_w > 0:
-            self._draw_arrow(draw, pv, home, COLOR_SUCCESS, thickness(pv_w))
-            self._draw_flow_label(img, pv, home, pv_w, offset=28, along=0, color=COLOR_SUCCESS)
+            flows.append((pv, home, pv_w, COLOR_SUCCESS, 28, False))
 
         # Grid Import/Export
         if grid_w > 0:
-            self._draw_arrow(draw, grid, home, COLOR_INFO, thickness(grid_w))
-            self._draw_flow_label(img, grid, home, grid_w, offset=28, along=0, color=COLOR_INFO, flip_text=True)
+            flows.append((grid, home, grid_w, COLOR_INFO, 28, True))
         elif grid_w < 0:
-            self._draw_arrow(draw, home, grid, COLOR_INFO, thickness(grid_w))
-            self._draw_flow_label(img, home, grid, grid_w, offset=28, along=0, color=COLOR_INFO)
+            flows.append((home, grid, grid_w, COLOR_INFO, 28, False))
 
         # Batterie Laden/Entladen (batt_w > 0 = Entladen)
         if batt_w > 0:
             # Entladen: Batterie -> Haus (rot)
-            self._draw_arrow(draw, bat, home, COLOR_DANGER, thickness(batt_w))
-            self._draw_flow_label(img, bat, home, batt_w, offset=15, along=0, color=COLOR_DANGER)
+            flows.append((bat, home, batt_w, COLOR_DANGER, 15, False))
         elif batt_w < 0:
             # Laden: Haus -> Batterie (grün)
-            self._draw_arrow(draw, home, bat, COLOR_SUCCESS, thickness(batt_w))
-            self._draw_flow_label(img, home, bat, batt_w, offset=15, along=0, color=COLOR_SUCCESS)
+            flows.append((home, bat, batt_w, COLOR_SUCCESS, 15, False))
+
+        for src, dst, watts, color, offset, flip in flows:
+            boxes.append(self._draw_arrow(draw, src, dst, color, thickness(watts)))
+            boxes.append(self._draw_flow_label(img, src, dst, watts, offset=offset, along=0, color=color, flip_text=flip))
+        self._frame_dashes = self._dash_paths_for([(src, dst, watts, color, thickness(watts)) for src, dst, watts, color, _, _ in flows])
 
         # SoC Ring um Batterie
-        self._draw_soc_ring(draw, bat, soc)
+        boxes.append(self._draw_soc_ring(draw, bat, soc))
 
         # Werte anzeigen mit Einheiten
-        self._text_center(draw, f"Haus {self._format_power(load_w)}", home[0], home[1] + 70, size=16, color=COLOR_PRIMARY)
+        boxes.append(self._text_center(img, f"Haus {self._format_power(load_w)}", home[0], home[1] + 70, size=16, color=COLOR_PRIMARY))
 
         # SoC inside battery with outline for readability - moved down to avoid emoji overlap
-        self._text_center(draw, f"{soc:.0f}%", bat[0], bat[1] + 8, size=20, color=COLOR_TEXT, outline=True)
-        self._text_center(draw, "SoC", bat[0], bat[1] + 28, size=12, color=COLOR_TEXT, outline=True)
+        boxes.append(self._text_center(img, f"{soc:.0f}%", bat[0], bat[1] + 8, size=20, color=COLOR_TEXT, outline=True))
+        boxes.append(self._text_center(img, "SoC", bat[0], bat[1] + 28, size=12, color=COLOR_TEXT, outline=True))
+
+        # Dirty-Rect fürs nächste Update, auf das Bild begrenzt
+        x0 = max(0, min(b[0] for b in boxes))
+        y0 = max(0, min(b[1] for b in boxes))
+        x1 = min(img.width, max(b[2] for b in boxes))
+        y1 = min(img.height, max(b[3] for b in boxes))
+        self._dirty = (x0, y0, x1, y1) if x0 < x1 and y0 < y1 else None
         return img
 
+    # ------------------------------------------------------------------
+    # Animierter Modus
+    # ------------------------------------------------------------------
+    def set_animated(self, enabled: bool, fps: float = ANIM_FPS):
+        """
+        Laufende Striche auf den Pfeilen an/aus (Tempo proportional zur Leistung).
+
+        Die Striche sind Canvas-Linien über dem PIL-Bild; je Frame ändern
+        sich nur ihre Koordinaten, das Bild bleibt. Takt, Messung, Drosselung
+        und Pause bei unsichtbarem Tab: ui.framescheduler.FrameScheduler.
+        """
+        if self._scheduler is not None:
+            self._scheduler.stop()
+            self._scheduler = None
+        self.canvas.delete("dash")
+        self._dash_items = []
+        self._dash_styles = []
+        self._dash_shown = 0
+        if enabled:
+            self._scheduler = FrameScheduler(
+                self.canvas,
+                self._draw_dashes,
+                fps=fps,
+                min_fps=ANIM_MIN_FPS,
+                levels=len(DASH_SPACING),
+                log_prefix="[ENERGY]",
+                summary_interval=ANIM_SUMMARY_INTERVAL if DEBUG_LOG else None,
+            )
+            self._scheduler.start()
+
+    def animation_stats(self) -> dict | None:
+        """Frame-Kennzahlen des animierten Modus (None = aus)."""
+        return self._scheduler.stats() if self._scheduler is not None else None
+
+    def _dash_paths_for(self, flows: list) -> list:
+        """Strichbahnen zu den Pfeilen (von, nach, Watt, Farbe, Breite) eines Frames."""
+        paths = []
+        for src, dst, watts, color, width in flows:
+            start, end = self._edge_points(src, dst, self.node_radius)
+            vx, vy = end[0] - start[0], end[1] - start[1]
+            length = max((vx ** 2 + vy ** 2) ** 0.5, 1e-3)
+            run = length - (12 + width)  # bis zur Pfeilspitze
+            if run <= DASH_LENGTH:
+                continue
+            speed = min(DASH_SPEED_MAX, DASH_SPEED_MIN + DASH_SPEED_PER_KW * abs(watts) / 1000)
+            style = (self._tint(color, 0.55), max(1, int(width) - 1))
+            paths.append((start[0], start[1], vx / length, vy / length, run, speed) + style)
+        return paths
+
+    def _draw_dashes(self, now: float, quality: int):
+        """Ein Animationsframe: Striche je Bahn um speed * now verschoben."""
+        spacing = DASH_SPACING[quality]
+        canvas = self.canvas
+        items = self._dash_items
+        n = 0
+        for x0, y0, ux, uy, run, speed, color, width in self._dash_paths:
+            s = (now * speed) % spacing - spacing
+            while s < run:
+                a, b = max(0.0, s), min(run, s + DASH_LENGTH)
+                s += spacing
+                if b <= a:
+                    continue
+                if n == len(items):
+                    items.append(canvas.create_line(0, 0, 0, 0, capstyle=tk.ROUND, tags="dash"))
+                    self._dash_styles.append(None)
+                item = items[n]
+                canvas.coords(item, x0 + ux * a, y0 + uy * a, x0 + ux * b, y0 + uy * b)
+                if self._dash_styles[n] != (color, width):
+                    canvas.itemconfigure(item, fill=color, width=width)
+                    self._dash_styles[n] = (color, width)
+                if n >= self._dash_shown:
+                    canvas.itemconfigure(item, state=tk.NORMAL)
+                n += 1
+        for item in items[n:self._dash_shown]:
+            canvas.itemconfigure(item, state=tk.HIDDEN)
+        self._dash_shown = n
+
     def update_flows(self, pv_w: float, load_w: float, grid_w: float, batt_w: float, soc: float):
         """Update power flows - only re-render if values changed significantly (save CPU)."""
         values = (pv_w, load_w, grid_w, batt_w, soc)
@@ -506,9 +756,42 @@ class EnergyFlowView(tk.Frame):
             if DEBUG_LOG:
                 print(f"[ENERGY] update_flows detected SIGNIFICANT size change at {elapsed:.3f}s: {self.width}x{self.height} -> {cw}x{ch}")
             self.width, self.height = cw, ch
-            self.nodes = self._define_nodes()
-            self._base_img = self._render_background()
 
-        frame = self.render_frame(pv_w, load_w, grid_w, batt_w, soc)
-        self._tk_img = ImageTk.PhotoImage(frame)
-        self.canvas.itemconfig(self._canvas_img, image=self._tk_img)
+        self._request_frame()
+
+
+if __name__ == "__main__":
+    # Benchmark Resize -> Bild, Update, Animation; braucht ein Display
+    #   cd src && python -m ui.views.energy_flow
+    from types import SimpleNamespace
+
+    RUNS = 20
+    root = tk.Tk()
+    root.withdraw()
+    view = EnergyFlowView(root)
+    view._last_flows = (3200.0, 1800.0, -900.0, -500.0, 64.0)
+    for width, height in ((420, 400), (800, 480), (1024, 600)):
+        t0 = time.perf_counter()
+        for i in range(RUNS):
+            # abwechselnd 12 px breiter, damit die 10-px-Schwelle jedes Mal greift
+            view._on_canvas_resize(SimpleNamespace(width=width + 12 * (i % 2), height=height))
+        ms = (time.perf_counter() - t0) / RUNS * 1000
+        print(f"[ENERGY] {width}x{height}: {ms:.1f} ms Resize -> Bild")
+
+    # Update bei fester Größe: render_frame + PhotoImage, neue bzw. wiederkehrende Werte
+    steps = [(3000.0 + 60 * i, 1500.0 + 40 * i, -800.0 - 30 * i, -400.0 + 25 * i, 40.0 + i) for i in range(RUNS * 3)]
+    for label, flows in (("neue Werte", steps), ("Werte aus dem Cache", steps[:4] * (RUNS * 3 // 4))):
+        t0 = time.perf_counter()
+        for values in flows:
+            view._show((view.render_frame(*values), view._frame_dashes))
+        ms = (time.perf_counter() - t0) / len(flows) * 1000
+        print(f"[ENERGY] {view.width}x{view.height} Update, {label}: {ms:.2f} ms")
+
+    # Animierter Modus: 5 s sichtbar laufen lassen, Frame-Kennzahlen des Schedulers
+    root.deiconify()
+    view.pack(fill=tk.BOTH, expand=True)
+    view.set_animated(True)
+    root.after(5000, root.quit)
+    root.mainloop()
+    print(f"[ENERGY] Animation: {view._scheduler.summary()}")
+    root.destroy()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Module liegen unter src/ (Imports wie in der App: from core.x import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,118 @@
+"""
+Tests des Spaltenspeichers (core.channelstore) in temporären Verzeichnissen.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core import channelstore
+from core.channelstore import MISSING_CODE, ChannelStore
+
+DAY1 = datetime(2024, 6, 1, 8, 0, 0)
+DAY2 = datetime(2024, 6, 2, 0, 0, 10)
+
+
+def make_store(directory, names, kinds):
+    store = ChannelStore(str(directory))
+    store.ensure_schema(names, kinds)
+    return store
+
+
+def test_day_change_compacts_in_background(tmp_path, monkeypatch):
+    store = make_store(tmp_path, ["Kessel", "Brenner"], ["f", "s"])
+    for i in range(30):
+        store.append(DAY1 + timedelta(seconds=10 * i), [60.0 + i, "HEIZEN" if i % 2 else "AUS"])
+
+    # langsames Komprimieren: append und query warten nicht darauf
+    release = threading.Event()
+    savez = np.savez_compressed
+
+    def slow_savez(*args, **kwargs):
+        release.wait(5)
+        savez(*args, **kwargs)
+
+    monkeypatch.setattr(channelstore.np, "savez_compressed", slow_savez)
+    started = time.monotonic()
+    store.append(DAY2, [70.0, "EIN"])
+    store.append(DAY2 + timedelta(seconds=10), [71.0, None])
+    assert time.monotonic() - started < 0.5
+    assert os.path.exists(tmp_path / "2024-06-01.0.rows")
+
+    times, cols = store.query(["Kessel", "Brenner"])
+    assert len(times) == 32
+    assert cols["Kessel"][-1] == 71.0 and cols["Brenner"][-1] is None
+
+    release.set()
+    store.flush(5)
+    assert not os.path.exists(tmp_path / "2024-06-01.0.rows")
+    assert os.path.exists(tmp_path / "2024-06-01.npz")
+    times2, cols2 = store.query(["Kessel", "Brenner"])
+    assert np.array_equal(times, times2)
+    assert list(cols2["Brenner"]) == list(cols["Brenner"])
+
+
+def test_merge_keeps_channels_missing_on_either_side(tmp_path):
+    # Tag teilweise segmentiert mit altem Schema (Kessel, Rauchgas, Brenner)
+    old = make_store(tmp_path, ["Kessel", "Rauchgas", "Brenner"], ["f", "f", "s"])
+    for i in range(5):
+        old.append(DAY1 + timedelta(seconds=10 * i), [60.0, 120.0 + i, "HEIZEN"])
+    old.append(DAY2, [61.0, 121.0, "AUS"])
+    old.flush(5)
+    os.remove(tmp_path / "aktuell.rows")
+    os.remove(tmp_path / "schema.json")
+
+    # neues Schema ohne Rauchgas, mit Pumpe; spätere Zeilen desselben Tages
+    new = make_store(tmp_path, ["Kessel", "Pumpe", "Brenner"], ["f", "f", "s"])
+    for i in range(3):
+        new.append(DAY1 + timedelta(hours=4, seconds=10 * i), [65.0, 80.0, "EIN"])
+    new.append(DAY2, [66.0, 80.0, "AUS"])
+    new.flush(5)
+
+    with np.load(tmp_path / "2024-06-01.npz") as segment:
+        assert set(segment.files) == {"ts", "Kessel", "Rauchgas", "Pumpe", "Brenner"}
+        assert len(segment["ts"]) == 8
+        np.testing.assert_array_equal(segment["Rauchgas"][:5], 120.0 + np.arange(5))
+        assert np.isnan(segment["Rauchgas"][5:]).all()
+        assert np.isnan(segment["Pumpe"][:5]).all()
+        np.testing.assert_array_equal(segment["Pumpe"][5:], 80.0)
+
+    times, cols = new.query(["Kessel", "Pumpe"], end=datetime(2024, 6, 1, 23, 59, 59))
+    assert len(times) == 8
+    assert np.isnan(cols["Pumpe"][:5]).all()
+
+
+def test_query_pads_channel_missing_in_old_segment(tmp_path):
+    old = make_store(tmp_path, ["Kessel"], ["f"])
+    old.append(DAY1, [60.0])
+    old.append(DAY2, [61.0])
+    old.flush(5)
+    os.remove(tmp_path / "aktuell.rows")
+    os.remove(tmp_path / "schema.json")
+
+    new = make_store(tmp_path, ["Kessel", "Brenner"], ["f", "s"])
+    new.append(DAY2 + timedelta(hours=1), [62.0, "EIN"])
+    _, cols = new.query(["Kessel", "Brenner"], decode=False)
+    assert list(cols["Kessel"]) == [60.0, 62.0]
+    assert list(cols["Brenner"]) == [MISSING_CODE, 0]
+
+
+def test_repeated_compaction_does_not_duplicate_rows(tmp_path):
+    store = make_store(tmp_path, ["Kessel"], ["f"])
+    for i in range(4):
+        store.append(DAY1 + timedelta(seconds=10 * i), [60.0 + i])
+    store.append(DAY2, [70.0])
+    store.flush(5)
+
+    # Abbruch nach dem Schreiben des Segments, vor dem Löschen der Datei
+    rows = np.zeros(4, dtype=store._dtype)
+    rows["ts"] = [int((DAY1 + timedelta(seconds=10 * i) - datetime(1970, 1, 1)).total_seconds()) for i in range(4)]
+    rows["Kessel"] = 60.0 + np.arange(4)
+    rows.tofile(tmp_path / "2024-06-01.0.rows")
+    restarted = ChannelStore(str(tmp_path))
+    restarted.flush(5)
+    times, cols = restarted.query(["Kessel"])
+    assert list(cols["Kessel"]) == [60.0, 61.0, 62.0, 63.0, 70.0]
@@ -0,0 +1,263 @@
+"""
+Tests der Sammler-Engine gegen lokale Stub-Server (Fronius, BMK).
+
+Die Stubs laufen auf freien Ports (Port 0); die Abruffunktionen holen wie
+Wechselrichter.abrufen / BMKDATEN.abrufen per requests mit Timeout.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from core import collector
+from core.collector import CollectorEngine, Source, backoff_delay
+from core.httpsession import DeviceSession
+
+FRONIUS_PATH = "/solar_api/v1/GetPowerFlowRealtimeData.fcgi"
+BMK_PATH = "/daqdata.cgi"
+
+FRONIUS_BODY = json.dumps({"Body": {"Data": {"Site": {"P_PV": 3200.0, "P_Load": -1800.0, "P_Grid": -900.0, "P_Akku": -500.0}}}})
+BMK_BODY = "1;2;3;54.5;48.0;40.1;7.2\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        stub = self.server.stub
+        stub.hits.append(time.monotonic())
+        if stub.mode == "hang":
+            stub.release.wait(10)
+        elif stub.delay:
+            time.sleep(stub.delay)
+        if stub.mode == "fail":
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = (FRONIUS_BODY if self.path == FRONIUS_PATH else BMK_BODY).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Stub:
+    """HTTP-Stub eines Geräts: mode "ok", "fail" (HTTP 500) oder "hang"."""
+
+    def __init__(self, path, mode="ok", delay=0.0):
+        self.mode = mode
+        self.delay = delay
+        self.hits = []
+        self.release = threading.Event()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def collect(self, timeout):
+        response = requests.get(self.url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs():
+    created = []
+
+    def make(path=FRONIUS_PATH, **kwargs):
+        stub = Stub(path, **kwargs)
+        created.append(stub)
+        return stub
+
+    yield make
+    for stub in created:
+        stub.close()
+
+
+@pytest.fixture
+def engine():
+    engines = []
+
+    def make(sources):
+        eng = CollectorEngine(sources, summary_interval=None)
+        engines.append(eng)
+        eng.start()
+        return eng
+
+    yield make
+    for eng in engines:
+        eng.stop()
+
+
+def test_fixed_rate_without_drift(stubs, engine):
+    interval = 0.1
+    fronius = stubs(FRONIUS_PATH, delay=0.03)
+    bmk = stubs(BMK_PATH, delay=0.06)
+    eng = engine([
+        Source("Wechselrichter", fronius.collect, interval, timeout=1.0),
+        Source("BMKDATEN", bmk.collect, interval, timeout=1.0),
+    ])
+    time.sleep(1.55)
+    eng.stop()
+
+    for stub in (fronius, bmk):
+        hits = stub.hits
+        assert len(hits) >= 14
+        # Start k im Raster t0 + k * interval: die Abrufdauer summiert sich nicht auf
+        offsets = [hit - (hits[0] + k * interval) for k, hit in enumerate(hits)]
+        assert max(abs(o) for o in offsets) < 0.04
+    stats = eng.stats()
+    assert stats["Wechselrichter"]["errors"] == stats["BMKDATEN"]["errors"] == 0
+    assert stats["Wechselrichter"]["missed_ticks"] == 0
+
+
+def test_per_source_timeout(stubs, engine):
+    interval = 0.2
+    slow = stubs(FRONIUS_PATH, mode="hang")
+    fast = stubs(BMK_PATH)
+    eng = engine([
+        Source("Wechselrichter", slow.collect, interval, timeout=0.1),
+        Source("BMKDATEN", fast.collect, interval, timeout=1.0),
+    ])
+    time.sleep(1.0)
+    stats = eng.stats()
+
+    # das hängende Gerät scheitert am eigenen Timeout, das andere läuft im Takt
+    assert stats["Wechselrichter"]["errors"] >= 1
+    assert stats["Wechselrichter"]["max_latency"] < 0.5
+    assert stats["BMKDATEN"]["errors"] == 0
+    assert stats["BMKDATEN"]["runs"] >= 4
+
+
+def test_backoff_after_failures(stubs, engine, monkeypatch):
+    interval = 0.05
+    delays = []
+
+    def fixed_backoff(failures):
+        delays.append(failures)
+        return 0.2 * failures
+
+    monkeypatch.setattr(collector, "backoff_delay", fixed_backoff)
+    failing = stubs(FRONIUS_PATH, mode="fail")
+    eng = engine([Source("Wechselrichter", failing.collect, interval, timeout=1.0)])
+    time.sleep(1.5)
+
+    hits = list(failing.hits)
+    assert delays[:3] == [1, 2, 3]
+    # Pausen wachsen mit der Fehlerzahl, statt jede 50 ms anzufragen
+    gaps = [b - a for a, b in zip(hits, hits[1:])]
+    assert gaps[0] >= 0.2 - 0.01
+    assert gaps[1] >= 0.4 - 0.01
+    assert len(hits) <= 5
+    stats = eng.stats()["Wechselrichter"]
+    assert stats["consecutive_errors"] == stats["errors"] == len(hits)
+    assert "500" in stats["last_error"]
+
+    # nach Erholung: Zähler zurück, wieder im Raster
+    failing.mode = "ok"
+    time.sleep(1.5)  # läuft noch das letzte Backoff (0,2 s * Fehlerzahl) ab
+    stats = eng.stats()["Wechselrichter"]
+    assert stats["consecutive_errors"] == 0
+    assert stats["runs"] > stats["errors"]
+
+
+def test_backoff_delay_bounds():
+    for failures in range(1, 12):
+        nominal = min(collector.BACKOFF_MAX, collector.BACKOFF_BASE * 2 ** (failures - 1))
+        delay = backoff_delay(failures)
+        assert nominal * (1 - collector.BACKOFF_JITTER) <= delay <= nominal * (1 + collector.BACKOFF_JITTER)
+
+
+def test_missed_ticks_counted(stubs, engine):
+    interval = 0.1
+    # Abruf dauert 2,5 Takte: je Abruf werden 2 Takte ausgelassen
+    slow = stubs(FRONIUS_PATH, delay=0.25)
+    eng = engine([Source("Wechselrichter", slow.collect, interval, timeout=1.0)])
+    time.sleep(1.6)
+    eng.stop()
+
+    stats = eng.stats()["Wechselrichter"]
+    assert stats["errors"] == 0
+    assert stats["runs"] >= 4
+    assert stats["missed_ticks"] >= 2 * (stats["runs"] - 1)
+    # nächster Abruf wieder auf einem Rasterpunkt
+    hits = slow.hits
+    for hit in hits[1:]:
+        ticks = (hit - hits[0]) / interval
+        assert abs(ticks - round(ticks)) < 0.3
+
+
+def test_hung_fetch_does_not_stall_next_ticks(stubs, engine, monkeypatch):
+    interval = 0.1
+    monkeypatch.setattr(collector, "TIMEOUT_MARGIN", 0.1)
+    monkeypatch.setattr(collector, "backoff_delay", lambda failures: 0.0)
+    hung = stubs(FRONIUS_PATH, mode="hang")
+    other = stubs(BMK_PATH)
+    hung_session = DeviceSession("Wechselrichter")
+    other_session = DeviceSession("BMKDATEN")
+
+    def ignore_timeout(timeout):
+        # Gerät hält die Verbindung offen, der Abruf bricht nicht selbst ab
+        return hung_session.get(hung.url, timeout=30).text
+
+    def fetch_other(timeout):
+        response = other_session.get(other.url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+
+    eng = engine([
+        Source("Wechselrichter", ignore_timeout, interval, timeout=0.1),
+        Source("BMKDATEN", fetch_other, interval, timeout=1.0),
+    ])
+    time.sleep(1.2)
+    stats = eng.stats()
+
+    # asyncio gibt nach timeout + TIMEOUT_MARGIN auf; solange der Abruf-Thread
+    # hängt, werden die Takte ausgelassen statt weitere Abrufe zu stapeln
+    assert stats["Wechselrichter"]["timeouts"] == 1
+    assert len(hung.hits) == 1
+    assert stats["Wechselrichter"]["busy_skips"] >= 5
+    assert sum(t.name == "Collect-Wechselrichter" for t in threading.enumerate()) == 1
+    assert stats["BMKDATEN"]["errors"] == 0
+    assert stats["BMKDATEN"]["runs"] >= 10
+
+    # Gerät antwortet wieder: die Quelle läuft im Raster weiter
+    hung.mode = "ok"
+    hung.release.set()
+    time.sleep(0.5)
+    stats = eng.stats()["Wechselrichter"]
+    assert stats["consecutive_errors"] == 0
+    assert stats["runs"] >= 3
+
+
+def test_stop_shuts_down_cleanly(stubs, engine):
+    stub = stubs(FRONIUS_PATH)
+    eng = engine([Source("Wechselrichter", stub.collect, 0.05, timeout=1.0)])
+    time.sleep(0.3)
+    assert eng.is_running()
+
+    started = time.monotonic()
+    eng.stop()
+    assert time.monotonic() - started < 1.0
+    assert not eng.is_running()
+    hits = len(stub.hits)
+    time.sleep(0.3)
+    assert len(stub.hits) == hits  # keine Abrufe nach stop()
+    assert not any(t.name == "Collector" for t in threading.enumerate())
+
+    # erneut startbar
+    eng.start()
+    time.sleep(0.2)
+    assert eng.is_running()
+    assert len(stub.hits) > hits
@@ -0,0 +1,161 @@
+"""
+Tests des DataStore (SQLite) gegen temporäre Datenbanken und CSV-Dateien.
+"""
+
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import csvlog
+from core.datastore import DataStore, to_epoch
+from core.ertrag_validator import reconstruct_ertrag_from_fronius
+
+FRONIUS_HEADER = "Zeitstempel,PV-Leistung (kW),Netz-Leistung (kW),Batterie-Leistung (kW),Hausverbrauch (kW),Batterieladestand (%)\n"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = DataStore(str(tmp_path / "data.db"))
+    yield store
+    store.close()
+
+
+def fronius_rows(start="2024-06-01 00:00:00", days=3, step_s=60, seed=3):
+    """Fronius-Zeilen mit Sonnenkurve, Lücken > ENERGY_MAX_GAP und fehlenden Werten (NaN)."""
+    rng = np.random.default_rng(seed)
+    times = pd.Timestamp(start) + pd.to_timedelta(np.arange(0, days * 86400, step_s), unit="s")
+    hours = (times.hour + times.minute / 60).to_numpy()
+    pv = np.clip(np.sin((hours - 5) / 16 * np.pi), 0, None) * 8 + rng.uniform(0, 0.2, len(times))
+    load = rng.uniform(0.3, 2.0, len(times))
+    df = pd.DataFrame({
+        "Zeitstempel": times,
+        "PV-Leistung (kW)": pv,
+        "Netz-Leistung (kW)": np.abs(load - pv) * 0.6,
+        "Batterie-Leistung (kW)": np.abs(load - pv) * 0.4,
+        "Hausverbrauch (kW)": load,
+        "Batterieladestand (%)": rng.uniform(20, 90, len(times)),
+    })
+    gap1 = (df["Zeitstempel"] > "2024-06-01 11:00") & (df["Zeitstempel"] < "2024-06-01 12:30")
+    gap2 = (df["Zeitstempel"] > "2024-06-02 23:40") & (df["Zeitstempel"] < "2024-06-03 00:20")
+    df = df[~(gap1 | gap2)].reset_index(drop=True)
+    df.loc[df.sample(25, random_state=seed).index, "PV-Leistung (kW)"] = np.nan
+    return df
+
+
+def write_fronius_csv(path, df):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FRONIUS_HEADER)
+        df.to_csv(f, header=False, index=False, na_rep="nan", date_format="%Y-%m-%d %H:%M:%S")
+
+
+def test_energy_engines_agree_with_gaps_and_nan(store, tmp_path):
+    df = fronius_rows()
+    csv_path = tmp_path / "FroniusDaten.csv"
+    write_fronius_csv(csv_path, df)
+    assert store.import_fronius_csv(str(csv_path))
+
+    validator = reconstruct_ertrag_from_fronius(df)
+    totals = {d["day"]: d["pv_kwh"] for d in store.get_energy_totals()["days"]}
+    start, end = df["Zeitstempel"].min(), df["Zeitstempel"].max()
+    daily = {b["time"].strftime("%Y-%m-%d"): b["pv_kwh"] for b in store.get_rollup("fronius", start, end, resolution=86400)}
+    hourly = store.get_rollup("fronius", start, end, resolution=3600)
+
+    assert len(validator) == 3
+    for day, kwh in zip(validator["Zeitstempel"].dt.strftime("%Y-%m-%d"), validator["Ertrag_kWh"]):
+        assert np.isfinite(kwh)
+        assert totals[day] == pytest.approx(kwh, rel=1e-9)
+        assert daily[day] == pytest.approx(kwh, rel=1e-9)
+    assert sum(b["pv_kwh"] for b in hourly) == pytest.approx(validator["Ertrag_kWh"].sum(), rel=1e-9)
+
+
+def test_sync_after_rotation_to_header_only_file(store, tmp_path):
+    csv_path = tmp_path / "FroniusDaten.csv"
+    may = fronius_rows(start="2024-05-30 00:00:00", days=2, step_s=300)
+    first, later = may.iloc[:300], may.iloc[300:]
+    write_fronius_csv(csv_path, first)
+    assert store.sync_fronius_csv(str(csv_path)) == len(first)
+
+    # weitere Zeilen angehängt, dann Monatsrotation vor dem nächsten Sync:
+    # die aktive Datei enthält nur noch den Header
+    with open(csv_path, "a", encoding="utf-8") as f:
+        later.to_csv(f, header=False, index=False, na_rep="nan", date_format="%Y-%m-%d %H:%M:%S")
+    assert csvlog.rotate(str(csv_path), now=datetime(2024, 6, 1, 0, 5)) == len(may)
+    assert csv_path.read_text(encoding="utf-8") == FRONIUS_HEADER
+
+    # ab dem jüngsten Datensatz (inklusive, INSERT OR REPLACE) aus dem Archiv
+    assert store.sync_fronius_csv(str(csv_path)) >= len(later)
+    last = store.conn.execute("SELECT MAX(ts), COUNT(*) FROM fronius").fetchone()
+    assert last == (to_epoch(later["Zeitstempel"].max().to_pydatetime()), len(may))
+    # Checkpoint steht: der nächste Lauf findet nichts Neues
+    assert store.sync_fronius_csv(str(csv_path)) == 0
+
+    # leere Datenbank: alle Archivzeilen trotz Header-only-Datei
+    fresh = DataStore(str(tmp_path / "fresh.db"))
+    try:
+        assert fresh.sync_fronius_csv(str(csv_path)) == len(may)
+    finally:
+        fresh.close()
+
+
+def test_resync_refreshes_only_changed_range(store, tmp_path, monkeypatch):
+    csv_path = tmp_path / "FroniusDaten.csv"
+    df = fronius_rows(days=2, step_s=60)
+    old, new = df.iloc[:-30], df.iloc[-30:]
+    write_fronius_csv(csv_path, old)
+    assert store.sync_fronius_csv(str(csv_path)) == len(old)
+
+    refreshed = []
+    refresh = store._refresh_rollups
+    monkeypatch.setattr(store, "_refresh_rollups", lambda *args: refreshed.append(args) or refresh(*args))
+
+    def replace_file(rows):
+        # neuer Inode: Re-Sync ab Dateianfang wie nach einer Rotation
+        write_fronius_csv(tmp_path / "neu.csv", rows)
+        os.replace(tmp_path / "neu.csv", csv_path)
+
+    # dieselben Zeilen plus neue am Ende: nur der neue Zeitraum
+    replace_file(df)
+    assert store.sync_fronius_csv(str(csv_path)) == len(df)
+    first_new = to_epoch(new["Zeitstempel"].min().to_pydatetime())
+    assert refreshed == [("fronius", first_new, to_epoch(df["Zeitstempel"].max().to_pydatetime()))]
+    assert store.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_fronius_hour'").fetchone()
+
+    # unverändert: keine Rollups
+    refreshed.clear()
+    replace_file(df)
+    store.sync_fronius_csv(str(csv_path))
+    assert refreshed == []
+
+    # eine geänderte Zeile im bekannten Zeitraum: der bekannte Teil ihres Batches
+    changed = df.copy()
+    changed.loc[100, "PV-Leistung (kW)"] = 42.0
+    replace_file(changed)
+    store.sync_fronius_csv(str(csv_path))
+    assert refreshed == [("fronius", *(to_epoch(t.to_pydatetime()) for t in df["Zeitstempel"].iloc[[0, -1]]))]
+    hour = df["Zeitstempel"].iloc[100].floor("h").to_pydatetime()
+    assert store.get_rollup("fronius", hour, hour, resolution=3600)[0]["pv_power_max"] == 42.0
+
+
+def test_live_heating_inserts_batch_rollup_refresh(store, monkeypatch):
+    refreshed = []
+    refresh = store._refresh_rollups
+    monkeypatch.setattr(store, "_refresh_rollups", lambda *args: refreshed.append(args) or refresh(*args))
+
+    # 45 min BMK-Werte alle 10 s, wie vom Sammler
+    base = datetime(2024, 6, 1, 12, 0, 0)
+    samples = [(base + pd.Timedelta(seconds=10 * i), 60.0 + i % 5, 5.0, 55.0, 45.0, 35.0, 48.0) for i in range(270)]
+    for sample in samples:
+        store.insert_heating_record(*sample)
+    # je überschrittener 15-min-Grenze ein Refresh statt einem je Sample
+    assert len(refreshed) == 2
+
+    end = base + pd.Timedelta(seconds=45 * 60 - 1)
+    got = store.get_rollup("heating", base, end, resolution=900)
+    assert len(refreshed) == 3  # offener Bucket beim Lesen
+    assert [b["count"] for b in got] == [90, 90, 90]
+    assert got[0]["kesseltemp"] == pytest.approx(62.0)
+    assert store.get_rollup("heating", base, end, resolution=900) == got
+    assert len(refreshed) == 3
@@ -0,0 +1,94 @@
+"""
+Mittelwerte über Deadband-Logs: zeitgewichtet (Halteglied) statt über Stichproben.
+"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from core.datastore import DataStore
+from core.deadband import MAX_HOLD_SECONDS, Deadband
+from core.timeseries import TimeSeriesStore
+
+STEP = 10  # s, Abtastintervall der Sammler
+HEADER = "Zeitstempel,Kesseltemp,Außentemp,Puffer oben,Puffer mitte,Puffer unten,Warmwasser\n"
+
+
+def kessel_signal():
+    """2 h Kesseltemperatur: 40 min ruhig, 20 min unruhig (58/62 im Wechsel), 1 h ruhig."""
+    t = np.arange(0, 7200, STEP)
+    return t, np.where(t < 2400, 20.0, np.where(t < 3600, np.where(t // STEP % 2, 62.0, 58.0), 45.0))
+
+
+@pytest.fixture
+def heating_log(tmp_path):
+    """Deadband-gefiltertes Heizungslog der letzten Stunden; liefert (Start, Signal)."""
+    base = datetime.now().replace(minute=0, second=0, microsecond=0) - timedelta(hours=4)
+    t, kessel = kessel_signal()
+    band = Deadband({"kesseltemp": 1.0})
+    lines = []
+    for offset, value in zip(t.tolist(), kessel.tolist()):
+        ts = base + timedelta(seconds=offset)
+        if band.check(ts, {"kesseltemp": value}):
+            lines.append(f"{ts:%Y-%m-%d %H:%M:%S},{value},5.0,60.0,50.0,40.0,48.0\n")
+    with open(tmp_path / "Heizungstemperaturen.csv", "w", encoding="utf-8") as f:
+        f.write(HEADER + "".join(lines))
+    return base, t, kessel, len(lines)
+
+
+def true_means(t, kessel, res):
+    """Zeitgewichtetes Mittel des ungefilterten Signals je Bucket."""
+    return kessel.reshape(-1, res // STEP).mean(axis=1)
+
+
+def test_log_is_uneven(heating_log):
+    _, t, _, rows = heating_log
+    # ruhige Phasen nur im Heartbeat, die unruhige mit jedem Abruf
+    assert rows == 8 + 120 + 12
+
+
+@pytest.mark.parametrize("res", [900, 3600])
+def test_binned_hold_is_time_weighted(heating_log, tmp_path, res):
+    base, t, kessel, _ = heating_log
+    store = TimeSeriesStore(data_dir=str(tmp_path))
+    store.refresh()
+    end = base + timedelta(seconds=7199)
+    got = store.binned("heating", "kesseltemp", base, res, end=end, hold=MAX_HOLD_SECONDS)
+    assert [b for b, _ in got] == [base + timedelta(seconds=k * res) for k in range(7200 // res)]
+    np.testing.assert_allclose([v for _, v in got], true_means(t, kessel, res), rtol=1e-12)
+    if res == 3600:
+        # Stichprobenmittel wäre (8·20 + 120·60) / 128 = 57.5
+        assert got[0][1] == pytest.approx(100 / 3)
+
+
+@pytest.mark.parametrize("res", [60, 900, 3600])
+def test_heating_rollup_is_time_weighted(heating_log, tmp_path, res):
+    base, t, kessel, rows = heating_log
+    store = DataStore(str(tmp_path / "data.db"))
+    try:
+        assert store.backfill_heating_csv(str(tmp_path / "Heizungstemperaturen.csv")) == rows
+        got = store.get_rollup("heating", base, base + timedelta(seconds=7199), resolution=res)
+    finally:
+        store.close()
+    assert len(got) == 7200 // res
+    np.testing.assert_allclose([b["kesseltemp"] for b in got], true_means(t, kessel, res), rtol=1e-12)
+    assert sum(b["count"] for b in got) == rows
+    assert min(b["kesseltemp_min"] for b in got) == 20.0
+    assert max(b["kesseltemp_max"] for b in got) == 62.0
+
+
+def test_incremental_inserts_match_backfill(heating_log, tmp_path):
+    base, _, _, _ = heating_log
+    bulk = DataStore(str(tmp_path / "bulk.db"))
+    live = DataStore(str(tmp_path / "live.db"))
+    try:
+        bulk.backfill_heating_csv(str(tmp_path / "Heizungstemperaturen.csv"))
+        for row in bulk.get_heating_range(base):
+            live.insert_heating_record(*row)
+        span = (base, base + timedelta(seconds=7199))
+        for res in (60, 3600):
+            assert live.get_rollup("heating", *span, resolution=res) == bulk.get_rollup("heating", *span, resolution=res)
+    finally:
+        bulk.close()
+        live.close()
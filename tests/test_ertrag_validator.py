@@ -0,0 +1,123 @@
+"""
+Regressionstest: vektorisierte reconstruct_ertrag_from_fronius gegen die
+Tagesschleife aus der Trapez-Umstellung (Referenz unten, unverändert bis
+auf die Funktionssignatur).
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.ertrag_validator import ENERGY_MAX_GAP, reconstruct_ertrag_from_fronius
+
+
+def reference_reconstruct(fronius_df: pd.DataFrame) -> pd.DataFrame:
+    """Tagesschleife: Trapez, Intervall zum Tag des späteren Werts, Lücken > ENERGY_MAX_GAP zählen nicht."""
+    if fronius_df.empty:
+        return pd.DataFrame(columns=["Zeitstempel", "Ertrag_kWh"])
+
+    # stabil sortiert wie die vektorisierte Fassung: bei gleichen
+    # Zeitstempeln entscheidet sonst die Sortierung über das Trapez
+    fronius_df = fronius_df.copy().sort_values("Zeitstempel", kind="stable").reset_index(drop=True)
+    fronius_df["Date"] = fronius_df["Zeitstempel"].dt.date
+
+    ertrag_records = []
+    prev_ts = None
+    prev_p = None
+    for date, day_group in fronius_df.groupby("Date"):
+        day_group = day_group.sort_values("Zeitstempel", kind="stable").reset_index(drop=True)
+        if day_group.empty:
+            continue
+        energy_kwh = 0.0
+        for i in range(len(day_group)):
+            p2 = day_group["PV-Leistung (kW)"].iloc[i]
+            ts2 = day_group["Zeitstempel"].iloc[i]
+            if prev_ts is not None:
+                dt_s = (ts2 - prev_ts).total_seconds()
+                if dt_s <= ENERGY_MAX_GAP:
+                    energy_kwh += (prev_p + p2) / 2.0 * dt_s / 3600
+            prev_ts, prev_p = ts2, p2
+        if energy_kwh > 0:
+            ertrag_records.append({
+                "Zeitstempel": pd.Timestamp(datetime.combine(date, datetime.min.time())),
+                "Ertrag_kWh": energy_kwh,
+            })
+    return pd.DataFrame(ertrag_records)
+
+
+def _frame(times, power):
+    return pd.DataFrame({"Zeitstempel": pd.to_datetime(times), "PV-Leistung (kW)": np.asarray(power, dtype=float)})
+
+
+def _synthetic(seed=7, days=4, step_s=300):
+    """Tage mit 5-min-Werten, Sonnenkurve, Lücken, doppelten Zeitstempeln, gemischt."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-06-01 00:00:00")
+    times = start + pd.to_timedelta(np.arange(0, days * 86400, step_s), unit="s")
+    hours = (times.hour + times.minute / 60).to_numpy()
+    power = np.clip(np.sin((hours - 5) / 16 * np.pi), 0, None) * 8 + rng.uniform(0, 0.3, len(times))
+    df = _frame(times, power)
+
+    # Lücken länger als ENERGY_MAX_GAP (75 min mittags, 2 h über Mitternacht)
+    gap1 = (df["Zeitstempel"] > "2024-06-02 12:00") & (df["Zeitstempel"] < "2024-06-02 13:15")
+    gap2 = (df["Zeitstempel"] > "2024-06-03 23:00") & (df["Zeitstempel"] < "2024-06-04 01:00")
+    df = df[~(gap1 | gap2)]
+
+    # doppelte Zeitstempel mit abweichendem Wert
+    dups = df.sample(40, random_state=seed).copy()
+    dups["PV-Leistung (kW)"] += rng.uniform(-0.5, 0.5, len(dups))
+    df = pd.concat([df, dups])
+
+    # unregelmäßige Abstände inkl. Intervallen über Mitternacht
+    extra = _frame(
+        ["2024-06-01 23:58:30", "2024-06-02 00:03:10", "2024-06-02 23:59:59", "2024-06-03 00:00:01"],
+        [0.05, 0.07, 0.02, 0.03],
+    )
+    df = pd.concat([df, extra])
+    return df.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def _assert_same(got, ref):
+    assert list(pd.to_datetime(got["Zeitstempel"])) == list(pd.to_datetime(ref["Zeitstempel"]))
+    np.testing.assert_allclose(got["Ertrag_kWh"].to_numpy(), ref["Ertrag_kWh"].to_numpy(), rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_matches_reference_on_shuffled_data(seed):
+    df = _synthetic(seed)
+    _assert_same(reconstruct_ertrag_from_fronius(df), reference_reconstruct(df))
+
+
+def test_empty_frame():
+    empty = _frame([], [])
+    got = reconstruct_ertrag_from_fronius(empty)
+    assert got.empty
+    assert list(got.columns) == ["Zeitstempel", "Ertrag_kWh"]
+    assert reference_reconstruct(empty).empty
+
+
+def test_gap_over_limit_contributes_nothing():
+    # 1 kW konstant, 5-min-Werte, eine Lücke von 75 min: 75 min fehlen im Ertrag
+    times = list(pd.date_range("2024-06-01 08:00", "2024-06-01 12:00", freq="5min"))
+    times += list(pd.date_range("2024-06-01 13:15", "2024-06-01 16:00", freq="5min"))
+    got = reconstruct_ertrag_from_fronius(_frame(times, np.ones(len(times))))
+    assert ENERGY_MAX_GAP < 75 * 60
+    assert got["Ertrag_kWh"].iloc[0] == pytest.approx(8.0 - 1.25, abs=1e-9)
+
+
+def test_interval_across_midnight_counts_for_later_day():
+    got = reconstruct_ertrag_from_fronius(_frame(["2024-06-01 23:55", "2024-06-02 00:05"], [1.2, 1.2]))
+    assert list(got["Zeitstempel"]) == [pd.Timestamp("2024-06-02")]
+    assert got["Ertrag_kWh"].iloc[0] == pytest.approx(1.2 * 10 / 60, abs=1e-9)
+
+
+def test_nan_sample_keeps_day():
+    # 100 Werte à 5 min, 1 kW, ein fehlender Wert: nur seine zwei Intervalle fallen weg
+    times = pd.date_range("2024-06-01 08:00", periods=100, freq="5min")
+    power = np.ones(100)
+    power[50] = np.nan
+    got = reconstruct_ertrag_from_fronius(_frame(times, power))
+    assert list(got["Zeitstempel"]) == [pd.Timestamp("2024-06-01")]
+    assert got["Ertrag_kWh"].iloc[0] == pytest.approx(97 * 5 / 60, abs=1e-9)
@@ -0,0 +1,92 @@
+"""
+Tests der Keep-Alive-Sitzungen (DeviceSession) gegen einen lokalen Stub-Server.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from core.httpsession import DeviceSession
+
+BODY = b'{"Body": {"Data": {"Site": {"P_PV": 1234.0}}}}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-Alive wie die Geräte
+
+    def do_GET(self):
+        if self.path == "/hang":
+            self.server.release.wait(10)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.release = threading.Event()
+    server.url = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sequential_gets_reuse_one_session(server):
+    session = DeviceSession("stub")
+    for _ in range(5):
+        assert session.get(server.url + "/ok", timeout=1).content == BODY
+    assert session.stats == {"requests": 5, "errors": 0, "sessions": 1}
+
+
+def test_concurrent_get_does_not_wait_for_hanging_request(server):
+    session = DeviceSession("stub")
+    session.get(server.url + "/ok", timeout=1)
+    hung = threading.Thread(target=session.get, args=(server.url + "/hang",), kwargs={"timeout": 30}, daemon=True)
+    hung.start()
+    time.sleep(0.2)
+
+    # der hängende Abruf hält die Keep-Alive-Sitzung, der zweite bekommt eine eigene
+    started = time.monotonic()
+    assert session.get(server.url + "/ok", timeout=1).content == BODY
+    assert time.monotonic() - started < 0.5
+    assert hung.is_alive()
+    assert session.stats["sessions"] == 2
+
+    server.release.set()
+    hung.join(2)
+    assert not hung.is_alive()
+    # danach wieder eine freie Sitzung, die überzählige ist geschlossen
+    session.get(server.url + "/ok", timeout=1)
+    assert session.stats["sessions"] == 2
+
+
+def test_reset_discards_session_in_use(server):
+    session = DeviceSession("stub")
+    hung = threading.Thread(target=session.get, args=(server.url + "/hang",), kwargs={"timeout": 30}, daemon=True)
+    hung.start()
+    time.sleep(0.2)
+    session.reset()
+    server.release.set()
+    hung.join(2)
+    session.get(server.url + "/ok", timeout=1)
+    assert session.stats["sessions"] == 2
+
+
+def test_timeout_counts_as_error(server):
+    session = DeviceSession("stub")
+    with pytest.raises(requests.Timeout):
+        session.get(server.url + "/hang", timeout=0.2)
+    assert session.stats["errors"] == 1
+    server.release.set()
+    assert session.get(server.url + "/ok", timeout=1).content == BODY